@@ -1,3 +1,4 @@
+import os
 from flask import Flask, redirect, url_for, jsonify
 from flask_cors import CORS
 from MVC.controllers.authController import auth_bp
@@ -6,6 +7,11 @@ from MVC.controllers.operadorController import operador_bp
 from MVC.controllers.mosaiqueiroController import mosaiqueiro_bp
 from MVC.controllers.uploadController import upload_bp
 from MVC.controllers.statusController import status_bp
+from MVC.controllers.jobsController import jobs_bp
+from MVC.controllers.healthController import health_bp
+from MVC.services.RegistroModelo import registro
+from MVC.model import conexao
+from MVC import config
 
 # Inicializa o framework
 app = Flask(__name__,
@@ -29,6 +35,26 @@ app.register_blueprint(operador_bp, url_prefix='/area-operador')
 app.register_blueprint(mosaiqueiro_bp, url_prefix='/area-mosaiqueiro')
 app.register_blueprint(upload_bp)
 app.register_blueprint(status_bp)
+app.register_blueprint(jobs_bp, url_prefix='/jobs')
+app.register_blueprint(health_bp, url_prefix='/health')
+
+# Cada requisição usa no máximo uma conexão do pool, emprestada na primeira consulta de um DAO
+# e devolvida ao fim da requisição: as threads do servidor nunca dividem uma conexão
+@app.before_request
+def abrir_conexoes():
+    conexao.iniciarUnidade()
+
+@app.teardown_appcontext
+def liberar_conexoes(erro=None):
+    conexao.encerrarUnidade()
+
+# Carrega e aquece o modelo assim que o app sobe, para a primeira análise não pagar esse custo.
+# Com debug=True o werkzeug mantém um processo pai que só observa os arquivos: ele não precisa do modelo
+# e no modo pre-fork quem carrega o modelo são os workers, depois do fork (ver gunicorn.conf.py)
+_processo_do_reloader = __name__ == '__main__' and os.environ.get('WERKZEUG_RUN_MAIN') != 'true'
+if config.AQUECER_AO_INICIAR and not _processo_do_reloader and not config.PREFORK:
+    registro.aquecerEmSegundoPlano()
+    registro.iniciarMonitor()  # troca de versão quando o manifesto de modelos muda
 
 # Rota inicial
 @app.route('/')
@@ -36,4 +62,4 @@ def index():
     return redirect('http://localhost:5173/')
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True, threaded=True)  # uma thread por requisição
\ No newline at end of file
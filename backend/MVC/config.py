@@ -0,0 +1,113 @@
+# MVC/config.py
+# Configurações compartilhadas pelos serviços (fora do app.config do Flask,
+# pois também são usadas pelos processos de inferência que não sobem o Flask)
+
+import os
+
+# Pasta com os checkpoints versionados e o manifest.json (versão atual + threshold de cada versão).
+# Os processos carregam a versão indicada no manifesto e trocam de modelo quando ele muda
+PASTA_MODELOS = os.environ.get('AGRINEURAL_PASTA_MODELOS', 'MVC/services/modelos')
+INTERVALO_MANIFESTO = float(os.environ.get('AGRINEURAL_INTERVALO_MANIFESTO', '10'))  # segundos entre verificações
+
+# Checkpoint usado pelas ferramentas e testes (relativo à pasta backend/). Se AGRINEURAL_MODELO
+# for definido, os processos usam esse arquivo fixo e ignoram o manifesto
+CAMINHO_MODELO = os.environ.get(
+    'AGRINEURAL_MODELO',
+    os.path.join(PASTA_MODELOS, 'model_checkpoint.h5transistor_AE_epoch_48.h5')
+)
+MODELO_FIXO = 'AGRINEURAL_MODELO' in os.environ
+
+# Backend que executa o autoencoder: 'keras' ou 'tflite' (ver MVC/services/BackendInferencia.py)
+BACKEND_INFERENCIA = os.environ.get('AGRINEURAL_BACKEND', 'keras')
+
+# Erro de reconstrução acima do qual a imagem é considerada anômala (quando a versão no manifesto não define um)
+THRESHOLD_PADRAO = float(os.environ.get('AGRINEURAL_THRESHOLD', '0.003638065652921796'))
+
+# Tamanhos de lote usados no aquecimento do modelo ao iniciar o processo
+TAMANHOS_LOTE_AQUECIMENTO = tuple(
+    int(t) for t in os.environ.get('AGRINEURAL_LOTES_AQUECIMENTO', '1').split(',')
+)
+
+# Quantidade de imagens enviadas ao modelo em cada forward pass
+TAMANHO_LOTE = int(os.environ.get('AGRINEURAL_TAMANHO_LOTE', '32'))
+
+# Backend Keras: chama o modelo por funções compiladas (tf.function) com estes tamanhos de lote
+# fixos, em vez de model.predict a cada chamada. AGRINEURAL_COMPILADO=0 volta ao predict
+INFERENCIA_COMPILADA = os.environ.get('AGRINEURAL_COMPILADO', '1') == '1'
+TAMANHOS_COMPILADOS = tuple(
+    sorted(int(t) for t in os.environ.get('AGRINEURAL_TAMANHOS_COMPILADOS', '1,8,32').split(','))
+)
+
+# Threads do runtime de inferência em cada processo (0 = padrão do runtime, um por núcleo).
+# Com vários processos no mesmo servidor, o ideal é núcleos / processos (meça com benchmarks.bench_threads)
+THREADS_INTRA = int(os.environ.get('AGRINEURAL_THREADS_INTRA', '0'))   # dentro de cada operação (e do TFLite)
+THREADS_INTER = int(os.environ.get('AGRINEURAL_THREADS_INTER', '0'))   # operações independentes em paralelo (Keras)
+# Inferências executando ao mesmo tempo em cada processo (0 = sem limite); as demais esperam a vez
+INFERENCIAS_SIMULTANEAS = int(os.environ.get('AGRINEURAL_INFERENCIAS_SIMULTANEAS', '1'))
+
+# Threads que leem e redimensionam as imagens de um lote enquanto o modelo analisa as anteriores
+# (1 = em série). No máximo FILA_DECODIFICACAO imagens ficam prontas à espera do modelo
+THREADS_DECODIFICACAO = int(os.environ.get('AGRINEURAL_THREADS_DECODIFICACAO', '4'))
+FILA_DECODIFICACAO = int(os.environ.get('AGRINEURAL_FILA_DECODIFICACAO', '64'))
+
+# Pool de conexões MySQL de cada processo (MVC/model/conexao.py)
+TAMANHO_POOL = int(os.environ.get('AGRINEURAL_POOL', '5'))                   # conexões mantidas abertas
+EXCEDENTE_POOL = int(os.environ.get('AGRINEURAL_POOL_EXCEDENTE', '10'))      # extras nos picos, fechadas ao devolver
+TIMEOUT_POOL = float(os.environ.get('AGRINEURAL_POOL_TIMEOUT', '5'))         # segundos esperando uma conexão livre
+OCIOSIDADE_POOL = float(os.environ.get('AGRINEURAL_POOL_OCIOSIDADE', '5'))   # parada há mais que isso: ping antes de usar
+
+# Gravação em lote de imagens + resultados pelos workers (MVC/model/escritor_lote.py): uma transação
+# por lote de até TAMANHO_LOTE_ESCRITA imagens, esperando no máximo INTERVALO_ESCRITA segundos
+# por mais jobs antes de gravar (com a fila vazia, grava na hora)
+TAMANHO_LOTE_ESCRITA = int(os.environ.get('AGRINEURAL_TAMANHO_LOTE_ESCRITA', '200'))
+INTERVALO_ESCRITA = float(os.environ.get('AGRINEURAL_INTERVALO_ESCRITA', '1.0'))
+
+# Fila de análise assíncrona
+NUM_WORKERS_INFERENCIA = int(os.environ.get('AGRINEURAL_WORKERS', '2'))      # processos de inferência
+MAX_JOBS_EM_ANDAMENTO = int(os.environ.get('AGRINEURAL_MAX_JOBS', '5000'))   # pendentes + processando
+MAX_TENTATIVAS = int(os.environ.get('AGRINEURAL_MAX_TENTATIVAS', '3'))
+TIMEOUT_ENFILEIRAR = int(os.environ.get('AGRINEURAL_TIMEOUT_ENFILEIRAR', '5'))  # segundos esperando a vez de enfileirar
+INTERVALO_FILA = float(os.environ.get('AGRINEURAL_INTERVALO_FILA', '1.0'))   # segundos entre consultas à fila vazia
+TIMEOUT_JOB = int(os.environ.get('AGRINEURAL_TIMEOUT_JOB', '600'))           # segundos até um job travado voltar à fila
+
+# Mapa de erro por pixel (localização da anomalia dentro da imagem). Desligado por padrão: cada
+# análise passa a gravar um PNG ao lado do upload e as regiões no banco
+GERAR_MAPA_ERRO = os.environ.get('AGRINEURAL_MAPA_ERRO', '0') == '1'
+TAMANHO_MAPA_ERRO = int(os.environ.get('AGRINEURAL_TAMANHO_MAPA', '64'))     # lado do mapa salvo
+if TAMANHO_MAPA_ERRO < 8:  # regioesQuentes divide o mapa reduzido numa grade 8x8
+    raise ValueError(f"AGRINEURAL_TAMANHO_MAPA deve ser no mínimo 8, recebido {TAMANHO_MAPA_ERRO}.")
+REGIOES_QUENTES = int(os.environ.get('AGRINEURAL_REGIOES_QUENTES', '5'))     # top-k regiões retornadas
+ESCALA_MAPA_ERRO = float(os.environ.get('AGRINEURAL_ESCALA_MAPA', '0.05'))   # erro que vira 255 no PNG
+
+# Análise em ladrilhos na resolução original (em vez de reduzir o frame inteiro para 256x256).
+# O rótulo compara o MAIOR erro entre os ladrilhos com o mesmo threshold calibrado para a imagem
+# inteira reduzida: o máximo tende a ser maior que o erro da imagem inteira, então este modo marca
+# mais imagens como anômalas. Recalibre o threshold (manifesto ou fazenda) antes de ativá-lo
+ANALISE_LADRILHADA = os.environ.get('AGRINEURAL_LADRILHOS', '0') == '1'
+SOBREPOSICAO_LADRILHOS = int(os.environ.get('AGRINEURAL_SOBREPOSICAO', '32'))  # pixels em comum entre vizinhos
+if not 0 <= SOBREPOSICAO_LADRILHOS < 256:  # ladrilhos de 256x256: o passo entre eles precisa ser positivo
+    raise ValueError(f"AGRINEURAL_SOBREPOSICAO deve estar entre 0 e 255, recebido {SOBREPOSICAO_LADRILHOS}.")
+
+# Decodifica JPEGs grandes já reduzidos (1/2, 1/4 ou 1/8) antes do resize para 256x256.
+# Desligado por padrão: os pixels de entrada mudam em relação à decodificação completa com que o
+# threshold foi calibrado, e a diferença nos erros ainda não foi medida
+DECODIFICACAO_REDUZIDA = os.environ.get('AGRINEURAL_DECODIFICACAO_REDUZIDA', '0') == '1'
+
+# Frames quase iguais (sobreposição entre fotos consecutivas do voo)
+DISTANCIA_DUPLICATA = int(os.environ.get('AGRINEURAL_DISTANCIA_DUPLICATA', '6'))   # bits diferentes no dHash
+METROS_DUPLICATA = float(os.environ.get('AGRINEURAL_METROS_DUPLICATA', '15'))      # distância máxima entre as fotos
+PULAR_DUPLICATAS = os.environ.get('AGRINEURAL_PULAR_DUPLICATAS', '0') == '1'       # reaproveita o resultado da original
+FAZENDAS_INDICE_DUPLICATAS = int(os.environ.get('AGRINEURAL_FAZENDAS_DUPLICATAS', '50'))  # índices mantidos em memória
+
+# Filtro prévio: verificações baratas que descartam frames inúteis antes do modelo,
+# na ordem em que rodam ('' desativa). Ver MVC/services/FiltroService.py
+ETAPAS_FILTRO = tuple(e for e in os.environ.get('AGRINEURAL_FILTRO', '').split(',') if e)
+LIMITE_SUBEXPOSICAO = float(os.environ.get('AGRINEURAL_LIMITE_SUBEXPOSICAO', '0.6'))     # fração de pixels quase pretos
+LIMITE_SUPEREXPOSICAO = float(os.environ.get('AGRINEURAL_LIMITE_SUPEREXPOSICAO', '0.98')) # fração de pixels estourados
+LIMITE_VEGETACAO = float(os.environ.get('AGRINEURAL_LIMITE_VEGETACAO', '0.01'))   # fração mínima de pixels verdes (ExG)
+LIMITE_DESFOQUE = float(os.environ.get('AGRINEURAL_LIMITE_DESFOQUE', '20'))       # variância mínima do Laplaciano
+
+# Carrega e aquece o modelo em segundo plano quando o app Flask sobe
+AQUECER_AO_INICIAR = os.environ.get('AGRINEURAL_AQUECER', '1') == '1'
+# Servido pelo gunicorn em modo pre-fork (gunicorn.conf.py): o modelo é carregado nos workers, não no mestre
+PREFORK = os.environ.get('AGRINEURAL_PREFORK', '0') == '1'
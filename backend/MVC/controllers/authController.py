@@ -10,9 +10,6 @@ from MVC.model.usuario import Produtor, Operador, Mosaiqueiro
 # Cria um Blueprint chamado 'auth' para agrupar rotas relacionadas à autenticação
 auth_bp = Blueprint('auth', __name__)
 
-# Instancia o DAO para acesso ao banco de dados (com senha do banco definida)
-dao = UsuarioDAO(password='senha123')
-
 
 # Rota de login - aceita GET (redireciona) e POST (realiza autenticação)
 @auth_bp.route('/login', methods=['GET', 'POST'])
@@ -27,7 +24,7 @@ def login():
     senha = data.get('senha')
 
     # Usa o DAO para autenticar com base no CPF e senha
-    usuario = dao.autenticar(cpf, senha)
+    usuario = UsuarioDAO(password='senha123').autenticar(cpf, senha)
     if usuario:
         # Se autenticado com sucesso, salva o CPF do usuário na sessão
         session['cpf'] = usuario.cpf
@@ -71,7 +68,7 @@ def cadastro():
 
     try:
         # Chama o método do DAO para cadastrar o novo usuário
-        dao.cadastro(cpf=cpf, senha=senha, tipo=tipo, nome=nome)
+        UsuarioDAO(password='senha123').cadastro(cpf=cpf, senha=senha, tipo=tipo, nome=nome)
         return jsonify({'status': 'success', 'message': 'Usuário cadastrado com sucesso!'})
     except Exception as e:
         # Em caso de erro inesperado, retorna mensagem de erro genérica
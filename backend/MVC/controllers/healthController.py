@@ -0,0 +1,39 @@
+# MVC/controllers/healthController.py
+
+import os
+from flask import Blueprint, current_app, jsonify
+from MVC.model.saude_dao import SaudeDAO
+from MVC.services.RegistroModelo import registro
+
+health_bp = Blueprint('health', __name__)
+
+# Usado pelo balanceador: o processo está de pé (não verifica dependências)
+@health_bp.route('/live', methods=['GET'])
+def live():
+    return jsonify({'status': 'ok'}), 200
+
+# Só responde 200 quando o modelo já está aquecido, o banco responde e a pasta de uploads aceita escrita
+@health_bp.route('/ready', methods=['GET'])
+def ready():
+    verificacoes = {}
+
+    if registro.aquecido:
+        verificacoes['modelo'] = {'ok': True, 'versao': registro.obterModelo().versao,
+                                  'tempoCarga': registro.tempoCarga, 'tempoAquecimento': registro.tempoAquecimento}
+    else:
+        verificacoes['modelo'] = {'ok': False, 'erro': registro.erroCarga or 'Modelo ainda carregando.'}
+
+    saude_dao = SaudeDAO(password='senha123')
+    try:
+        saude_dao.verificar()
+        verificacoes['banco'] = {'ok': True}
+    except Exception as e:
+        verificacoes['banco'] = {'ok': False, 'erro': str(e)}
+    verificacoes['banco']['pool'] = saude_dao.metricas()  # espera por conexão e utilização deste processo
+
+    pasta = current_app.config['UPLOAD_FOLDER']
+    gravavel = os.path.isdir(pasta) and os.access(pasta, os.W_OK)
+    verificacoes['uploads'] = {'ok': gravavel} if gravavel else {'ok': False, 'erro': f'Pasta {pasta} inacessível.'}
+
+    pronto = all(v['ok'] for v in verificacoes.values())
+    return jsonify({'status': 'ready' if pronto else 'not_ready', 'verificacoes': verificacoes}), 200 if pronto else 503
@@ -0,0 +1,29 @@
+# MVC/controllers/jobsController.py
+
+from flask import Blueprint, session, jsonify
+from MVC.model.job_dao import JobDAO
+
+jobs_bp = Blueprint('jobs', __name__)
+
+# Consulta o andamento de uma análise enfileirada pelas rotas de upload
+@jobs_bp.route('/<int:job_id>', methods=['GET'])
+def consultar_job(job_id):
+    if 'cpf' not in session: return jsonify({'status': 'error', 'message': 'Usuário não autenticado.'}), 401
+
+    job_dao = JobDAO(password='senha123')
+    job = job_dao.buscar(job_id)
+    if not job or job['cpf_usuario'] != session['cpf']:
+        return jsonify({'status': 'error', 'message': 'Job não encontrado.'}), 404
+
+    return jsonify({
+        'status': 'success',
+        'job': {
+            'id': job['id'],
+            'estado': job['status'],
+            'nome': job['nome'],
+            'tentativas': job['tentativas'],
+            'resultado': job['resultado'],
+            'imagemId': job['imagem_id'],
+            'erro': job['mensagem_erro']
+        }
+    })
@@ -1,13 +1,12 @@
 # MVC/controllers/mosaiqueiroController.py
 
+import json
 from flask import Blueprint, session, request, jsonify
 from mysql.connector import IntegrityError
 from MVC.model.usuario_fazenda_dao import UsuarioFazendaDAO
 from MVC.model.fazenda_dao import FazendaDAO
 
 mosaiqueiro_bp = Blueprint('mosaiqueiro', __name__)
-uf_dao = UsuarioFazendaDAO(password='senha123')
-fazenda_dao = FazendaDAO(password='senha123')
 
 # ROTA MODIFICADA: '/area-mosaiqueiro/fazendas' virou '/fazendas'
 @mosaiqueiro_bp.route('/fazendas', methods=['GET'])
@@ -19,7 +18,7 @@ def listar_fazendas_por_ccir():
     if not ccir:
         return jsonify({'status':'error','message':'ccir é obrigatório.'}), 400
 
-    fazendas = uf_dao.buscar_fazendas_por_ccir(ccir)
+    fazendas = UsuarioFazendaDAO(password='senha123').buscar_fazendas_por_ccir(ccir)
     return jsonify({'status':'success','fazendas':fazendas})
 
 # ROTA MODIFICADA: '/area-mosaiqueiro/fazendas' virou '/fazendas'
@@ -34,7 +33,7 @@ def associar_fazenda():
         return jsonify({'status':'error','message':'farm_id é obrigatório.'}), 400
 
     try:
-        uf_dao.associar_fazenda(session['cpf'], int(farm_id))
+        UsuarioFazendaDAO(password='senha123').associar_fazenda(session['cpf'], int(farm_id))
         return jsonify({'status':'success'}), 201
     except IntegrityError:
         return jsonify({'status':'error','message':'Já associado a essa fazenda.'}), 409
@@ -46,7 +45,7 @@ def associar_fazenda():
 def fazendas_associadas():
     if 'cpf' not in session:
         return jsonify({'status':'error','message':'Usuário não autenticado'}), 401
-    fazendas = uf_dao.buscar_fazendas_do_usuario(session['cpf'])
+    fazendas = UsuarioFazendaDAO(password='senha123').buscar_fazendas_do_usuario(session['cpf'])
     return jsonify({'status':'success','fazendas':fazendas})
 
 # ROTA MODIFICADA: '/area-mosaiqueiro/mapa-calor/...' virou '/mapa-calor/...'
@@ -55,6 +54,8 @@ def get_mapa_calor_data(farm_id):
     if 'cpf' not in session:
         return jsonify({'status': 'error', 'message': 'Usuário não autenticado.'}), 401
 
+    uf_dao = UsuarioFazendaDAO(password='senha123')
+    fazenda_dao = FazendaDAO(password='senha123')
     fazendas_associadas_do_usuario = uf_dao.buscar_fazendas_do_usuario(session['cpf'])
     fazenda_ids_permitidos = {f['id'] for f in fazendas_associadas_do_usuario}
 
@@ -65,7 +66,8 @@ def get_mapa_calor_data(farm_id):
     if not fazenda_data:
         return jsonify({'status': 'error', 'message': 'Fazenda não encontrada.'}), 404
 
-    imagens_data = fazenda_dao.buscar_imagens_e_resultados_por_fazenda(farm_id)
+    imagens_data = fazenda_dao.buscar_imagens_e_resultados_por_fazenda(
+        farm_id, colapsar_duplicatas=request.args.get('duplicatas') != '1')  # ?duplicatas=1 mostra todos os frames
 
     response_fazenda = {
         'id': str(fazenda_data['id']),
@@ -79,7 +81,10 @@ def get_mapa_calor_data(farm_id):
     }
 
     processed_imagens_data = [
-        {**img, 'anomala': bool(img['anomala'])} for img in imagens_data
+        {**img,
+         'anomala': bool(img['anomala']),
+         'regioes': json.loads(img['regioes']) if img['regioes'] else None}
+        for img in imagens_data
     ]
 
     return jsonify({
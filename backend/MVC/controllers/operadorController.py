@@ -5,8 +5,17 @@ from mysql.connector import IntegrityError
 from MVC.model.usuario_fazenda_dao import UsuarioFazendaDAO
 from MVC.model.fazenda_dao import FazendaDAO
 from MVC.model.imagem_dao import ImagemDAO
-from MVC.services.IAService import ModeloAgrineural
+from MVC.model.job_dao import JobDAO
+from MVC.model.cache_dao import CacheResultadoDAO
+from MVC.model import conexao
+from MVC.services import CacheService
+from MVC.services.DuplicataService import IndiceDuplicatas, dhashBytes
+from MVC.services.RegistroModelo import obterModelo
+from MVC.services.ResultadoService import registrarResultado
+from MVC import config
 import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from werkzeug.utils import secure_filename
 
 operador_bp = Blueprint('operador', __name__)
@@ -14,6 +23,12 @@ operador_bp = Blueprint('operador', __name__)
 UPLOAD_FOLDER = 'uploads'
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Threads que gravam os uploads síncronos em disco enquanto o modelo já analisa os bytes
+_gravacao = ThreadPoolExecutor(max_workers=4, thread_name_prefix='gravacao-upload')
+
+# Índice de frames quase iguais por fazenda, mantido entre requisições (só leitura no banco)
+_indice_duplicatas = IndiceDuplicatas(ImagemDAO(password='senha123'))
+
 # --- NÃO INSTANCIAMOS MAIS OS DAOs AQUI ---
 
 @operador_bp.route('/fazendas', methods=['GET'])
@@ -58,6 +73,50 @@ def fazendas_associadas():
     fazendas = uf_dao.buscar_fazendas_do_usuario(session['cpf'])
     return jsonify({'status':'success','fazendas':fazendas})
 
+def _gravar(dados, caminho):
+    with open(caminho, 'wb') as f:
+        f.write(dados)
+
+def _analisar_sincrono(file, filename, caminho_arquivo, fazenda_id, latitude, longitude):
+    """
+    Analisa o upload direto da memória enquanto o arquivo é gravado em paralelo,
+    em vez de gravar e ler de volta do disco antes da inferência.
+    Um arquivo com o mesmo conteúdo já analisado por este modelo vem do cache.
+    """
+    cache_dao = CacheResultadoDAO(password='senha123')
+    dados = file.stream.read()  # o werkzeug guarda o upload num SpooledTemporaryFile: uma leitura só
+    gravacao = _gravacao.submit(_gravar, dados, caminho_arquivo)
+    try:
+        modelo = obterModelo()
+        versao = CacheService.versaoCache(modelo, ladrilhado=False)  # analisarBytes usa a imagem inteira
+        hash_ = CacheService.hashConteudo(dados)
+        em_cache = CacheService.buscar(cache_dao, [hash_], versao)
+        # A inferência (e a espera pela vez no modelo) não usa o banco: a conexão da requisição
+        # volta ao pool e a gravação do resultado empresta outra
+        conexao.liberarUnidade()
+        if hash_ in em_cache:
+            analise = CacheService.analiseDoCache(modelo, em_cache[hash_])
+        else:
+            analise = modelo.analisarBytes(dados, comMapa=config.GERAR_MAPA_ERRO)
+        dhash = dhashBytes(dados)
+    finally:
+        gravacao.result()  # o arquivo precisa estar no disco antes de ir para o banco
+
+    duplicata_de = None
+    if dhash is not None:
+        _indice_duplicatas.atualizar(fazenda_id)
+        original = _indice_duplicatas.buscarOriginal(fazenda_id, dhash, latitude, longitude)
+        duplicata_de = (original['duplicata_de'] or original['id']) if original else None
+
+    threshold = FazendaDAO(password='senha123').buscar_thresholds([fazenda_id]).get(fazenda_id)
+    resultado, imagem_id = registrarResultado(
+        modelo, analise, ImagemDAO(password='senha123'), filename, caminho_arquivo,
+        latitude, longitude, fazenda_id=fazenda_id, threshold=threshold, dhash=dhash, duplicata_de=duplicata_de
+    )
+    if not analise.get('cache') and not analise.get('descarte'):
+        cache_dao.salvar({hash_: CacheService.entradaCache(analise, caminho_arquivo)}, versao)
+    return jsonify({'status': 'success', 'message': 'Imagem processada!', 'data': {'imagemId': imagem_id, 'resultado': resultado, 'descarte': analise.get('descarte'), 'duplicataDe': duplicata_de}}), 201
+
 @operador_bp.route('/upload/imagem', methods=['POST'])
 def upload_imagem():
     if 'cpf' not in session: return jsonify({'status': 'error', 'message': 'Usuário não autenticado.'}), 401
@@ -71,26 +130,31 @@ def upload_imagem():
     longitude = request.form.get('longitude')
     if not all([fazenda_id, latitude, longitude]): return jsonify({'status': 'error', 'message': 'Dados incompletos.'}), 400
 
+    # sincrono=1 responde já com o resultado (uploads avulsos); o padrão é enfileirar
+    sincrono = request.form.get('sincrono') == '1'
+
     try:
         filename = secure_filename(file.filename)
-        caminho_arquivo = os.path.join(UPLOAD_FOLDER, filename)
-        file.save(caminho_arquivo)
+        # Nome único no disco: outro upload com o mesmo nome antes de o worker rodar sobrescreveria
+        # a imagem na fila (e o seu .mapa.png). O nome original fica só no job e na imagem
+        caminho_arquivo = os.path.join(UPLOAD_FOLDER, f"{uuid.uuid4().hex}_{filename}")
+        if sincrono:
+            return _analisar_sincrono(file, filename, caminho_arquivo, int(fazenda_id), float(latitude), float(longitude))
 
-        modelo = ModeloAgrineural()
-        resultado_analise = modelo.analisarImagem(caminhoArquivo=caminho_arquivo)
-        anomala = (resultado_analise == "Anômala")
+        file.save(caminho_arquivo)
 
-        # Instancia o DAO de imagem apenas aqui
-        imagem_dao = ImagemDAO(password='senha123')
-        
-        imagem_id = imagem_dao.salvar_imagem_e_resultado(
-            fazenda_id=int(fazenda_id), nome_arquivo=filename,
-            latitude=float(latitude), longitude=float(longitude), anomala=anomala
-        )
+        # A análise é feita pelos workers de inferência; aqui só entra na fila
+        job_dao = JobDAO(password='senha123')
+        job_ids = job_dao.enfileirar([{
+            'cpf_usuario': session['cpf'], 'nome': filename, 'caminho_arquivo': caminho_arquivo,
+            'fazenda_id': int(fazenda_id), 'latitude': float(latitude), 'longitude': float(longitude)
+        }])
 
-        if imagem_id is None: raise Exception("Falha ao salvar dados no banco.")
+        if job_ids is None:
+            os.remove(caminho_arquivo)
+            return jsonify({'status': 'error', 'message': 'Fila de análise cheia, tente novamente em instantes.'}), 429
 
-        return jsonify({'status': 'success', 'message': 'Imagem processada!', 'data': {'imagemId': imagem_id}}), 201
+        return jsonify({'status': 'success', 'message': 'Imagem recebida, análise em andamento.', 'data': {'jobId': job_ids[0]}}), 202
     except Exception as e:
         print(f"[ERRO NO UPLOAD] - {e}")
         if 'caminho_arquivo' in locals() and os.path.exists(caminho_arquivo): os.remove(caminho_arquivo)
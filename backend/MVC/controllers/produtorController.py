@@ -1,9 +1,11 @@
 # MVC/controllers/produtorController.py
 
+import json
 from flask import Blueprint, session, request, jsonify
 from mysql.connector import IntegrityError
 from MVC.model.fazenda_dao import FazendaDAO
 from MVC.model.relatorio_dao import RelatorioDAO # Mantido caso você use em outra parte
+from MVC.services.RegistroModelo import registro
 
 produtor_bp = Blueprint('produtor', __name__)
 
@@ -79,7 +81,8 @@ def get_mapa_calor_data_produtor(farm_id):
         if not detalhes_fazenda: return jsonify({'status': 'error', 'message': 'Fazenda não encontrada.'}), 404
         if detalhes_fazenda['cpf_produtor'] != cpf_produtor_logado: return jsonify({'status': 'error', 'message': 'Acesso negado.'}), 403
 
-        imagens_data = fazenda_dao.buscar_imagens_e_resultados_por_fazenda(farm_id)
+        imagens_data = fazenda_dao.buscar_imagens_e_resultados_por_fazenda(
+            farm_id, colapsar_duplicatas=request.args.get('duplicatas') != '1')  # ?duplicatas=1 mostra todos os frames
         
         # Formata a resposta exatamente como o frontend espera
         response_fazenda = {
@@ -92,7 +95,12 @@ def get_mapa_calor_data_produtor(farm_id):
             'producerName': detalhes_fazenda['producerName'], 
             'producerCpf': detalhes_fazenda['producerCpf']
         }
-        processed_imagens_data = [{**img, 'anomala': bool(img['anomala'])} for img in imagens_data]
+        processed_imagens_data = [
+            {**img,
+             'anomala': bool(img['anomala']),
+             'regioes': json.loads(img['regioes']) if img['regioes'] else None}  # regiões de maior erro na imagem
+            for img in imagens_data
+        ]
 
         return jsonify({
             'status': 'success',
@@ -103,6 +111,35 @@ def get_mapa_calor_data_produtor(farm_id):
         print(f"Erro inesperado na rota mapa-calor para farm_id {farm_id}: {e}")
         return jsonify({'status': 'error', 'message': 'Erro interno inesperado no servidor.'}), 500
 
+# Reclassifica as imagens da fazenda com um novo threshold usando os erros já armazenados
+@produtor_bp.route('/fazendas/<int:farm_id>/reclassificar', methods=['POST'])
+def reclassificar_fazenda(farm_id):
+    if 'cpf' not in session: return jsonify({'status': 'error', 'message': 'Usuário não autenticado.'}), 401
+
+    fazenda_dao = FazendaDAO(password='senha123')
+
+    data = request.get_json(silent=True) or {}
+    threshold = data.get('threshold')  # None/ausente volta ao threshold padrão do modelo
+    try:
+        threshold = float(threshold) if threshold is not None else None
+    except (TypeError, ValueError):
+        return jsonify({'status': 'error', 'message': 'threshold deve ser um número.'}), 400
+
+    try:
+        detalhes_fazenda = fazenda_dao.buscar_fazenda_por_id(farm_id)
+        if not detalhes_fazenda: return jsonify({'status': 'error', 'message': 'Fazenda não encontrada.'}), 404
+        if detalhes_fazenda['cpf_produtor'] != session['cpf']: return jsonify({'status': 'error', 'message': 'Acesso negado.'}), 403
+
+        # Sem threshold, volta ao da versão ativa do modelo (o do manifesto, não o padrão global)
+        modelo = registro.obterModelo()
+        threshold_efetivo = threshold if threshold is not None else modelo.threshold
+        reclassificadas = fazenda_dao.reclassificar(farm_id, threshold_efetivo, threshold_fazenda=threshold,
+                                                    versao_modelo=modelo.versao)
+        return jsonify({'status': 'success', 'threshold': threshold_efetivo, 'reclassificadas': reclassificadas}), 200
+    except Exception as e:
+        print(f"Erro ao reclassificar fazenda {farm_id}: {e}")
+        return jsonify({'status': 'error', 'message': 'Erro ao reclassificar fazenda.'}), 500
+
 # Rota de Relatório da Fazenda
 @produtor_bp.route('/relatorio/<int:farm_id>', methods=['GET'])
 def get_farm_report_data(farm_id):
@@ -125,11 +162,14 @@ def get_farm_report_data(farm_id):
             return jsonify({'status': 'error', 'message': 'Acesso negado: Esta fazenda não pertence ao seu usuário.'}), 403
 
         # 2. Obter estatísticas de imagens (total, anômalas, normais)
-        image_stats = relatorio_dao.get_farm_image_stats(farm_id)
+        # ?threshold= recalcula as contagens a partir dos erros armazenados, sem gravar nada
+        threshold = request.args.get('threshold', type=float)
+        image_stats = relatorio_dao.get_farm_image_stats(farm_id, threshold=threshold)
 
         total_images = image_stats['total_images'] if image_stats and image_stats['total_images'] is not None else 0
         anomalous_images = image_stats['anomalous_images'] if image_stats and image_stats['anomalous_images'] is not None else 0
         normal_images = total_images - anomalous_images
+        discarded_images = image_stats['discarded_images'] if image_stats and image_stats['discarded_images'] is not None else 0
         
         # Calcular status baseado nas anomalias
         status = 'healthy'
@@ -154,7 +194,8 @@ def get_farm_report_data(farm_id):
             "producerCpf": farm_data['producerCpf'],
             "totalImages": total_images,
             "anomalousImages": anomalous_images,
-            "normalImages": normal_images
+            "normalImages": normal_images,
+            "discardedImages": discarded_images  # barradas pelo filtro prévio (fora do total)
         }
 
         # Dados do relatório:
@@ -7,8 +7,6 @@ import os                                                  # Módulo para manipu
 # Cria um Blueprint chamado 'status' para agrupar rotas relacionadas ao status das imagens
 status_bp = Blueprint('status', __name__)
 
-# Instancia o DAO com a senha correta do banco
-dao = UsuarioDAO(password='senha123')
 
 # Define a pasta onde os arquivos de status (textos) ficarão armazenados
 STATUS_FOLDER = 'status'
@@ -26,7 +24,7 @@ def status():
     cpf = session['cpf']
 
     # Busca o usuário no banco usando o DAO
-    operador = dao.buscar_por_cpf(cpf)
+    operador = UsuarioDAO(password='senha123').buscar_por_cpf(cpf)
 
     # Verifica se o usuário logado é mesmo um operador (por segurança)
     if not operador or not isinstance(operador, Operador):
@@ -1,18 +1,15 @@
 # Importações necessárias
-from flask import Blueprint, request, session, redirect, url_for, current_app
+from flask import Blueprint, request, session, jsonify, current_app
 from MVC.model.usuario_dao import UsuarioDAO                # DAO para buscar dados do usuário
 from MVC.model.usuario import Operador                      # Classe Operador para verificação
-from MVC.services.IAService import ModeloAgrineural         # Modelo de IA que analisará a imagem
+from MVC.model.job_dao import JobDAO                        # Fila de análise consumida pelos workers de inferência
 import os                                                   # Para manipulação de arquivos
-import mysql.connector                                      # Para conexão com o MySQL
-import cv2                                                  # OpenCV (não usado diretamente aqui, mas possivelmente dentro de ModeloAgrineural)
-import numpy as np                                          # Também não usado aqui diretamente
+import uuid                                                 # Nomes únicos para os arquivos na fila
+from werkzeug.utils import secure_filename                  # Nome de arquivo seguro para o disco
 
 # Define o Blueprint de upload
 upload_bp = Blueprint('upload', __name__)
 
-# DAO para acesso ao banco
-dao = UsuarioDAO(password='senha123')
 
 # Define pastas padrão para upload e status
 UPLOAD_FOLDER = 'uploads'
@@ -29,12 +26,13 @@ def upload():
 
     # Busca o operador no banco de dados
     cpf = session['cpf']
-    operador = dao.buscar_por_cpf(cpf)
+    operador = UsuarioDAO(password='senha123').buscar_por_cpf(cpf)
     if not operador or not isinstance(operador, Operador):
         return "Apenas operadores podem enviar imagens.", 403
 
     # Obtém o CPF do produtor associado ao operador
-    cpf_produtor = operador.cpf_produtor
+    # Operador não guarda o produtor associado: sem ele, a pasta é a do próprio operador
+    cpf_produtor = getattr(operador, 'cpf_produtor', None) or cpf
 
     # Recupera arquivos e coordenadas do formulário
     arquivos = request.files.getlist('imagens')       # Lista de arquivos enviados
@@ -45,22 +43,14 @@ def upload():
     if not arquivos:
         return "Nenhuma imagem enviada.", 400
 
-    # Conecta ao banco de dados
-    conn = mysql.connector.connect(
-        host="localhost",
-        user="agrineural",
-        password="senha123",
-        database="agrineural"
-    )
-    cursor = conn.cursor()
-
     # Cria pastas específicas para o produtor
     upload_path = os.path.join(UPLOAD_FOLDER, cpf_produtor)
     status_path_base = os.path.join(STATUS_FOLDER, cpf_produtor)
     os.makedirs(upload_path, exist_ok=True)
     os.makedirs(status_path_base, exist_ok=True)
 
-    # Itera sobre os arquivos enviados
+    # Itera sobre os arquivos enviados, salvando cada um antes de entrar na fila
+    jobs = []
     for idx, file in enumerate(arquivos):
         if not file or not file.filename:
             continue  # Pula arquivos inválidos
@@ -74,47 +64,28 @@ def upload():
         except ValueError:
             return f"Latitude ou longitude inválida para {nome}", 400
 
-        # Salva a imagem no servidor
-        caminho_arquivo = os.path.join(upload_path, nome)
+        # Salva a imagem no servidor com um nome único: outro envio com o mesmo nome antes de o
+        # worker rodar sobrescreveria a imagem na fila. O nome original fica no job (e no status)
+        caminho_arquivo = os.path.join(upload_path, f"{uuid.uuid4().hex}_{secure_filename(nome)}")
         file.save(caminho_arquivo)
 
-        # Cria arquivo de status inicial
+        # Cria arquivo de status inicial (atualizado pelo worker ao terminar)
         caminho_status = os.path.join(status_path_base, nome + ".txt")
         with open(caminho_status, 'w', encoding='utf-8') as f:
-            f.write("Processando")
-
-        try:
-            # Instancia e usa o modelo de IA
-            modelo = ModeloAgrineural()
-            resultado = modelo.analisarImagem(caminhoArquivo=caminho_arquivo)
-
-            # Insere a imagem no banco
-            cursor.execute(
-                "INSERT INTO imagens (nome, latitude, longitude, cpf_produtor) VALUES (%s, %s, %s, %s)",
-                (nome, latitude, longitude, cpf_produtor)
-            )
-            imagem_id = cursor.lastrowid  # Recupera o ID da imagem inserida
-
-            # Insere o resultado (anômala ou não)
-            cursor.execute(
-                "INSERT INTO resultados (id, anomala) VALUES (%s, %s)",
-                (imagem_id, resultado == "Anômala")
-            )
-
-            # Atualiza o status para sucesso
-            with open(caminho_status, 'w') as f:
-                f.write(f"Concluído com sucesso! — Resultado: {resultado}")
-
-        except Exception as e:
-            # Em caso de erro, grava no arquivo de status e loga no console
-            with open(caminho_status, 'w') as f:
-                f.write(f"Erro no processamento! — {e}")
-            print(f"[ERRO] Falha ao processar {nome}: {e}")
-
-    # Finaliza transação no banco
-    conn.commit()
-    cursor.close()
-    conn.close()
-
-    # Redireciona para a página de status
-    return redirect(url_for('status.status'))
+            f.write("Na fila")
+
+        jobs.append({
+            'cpf_usuario': cpf, 'nome': nome, 'caminho_arquivo': caminho_arquivo,
+            'latitude': latitude, 'longitude': longitude, 'caminho_status': caminho_status
+        })
+
+    # Enfileira todas as imagens de uma vez; a análise acontece fora da requisição
+    job_ids = JobDAO(password='senha123').enfileirar(jobs)
+    if job_ids is None:
+        for job in jobs:
+            os.remove(job['caminho_arquivo'])
+            os.remove(job['caminho_status'])
+        return "Fila de análise cheia, tente novamente em instantes.", 429
+
+    # Responde imediatamente com os ids dos jobs (o andamento aparece em /status)
+    return jsonify({'status': 'success', 'jobs': job_ids}), 202
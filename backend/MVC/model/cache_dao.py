@@ -0,0 +1,75 @@
+# MVC/model/cache_dao.py
+
+import json
+from MVC.model.conexao import obterPool
+
+class CacheResultadoDAO:
+    def __init__(self, password: str = 'senha123'):
+        self._pool = obterPool(password=password)
+
+    def buscar(self, hashes, versao_modelo: str) -> dict:
+        """
+        Retorna {hash: {'erro', 'regioes', 'mapa_erro'}} dos hashes já analisados por esta versão do modelo.
+        """
+        hashes = list(hashes)
+        if not hashes:
+            return {}
+        with self._pool.conexao() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                marcadores = ', '.join(['%s'] * len(hashes))
+                cursor.execute(f"""
+                    SELECT hash, erro, regioes, mapa_erro
+                    FROM cache_resultados
+                    WHERE versao_modelo = %s AND hash IN ({marcadores})
+                """, (versao_modelo, *hashes))
+                return {
+                    row['hash']: {
+                        'erro': row['erro'],
+                        'regioes': json.loads(row['regioes']) if row['regioes'] else None,
+                        'mapa_erro': row['mapa_erro']
+                    } for row in cursor.fetchall()
+                }
+            finally:
+                cursor.close()
+
+    def salvar(self, entradas: dict, versao_modelo: str):
+        """
+        Grava {hash: {'erro', 'regioes', 'mapa_erro'}} para a versão do modelo.
+        """
+        if not entradas:
+            return
+        with self._pool.conexao() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.executemany("""
+                    INSERT INTO cache_resultados (hash, versao_modelo, erro, regioes, mapa_erro)
+                    VALUES (%s, %s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE erro = VALUES(erro), regioes = VALUES(regioes), mapa_erro = VALUES(mapa_erro)
+                """, [
+                    (hash_, versao_modelo, e['erro'],
+                     json.dumps(e['regioes']) if e.get('regioes') is not None else None, e.get('mapa_erro'))
+                    for hash_, e in entradas.items()
+                ])
+                conn.commit()
+            finally:
+                cursor.close()
+
+    def invalidar(self, versoes_validas: list) -> int:
+        """
+        Remove as entradas de versões do modelo fora de `versoes_validas`, comparando só o nome
+        da versão: as entradas de uma versão válida ficam para todos os backends e modos de
+        análise (v3, v3@tflite, v3+ladrilhos...). Retorna quantas foram removidas.
+        """
+        with self._pool.conexao() as conn:
+            cursor = conn.cursor()
+            try:
+                marcadores = ', '.join(['%s'] * len(versoes_validas))
+                cursor.execute(f"""
+                    DELETE FROM cache_resultados
+                    WHERE SUBSTRING_INDEX(SUBSTRING_INDEX(versao_modelo, '+', 1), '@', 1) NOT IN ({marcadores})
+                """, tuple(versoes_validas))
+                conn.commit()
+                return cursor.rowcount
+            finally:
+                cursor.close()
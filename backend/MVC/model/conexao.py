@@ -0,0 +1,293 @@
+# MVC/model/conexao.py
+
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import mysql.connector
+from mysql.connector.errors import PoolError
+from MVC import config
+
+
+# Conexões presas à unidade de trabalho atual (uma requisição, por exemplo): {pool: conexão}.
+# Um ContextVar é próprio de cada thread, então requisições simultâneas nunca dividem uma conexão
+_unidade = contextvars.ContextVar('unidade_conexoes', default=None)
+
+
+class PoolEsgotado(PoolError):
+    """
+    Nenhuma conexão ficou livre dentro do tempo limite de espera do pool.
+    """
+
+
+class PoolConexoes:
+    """
+    Pool de conexões MySQL compartilhado pelas threads do processo.
+    Mantém até `tamanho` conexões abertas e aceita mais `excedente` temporárias nos picos,
+    fechadas quando devolvidas. Quem pede uma conexão com todas em uso espera até `timeout`
+    segundos. Com `verificar`, cada conexão parada há mais de `ociosidade` segundos recebe um
+    ping antes de ser entregue e, se o servidor a fechou, é trocada por uma nova.
+    """
+
+    def __init__(self, tamanho=config.TAMANHO_POOL, excedente=config.EXCEDENTE_POOL,
+                 timeout=config.TIMEOUT_POOL, verificar=True, ociosidade=config.OCIOSIDADE_POOL,
+                 **db_config):
+        self.tamanho = tamanho
+        self.excedente = excedente
+        self.timeout = timeout
+        self.verificar = verificar
+        self.ociosidade = ociosidade
+        self._db_config = db_config
+        self._condicao = threading.Condition()
+        self._reiniciar()
+
+    def _reiniciar(self):
+        # Estado do processo atual: depois de um fork, as conexões herdadas pertencem ao pai
+        self._pid = os.getpid()
+        self._livres = deque()      # (conexão, instante da devolução); a mais recente no fim
+        self._abertas = 0
+        self._em_uso = 0
+        self._metricas = {
+            'emprestimos': 0, 'esperas': 0, 'tempo_espera': 0.0, 'maior_espera': 0.0,
+            'timeouts': 0, 'conexoes_criadas': 0, 'conexoes_trocadas': 0, 'pico_em_uso': 0
+        }
+
+    def _conectar(self):
+        conn = mysql.connector.connect(**self._db_config)
+        with self._condicao:
+            self._metricas['conexoes_criadas'] += 1
+        return conn
+
+    def _saudavel(self, conn, devolvida_em):
+        if not self.verificar or time.monotonic() - devolvida_em < self.ociosidade:
+            return True
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except mysql.connector.Error:
+            return False
+
+    def emprestar(self, timeout=None):
+        """
+        Retorna uma conexão do pool (ou uma nova, se ainda houver vaga).
+        Lança PoolEsgotado se nenhuma ficar livre em `timeout` segundos (padrão: o do pool).
+        """
+        timeout = self.timeout if timeout is None else timeout
+        inicio = time.monotonic()
+        with self._condicao:
+            if self._pid != os.getpid():
+                self._reiniciar()
+            esperou = False
+            while not self._livres and self._abertas >= self.tamanho + self.excedente:
+                esperou = True
+                restante = timeout - (time.monotonic() - inicio)
+                if restante <= 0:
+                    self._metricas['timeouts'] += 1
+                    raise PoolEsgotado(
+                        f"Nenhuma conexão livre em {timeout}s ({self._abertas} abertas, todas em uso)"
+                    )
+                self._condicao.wait(restante)
+            livre = self._livres.pop() if self._livres else None
+            if livre is None:
+                self._abertas += 1  # reserva a vaga antes de conectar fora do lock
+            self._em_uso += 1
+            espera = time.monotonic() - inicio
+            self._metricas['emprestimos'] += 1
+            self._metricas['tempo_espera'] += espera
+            self._metricas['maior_espera'] = max(self._metricas['maior_espera'], espera)
+            self._metricas['esperas'] += esperou
+            self._metricas['pico_em_uso'] = max(self._metricas['pico_em_uso'], self._em_uso)
+
+        try:
+            if livre is None:
+                return self._conectar()
+            conn, devolvida_em = livre
+            if self._saudavel(conn, devolvida_em):
+                return conn
+            self._fecharSilenciosamente(conn)
+            with self._condicao:
+                self._metricas['conexoes_trocadas'] += 1
+            return self._conectar()
+        except Exception:
+            with self._condicao:
+                self._abertas -= 1
+                self._em_uso -= 1
+                self._condicao.notify()
+            raise
+
+    def devolver(self, conn, descartar=False):
+        """
+        Devolve a conexão ao pool. Uma transação deixada aberta é desfeita, para que o próximo
+        usuário não herde o estado. Conexões quebradas ou excedentes são fechadas.
+        """
+        if self._pid != os.getpid():
+            return  # emprestada antes do fork; o pool deste processo já foi reiniciado
+        if not descartar:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except mysql.connector.Error:
+                descartar = True
+
+        with self._condicao:
+            self._em_uso -= 1
+            if descartar or len(self._livres) >= self.tamanho:
+                self._abertas -= 1
+            else:
+                self._livres.append((conn, time.monotonic()))
+                conn = None
+            self._condicao.notify()
+        if conn is not None:
+            self._fecharSilenciosamente(conn)
+
+    @contextmanager
+    def conexao(self, timeout=None):
+        """
+        Empresta uma conexão durante o bloco `with` e a devolve ao final, mesmo com exceção.
+        Uma exceção de conexão (OperationalError/InterfaceError) descarta a conexão em vez de devolvê-la.
+        Dentro de uma unidade de trabalho (ver iniciarUnidade), todos os blocos recebem a mesma
+        conexão, emprestada no primeiro uso e devolvida só em encerrarUnidade; ao fim de cada
+        bloco externo, a transação deixada aberta é desfeita, como na devolução.
+        """
+        unidade = _unidade.get()
+        if unidade is not None:
+            presa = unidade.get(self)
+            if presa is None:
+                presa = unidade[self] = [self.emprestar(timeout), 0]  # [conexão, blocos abertos]
+            conn = presa[0]
+            presa[1] += 1
+            try:
+                yield conn
+            except (mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError):
+                if unidade.get(self) is presa:  # blocos aninhados: só o primeiro a ver o erro descarta
+                    del unidade[self]
+                    self.devolver(conn, descartar=True)
+                raise
+            finally:
+                presa[1] -= 1
+                if presa[1] == 0 and unidade.get(self) is presa:
+                    self._encerrarTransacao(conn, unidade)
+            return
+
+        conn = self.emprestar(timeout)
+        descartar = False
+        try:
+            yield conn
+        except (mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError):
+            descartar = True
+            raise
+        finally:
+            self.devolver(conn, descartar=descartar)
+
+    def _encerrarTransacao(self, conn, unidade):
+        # Fim de um bloco externo com a conexão presa à unidade: a transação que ficou aberta (um
+        # SELECT com autocommit desligado já abre uma) é desfeita, como faria `devolver`. Senão o
+        # próximo DAO da requisição herdaria o estado e o seu start_transaction() falharia
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except mysql.connector.Error:
+            del unidade[self]
+            self.devolver(conn, descartar=True)
+
+    def metricas(self):
+        """
+        Contadores do pool neste processo: empréstimos, tempo de espera (médio e maior, em ms),
+        timeouts, conexões abertas/em uso e a utilização (em uso / capacidade máxima).
+        """
+        with self._condicao:
+            m = dict(self._metricas)
+            m['espera_media_ms'] = 1000 * m['tempo_espera'] / m['emprestimos'] if m['emprestimos'] else 0.0
+            m['maior_espera_ms'] = 1000 * m.pop('maior_espera')
+            m.pop('tempo_espera')
+            m.update(abertas=self._abertas, livres=len(self._livres), em_uso=self._em_uso,
+                     capacidade=self.tamanho + self.excedente,
+                     utilizacao=self._em_uso / (self.tamanho + self.excedente))
+            return m
+
+    def fechar(self):
+        """
+        Fecha as conexões livres (as emprestadas são fechadas ao serem devolvidas).
+        """
+        with self._condicao:
+            livres, self._livres = list(self._livres), deque()
+            self._abertas -= len(livres)
+        for conn, _ in livres:
+            self._fecharSilenciosamente(conn)
+
+    @staticmethod
+    def _fecharSilenciosamente(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+_pools = {}
+_lock_pools = threading.Lock()
+
+
+def obterPool(host='localhost', user='agrineural', password='senha123', database='agrineural', **extras):
+    """
+    Pool do processo para estas credenciais, criado no primeiro uso. Todos os DAOs com a
+    mesma configuração compartilham o mesmo pool.
+    """
+    chave = (host, user, password, database, tuple(sorted(extras.items())))
+    with _lock_pools:
+        if chave not in _pools:
+            _pools[chave] = PoolConexoes(host=host, user=user, password=password, database=database, **extras)
+        return _pools[chave]
+
+
+def conexao(**db_config):
+    """
+    Atalho para `obterPool(**db_config).conexao()`:
+        with conexao() as conn:
+            ...
+    """
+    return obterPool(**db_config).conexao()
+
+
+def iniciarUnidade():
+    """
+    Abre uma unidade de trabalho no contexto atual: até encerrarUnidade, os DAOs usam uma única
+    conexão de cada pool, emprestada só quando a primeira consulta acontece.
+    """
+    unidade = {}
+    _unidade.set(unidade)
+    return unidade
+
+
+def encerrarUnidade():
+    """
+    Devolve aos pools as conexões da unidade de trabalho atual (transações abertas são desfeitas).
+    """
+    unidade = _unidade.get()
+    _unidade.set(None)
+    for pool, (conn, _) in (unidade or {}).items():
+        pool.devolver(conn)
+
+
+def liberarUnidade():
+    """
+    Devolve aos pools as conexões da unidade de trabalho atual sem encerrá-la: a próxima consulta
+    empresta outra. Para um trecho longo sem banco no meio da requisição (a inferência), em que
+    a conexão ficaria presa sem uso. Conexões com um bloco `with` ainda aberto continuam presas.
+    """
+    unidade = _unidade.get()
+    for pool, (conn, blocos) in list((unidade or {}).items()):
+        if blocos == 0:
+            del unidade[pool]
+            pool.devolver(conn)
+
+
+def metricas():
+    """
+    Métricas de todos os pools do processo, por usuário@host/banco.
+    """
+    with _lock_pools:
+        pools = dict(_pools)
+    return {f"{user}@{host}/{database}": pool.metricas() for (host, user, _, database, _), pool in pools.items()}
@@ -0,0 +1,85 @@
+# MVC/model/escritor_lote.py
+
+import threading
+import time
+
+from MVC import config
+
+
+class EscritorLote:
+    """
+    Acumula pares imagem + resultado e os grava juntos com ImagemDAO.salvar_lote: uma transação
+    e um commit por lote, em vez de dois INSERTs e um commit por imagem.
+    O lote é gravado ao chegar a `tamanho` registros, em `descarregar` ou, se o registro mais
+    antigo já espera há `intervalo` segundos, em `descarregarVencido` (chamado por quem produz
+    os registros entre uma leva e outra). Depois da gravação, o `aoGravar` de cada registro
+    recebe o id da imagem, ou None se ele não foi gravado. Se o lote falha por causa dos dados
+    (chave estrangeira, nome longo demais...), os registros são regravados um a um e só os
+    ruins recebem None.
+    """
+
+    def __init__(self, imagem_dao, tamanho=config.TAMANHO_LOTE_ESCRITA, intervalo=config.INTERVALO_ESCRITA):
+        self.imagem_dao = imagem_dao
+        self.tamanho = tamanho
+        self.intervalo = intervalo
+        self._pendentes = []  # (registro, aoGravar)
+        self._desde = None    # quando entrou o registro mais antigo ainda não gravado
+        self._lock = threading.Lock()
+
+    def adicionar(self, registro, aoGravar=None):
+        with self._lock:
+            if not self._pendentes:
+                self._desde = time.monotonic()
+            self._pendentes.append((registro, aoGravar))
+            cheio = len(self._pendentes) >= self.tamanho
+        if cheio:
+            self.descarregar()
+
+    def pendentes(self):
+        """
+        Registros ainda não gravados (sem 'id'), na ordem em que entraram.
+        """
+        with self._lock:
+            return [registro for registro, _ in self._pendentes]
+
+    @property
+    def vencido(self):
+        with self._lock:
+            return bool(self._pendentes) and time.monotonic() - self._desde >= self.intervalo
+
+    def descarregarVencido(self):
+        if self.vencido:
+            self.descarregar()
+
+    def descarregar(self):
+        """
+        Grava tudo o que está pendente e chama os `aoGravar`. Retorna quantos registros foram gravados.
+        """
+        with self._lock:
+            lote, self._pendentes, self._desde = self._pendentes, [], None
+        if not lote:
+            return 0
+        registros = [registro for registro, _ in lote]
+        try:
+            ids = self.imagem_dao.salvar_lote(registros)
+            if ids is None and len(registros) > 1:
+                print(f"[ERRO] Lote de {len(registros)} imagens recusado; gravando uma a uma.")
+                ids = self._umAUm(registros)
+        except Exception as e:
+            # Pool esgotado ou banco fora do ar: o lote falha inteiro e não adianta repetir
+            print(f"[ERRO] Falha ao gravar lote de {len(lote)} imagens: {e}")
+            ids = [None] * len(lote)
+        ids = ids or [None] * len(lote)
+        for imagem_id, (_, aoGravar) in zip(ids, lote):
+            if aoGravar is not None:
+                aoGravar(imagem_id)
+        return sum(imagem_id is not None for imagem_id in ids)
+
+    def _umAUm(self, registros):
+        # Em ordem: a original é regravada antes das suas duplicatas; se ela falhar,
+        # as duplicatas entram sem a referência (salvar_lote grava NULL)
+        ids = []
+        for registro in registros:
+            gravado = self.imagem_dao.salvar_lote([registro])
+            ids.append(gravado[0] if gravado else None)
+        return ids
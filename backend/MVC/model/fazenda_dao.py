@@ -1,6 +1,6 @@
 # MVC/model/fazenda_dao.py
 
-import mysql.connector
+from MVC.model.conexao import obterPool
 
 class FazendaDAO:
     def __init__(self,
@@ -8,18 +8,8 @@ class FazendaDAO:
                  user: str = 'agrineural',
                  password: str = 'senha123',
                  database: str = 'agrineural'):
-        try:
-            self.conn = mysql.connector.connect(
-                host=host,
-                user=user,
-                password=password,
-                database=database
-            )
-            self.cursor = self.conn.cursor(dictionary=True) 
-            print("[INFO] Conexão com o banco de dados estabelecida (FazendaDAO).")
-        except mysql.connector.Error as err:
-            print(f"[ERRO] Falha na conexão (FazendaDAO): {err}")
-            raise
+        # Não abre conexão: cada método empresta uma do pool do processo
+        self._pool = obterPool(host=host, user=user, password=password, database=database)
 
     def criar_fazenda(self,
                       cpf_produtor: str,
@@ -33,10 +23,11 @@ class FazendaDAO:
               (cpf_produtor, ccir, nome, latitude, longitude, ext_territorial)
             VALUES (%s, %s, %s, %s, %s, %s)
         """
-        self.cursor.execute(sql, (cpf_produtor, ccir, nome,
-                                  latitude, longitude, ext_territorial))
-        self.conn.commit()
-        return self.cursor.lastrowid
+        with self._pool.conexao() as conn, conn.cursor() as cursor:
+            cursor.execute(sql, (cpf_produtor, ccir, nome,
+                                 latitude, longitude, ext_territorial))
+            conn.commit()
+            return cursor.lastrowid
 
     # MÉTODO CORRIGIDO
     def buscar_fazenda_por_id(self, fazenda_id: int):
@@ -54,22 +45,40 @@ class FazendaDAO:
             JOIN usuarios AS u ON f.cpf_produtor = u.cpf
             WHERE f.id = %s
         """
-        self.cursor.execute(sql, (fazenda_id,))
-        return self.cursor.fetchone()
+        with self._pool.conexao() as conn, conn.cursor(dictionary=True) as cursor:
+            cursor.execute(sql, (fazenda_id,))
+            return cursor.fetchone()
 
-    def buscar_imagens_e_resultados_por_fazenda(self, fazenda_id: int):
+    def buscar_imagens_e_resultados_por_fazenda(self, fazenda_id: int, colapsar_duplicatas: bool = True):
         """
         Busca todas as imagens e seus resultados de anomalia para uma fazenda específica.
+        Com `colapsar_duplicatas`, frames quase iguais aparecem uma vez só (a imagem original),
+        marcada como anômala se alguma do grupo for, e com a quantidade de duplicatas.
+        Imagens descartadas pelo filtro prévio não entram no mapa.
         """
+        if not colapsar_duplicatas:
+            sql = """
+                SELECT nome, latitude AS lat, longitude AS lng, anomala, regioes
+                FROM imagens
+                WHERE fazenda_id = %s AND descarte IS NULL
+            """
+            with self._pool.conexao() as conn, conn.cursor(dictionary=True) as cursor:
+                cursor.execute(sql, (fazenda_id,))
+                return cursor.fetchall()
+
         sql = """
             SELECT
-                i.nome, i.latitude AS lat, i.longitude AS lng, r.anomala
+                i.nome, i.latitude AS lat, i.longitude AS lng,
+                (i.anomala OR COALESCE(MAX(d.anomala), 0)) AS anomala, i.regioes,
+                COUNT(d.id) AS duplicatas
             FROM imagens AS i
-            JOIN resultados AS r ON i.id = r.id
-            WHERE i.fazenda_id = %s
+            LEFT JOIN imagens AS d ON d.duplicata_de = i.id
+            WHERE i.fazenda_id = %s AND i.duplicata_de IS NULL AND i.descarte IS NULL
+            GROUP BY i.id
         """
-        self.cursor.execute(sql, (fazenda_id,))
-        return self.cursor.fetchall()
+        with self._pool.conexao() as conn, conn.cursor(dictionary=True) as cursor:
+            cursor.execute(sql, (fazenda_id,))
+            return cursor.fetchall()
     
     def buscar_fazendas_por_produtor(self, cpf_produtor: str):
         """
@@ -80,5 +89,45 @@ class FazendaDAO:
             FROM fazendas
             WHERE cpf_produtor = %s
         """
-        self.cursor.execute(sql, (cpf_produtor,))
-        return self.cursor.fetchall()
\ No newline at end of file
+        with self._pool.conexao() as conn, conn.cursor(dictionary=True) as cursor:
+            cursor.execute(sql, (cpf_produtor,))
+            return cursor.fetchall()
+
+    def buscar_thresholds(self, fazenda_ids) -> dict:
+        """
+        Retorna {fazenda_id: threshold} das fazendas que têm threshold próprio.
+        """
+        fazenda_ids = list(fazenda_ids)
+        if not fazenda_ids:
+            return {}
+        marcadores = ', '.join(['%s'] * len(fazenda_ids))
+        sql = f"""
+            SELECT id, threshold
+            FROM fazendas
+            WHERE id IN ({marcadores}) AND threshold IS NOT NULL
+        """
+        # A transação de leitura termina ao devolver a conexão ao pool: workers de longa
+        # duração enxergam os thresholds alterados depois da primeira consulta
+        with self._pool.conexao() as conn, conn.cursor(dictionary=True) as cursor:
+            cursor.execute(sql, tuple(fazenda_ids))
+            return {row['id']: row['threshold'] for row in cursor.fetchall()}
+
+    def reclassificar(self, fazenda_id: int, threshold: float, threshold_fazenda=None, versao_modelo=None) -> int:
+        """
+        Reclassifica as imagens da fazenda comparando o erro já armazenado com o novo threshold,
+        sem rodar o modelo de novo. `threshold_fazenda` é o valor gravado na fazenda
+        (None volta a usar o padrão do modelo). Só as imagens analisadas por `versao_modelo`
+        mudam: o erro de outra versão está em outra escala e o threshold não vale para ele.
+        Retorna quantas imagens foram reclassificadas.
+        """
+        sql = """
+            UPDATE imagens
+            SET anomala = (erro > %s)
+            WHERE fazenda_id = %s AND erro IS NOT NULL AND versao_modelo <=> %s
+        """
+        with self._pool.conexao() as conn, conn.cursor() as cursor:
+            cursor.execute("UPDATE fazendas SET threshold = %s WHERE id = %s", (threshold_fazenda, fazenda_id))
+            cursor.execute(sql, (threshold, fazenda_id, versao_modelo))
+            linhas = cursor.rowcount
+            conn.commit()
+            return linhas
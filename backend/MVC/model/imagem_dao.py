@@ -1,41 +1,134 @@
 # MVC/model/imagem_dao.py
 
-import mysql.connector
-from mysql.connector import Error
+import json
+from mysql.connector import Error, errors
+from MVC.model.conexao import obterPool
+
+_PENDENTE = object()  # original do mesmo lote, ainda sem id
+
+QUERY_IMAGEM = """
+    INSERT INTO imagens (fazenda_id, nome, latitude, longitude, dhash, duplicata_de,
+                         anomala, erro, versao_modelo, mapa_erro, regioes, descarte)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
 
 class ImagemDAO:
     def __init__(self, password: str = 'senha123'):
-        # Apenas guarda as configurações
-        self._db_config = {
-            'host': 'localhost', 'user': 'agrineural',
-            'password': password, 'database': 'agrineural'
-        }
-
-    def _get_connection(self):
-        # Cada método cria sua própria conexão
-        return mysql.connector.connect(**self._db_config)
-
-    def salvar_imagem_e_resultado(self, fazenda_id, nome_arquivo, latitude, longitude, anomala):
-        conn = self._get_connection()
-        nova_imagem_id = None
-        try:
+        # Cada método pega uma conexão do pool do processo e a devolve ao terminar
+        self._pool = obterPool(password=password)
+        self._passo_ids = None  # incremento dos ids de um INSERT de várias linhas (0: não são consecutivos)
+
+    def salvar_imagem_e_resultado(self, fazenda_id, nome_arquivo, latitude, longitude, anomala,
+                                  erro=None, versao_modelo=None, mapa_erro=None, regioes=None,
+                                  dhash=None, duplicata_de=None, descarte=None):
+        # Imagem e resultado ficam na mesma linha (migração 0008): um INSERT só
+        with self._pool.conexao() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(QUERY_IMAGEM, (fazenda_id, nome_arquivo, latitude, longitude, dhash, duplicata_de,
+                                              anomala, erro, versao_modelo, mapa_erro,
+                                              json.dumps(regioes) if regioes is not None else None, descarte))
+                nova_imagem_id = cursor.lastrowid
+                conn.commit()
+                return nova_imagem_id
+            except Error as e:
+                conn.rollback()
+                print(f"Erro na transação (ImagemDAO): {e}")
+                return None
+            finally:
+                cursor.close()
+
+    def salvar_lote(self, registros):
+        """
+        Grava várias imagens com os seus resultados numa única transação, com um commit só.
+        Cada registro é um dict com os argumentos de salvar_imagem_e_resultado e recebe o 'id'
+        gerado; 'duplicata_de' também pode ser o próprio registro da original, se ela ainda não
+        tinha id (gravada no mesmo lote). Uma original sem id que não está no lote (o lote dela
+        falhou) fica como NULL. As linhas vão num único INSERT quando o servidor garante ids
+        consecutivos para ele, senão uma a uma.
+        Retorna os ids na ordem dos registros, ou None se a transação falhar por causa dos dados.
+        Erros de conexão são propagados, já que repetir as linhas não adiantaria.
+        """
+        if not registros:
+            return []
+        with self._pool.conexao() as conn:
             cursor = conn.cursor()
-            conn.start_transaction()
-            
-            query_imagem = "INSERT INTO imagens (fazenda_id, nome, latitude, longitude) VALUES (%s, %s, %s, %s)"
-            cursor.execute(query_imagem, (fazenda_id, nome_arquivo, latitude, longitude))
-            nova_imagem_id = cursor.lastrowid
-
-            query_resultado = "INSERT INTO resultados (id, anomala) VALUES (%s, %s)"
-            cursor.execute(query_resultado, (nova_imagem_id, anomala))
-            
-            conn.commit()
-            return nova_imagem_id
-        except Error as e:
-            conn.rollback()
-            print(f"Erro na transação (ImagemDAO): {e}")
-            return None
-        finally:
-            if conn.is_connected():
+            try:
+                conn.start_transaction()
+                passo = self._passo_ids_consecutivos(cursor)
+                no_lote = {id(r) for r in registros}
+                if passo:
+                    # executemany junta as linhas num só INSERT ... VALUES (...), (...);
+                    # lastrowid é o id da primeira e as demais seguem o incremento do servidor
+                    # Duplicatas de imagens do mesmo lote entram sem a original e são ligadas depois
+                    tardias = [r for r in registros if self._id_original(r, no_lote) is _PENDENTE]
+                    cursor.executemany(QUERY_IMAGEM, [self._linha_imagem(r, no_lote) for r in registros])
+                    for i, registro in enumerate(registros):
+                        registro['id'] = cursor.lastrowid + i * passo
+                    if tardias:
+                        cursor.executemany("UPDATE imagens SET duplicata_de = %s WHERE id = %s",
+                                           [(r['duplicata_de']['id'], r['id']) for r in tardias])
+                else:
+                    # Uma a uma, a original (anterior no lote) já tem id quando a duplicata é inserida
+                    for registro in registros:
+                        cursor.execute(QUERY_IMAGEM, self._linha_imagem(registro, no_lote))
+                        registro['id'] = cursor.lastrowid
+
+                conn.commit()
+                return [r['id'] for r in registros]
+            except Error as e:
+                for registro in registros:
+                    registro.pop('id', None)
+                if isinstance(e, (errors.OperationalError, errors.InterfaceError)):
+                    raise  # conexão perdida: o pool descarta a conexão
+                conn.rollback()
+                print(f"Erro na transação em lote (ImagemDAO): {e}")
+                return None
+            finally:
+                cursor.close()
+
+    def _passo_ids_consecutivos(self, cursor):
+        # Com innodb_autoinc_lock_mode 0 ou 1, um INSERT de várias linhas recebe ids consecutivos
+        # (de auto_increment_increment em auto_increment_increment). No modo 2, padrão do
+        # MySQL 8, INSERTs simultâneos podem intercalar ids e não dá para deduzi-los
+        if self._passo_ids is None:
+            cursor.execute("SELECT @@innodb_autoinc_lock_mode, @@auto_increment_increment")
+            modo, incremento = cursor.fetchone()
+            self._passo_ids = int(incremento) if int(modo) <= 1 else 0
+        return self._passo_ids
+
+    @staticmethod
+    def _id_original(registro, no_lote=frozenset()):
+        # _PENDENTE: a original é gravada neste mesmo lote e ainda não tem id
+        duplicata_de = registro.get('duplicata_de')
+        if isinstance(duplicata_de, dict):
+            if 'id' in duplicata_de:
+                return duplicata_de['id']
+            return _PENDENTE if id(duplicata_de) in no_lote else None
+        return duplicata_de
+
+    @classmethod
+    def _linha_imagem(cls, r, no_lote=frozenset()):
+        duplicata_de = cls._id_original(r, no_lote)
+        return (r['fazenda_id'], r['nome_arquivo'], r['latitude'], r['longitude'], r.get('dhash'),
+                None if duplicata_de is _PENDENTE else duplicata_de, r['anomala'], r.get('erro'),
+                r.get('versao_modelo'), r.get('mapa_erro'),
+                json.dumps(r['regioes']) if r.get('regioes') is not None else None, r.get('descarte'))
+
+    def buscar_dhashes(self, fazenda_id: int, apos_id: int = 0):
+        """
+        Imagens da fazenda com dHash e id maior que `apos_id`, com o erro do resultado,
+        para montar o índice de duplicatas.
+        """
+        with self._pool.conexao() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.execute("""
+                    SELECT id, dhash, latitude, longitude, duplicata_de, erro
+                    FROM imagens
+                    WHERE fazenda_id = %s AND id > %s AND dhash IS NOT NULL
+                    ORDER BY id
+                """, (fazenda_id, apos_id))
+                return cursor.fetchall()
+            finally:
                 cursor.close()
-                conn.close()
\ No newline at end of file
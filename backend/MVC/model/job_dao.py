@@ -0,0 +1,169 @@
+# MVC/model/job_dao.py
+
+from mysql.connector import Error
+from MVC import config
+from MVC.model.conexao import obterPool
+
+TRAVA_FILA = 'agrineural_jobs_analise'  # GET_LOCK que serializa a verificação do limite da fila
+
+class JobDAO:
+    def __init__(self, password: str = 'senha123'):
+        self._pool = obterPool(password=password)
+
+    def enfileirar(self, jobs: list, limite: int = config.MAX_JOBS_EM_ANDAMENTO):
+        """
+        Insere os jobs (dicts com cpf_usuario, nome, caminho_arquivo, latitude, longitude e,
+        opcionalmente, fazenda_id e caminho_status) numa única transação.
+        Retorna a lista de ids ou None se a fila já estiver no limite de jobs em andamento
+        (ou se a vez de enfileirar não chegou em `config.TIMEOUT_ENFILEIRAR` segundos).
+        """
+        with self._pool.conexao() as conn:
+            cursor = conn.cursor()
+            travado = False
+            try:
+                conn.start_transaction()
+
+                # Sem trava, dois uploads simultâneos contavam a fila ao mesmo tempo e passavam
+                # juntos do limite. A trava nomeada vale até depois do commit; a contagem abaixo
+                # é a primeira leitura da transação e já enxerga os jobs de quem saiu da trava
+                cursor.execute("SELECT GET_LOCK(%s, %s)", (TRAVA_FILA, config.TIMEOUT_ENFILEIRAR))
+                (travado,) = cursor.fetchone()
+                if not travado:
+                    conn.rollback()
+                    return None
+
+                cursor.execute("SELECT COUNT(*) FROM jobs_analise WHERE status IN ('pendente', 'processando')")
+                (em_andamento,) = cursor.fetchone()
+                if em_andamento + len(jobs) > limite:
+                    conn.rollback()
+                    return None
+
+                sql = """
+                    INSERT INTO jobs_analise
+                      (cpf_usuario, nome, caminho_arquivo, latitude, longitude,
+                       fazenda_id, caminho_status, max_tentativas)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                """
+                ids = []
+                for job in jobs:
+                    cursor.execute(sql, (job['cpf_usuario'], job['nome'], job['caminho_arquivo'],
+                                         job['latitude'], job['longitude'], job.get('fazenda_id'),
+                                         job.get('caminho_status'), config.MAX_TENTATIVAS))
+                    ids.append(cursor.lastrowid)
+                conn.commit()
+                return ids
+            except Error:
+                conn.rollback()
+                raise
+            finally:
+                if travado:
+                    self._liberar_trava(cursor)
+                cursor.close()
+
+    @staticmethod
+    def _liberar_trava(cursor):
+        # Se a conexão caiu, o servidor já liberou a trava junto com a sessão
+        try:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (TRAVA_FILA,))
+            cursor.fetchone()
+        except Error:
+            pass
+
+    def reservar(self, worker: str, quantidade: int) -> list:
+        """
+        Marca até `quantidade` jobs pendentes como 'processando' para o worker e os retorna.
+        SKIP LOCKED permite que vários workers consultem a fila ao mesmo tempo sem disputar as mesmas linhas.
+        """
+        with self._pool.conexao() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                conn.start_transaction()
+                cursor.execute("""
+                    SELECT id, nome, caminho_arquivo, latitude, longitude, fazenda_id, caminho_status, tentativas
+                    FROM jobs_analise
+                    WHERE status = 'pendente'
+                    ORDER BY id
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                """, (quantidade,))
+                jobs = cursor.fetchall()
+                if jobs:
+                    marcadores = ', '.join(['%s'] * len(jobs))
+                    cursor.execute(f"""
+                        UPDATE jobs_analise
+                        SET status = 'processando', tentativas = tentativas + 1, worker = %s
+                        WHERE id IN ({marcadores})
+                    """, (worker, *[job['id'] for job in jobs]))
+                conn.commit()
+                return jobs
+            except Error:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def concluir(self, job_id: int, resultado: str, imagem_id=None):
+        with self._pool.conexao() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("""
+                    UPDATE jobs_analise
+                    SET status = 'concluido', resultado = %s, imagem_id = %s, mensagem_erro = NULL
+                    WHERE id = %s
+                """, (resultado, imagem_id, job_id))
+                conn.commit()
+            finally:
+                cursor.close()
+
+    def falhar(self, job_id: int, mensagem: str) -> bool:
+        """
+        Devolve o job à fila para nova tentativa ou o marca como 'erro' se as tentativas acabaram.
+        Retorna True quando o job não será mais tentado.
+        """
+        with self._pool.conexao() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("""
+                    UPDATE jobs_analise
+                    SET status = IF(tentativas >= max_tentativas, 'erro', 'pendente'), mensagem_erro = %s
+                    WHERE id = %s
+                """, (mensagem[:1000], job_id))
+                cursor.execute("SELECT status FROM jobs_analise WHERE id = %s", (job_id,))
+                (status,) = cursor.fetchone()
+                conn.commit()
+                return status == 'erro'
+            finally:
+                cursor.close()
+
+    def recuperar_expirados(self, segundos: int = config.TIMEOUT_JOB) -> int:
+        """
+        Devolve à fila os jobs presos em 'processando' (por exemplo, worker que morreu no meio).
+        """
+        with self._pool.conexao() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("""
+                    UPDATE jobs_analise
+                    SET status = IF(tentativas >= max_tentativas, 'erro', 'pendente'),
+                        mensagem_erro = 'Tempo limite de processamento excedido'
+                    WHERE status = 'processando'
+                      AND atualizado_em < NOW() - INTERVAL %s SECOND
+                """, (segundos,))
+                conn.commit()
+                return cursor.rowcount
+            finally:
+                cursor.close()
+
+    def buscar(self, job_id: int):
+        with self._pool.conexao() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.execute("""
+                    SELECT id, status, cpf_usuario, nome, fazenda_id, tentativas,
+                           resultado, imagem_id, mensagem_erro
+                    FROM jobs_analise
+                    WHERE id = %s
+                """, (job_id,))
+                return cursor.fetchone()
+            finally:
+                cursor.close()
@@ -0,0 +1,99 @@
+# MVC/model/migracoes.py
+
+import argparse
+import os
+import re
+
+from MVC.model.conexao import obterPool
+
+# aplica, em ordem, os scripts de backend/migrations/ ainda não registrados em schema_migrations
+# uso (a partir de backend/): python -m MVC.model.migracoes [--status] [--ate 0007] [--marcar-ate 0006]
+
+PASTA_MIGRACOES = os.path.join(os.path.dirname(__file__), '..', '..', 'migrations')
+
+CRIAR_TABELA = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        versao VARCHAR(255) PRIMARY KEY,
+        aplicada_em TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def listarMigracoes(pasta=PASTA_MIGRACOES):
+    """
+    [(versao, caminho)] dos arquivos NNNN_nome.sql da pasta, em ordem de versão.
+    """
+    migracoes = []
+    for nome in sorted(os.listdir(pasta)):
+        if re.match(r'^\d{4}_.+\.sql$', nome):
+            migracoes.append((nome[:-4], os.path.join(pasta, nome)))
+    return migracoes
+
+
+def comandos(sql):
+    """
+    Divide um script em comandos, sem comentários de linha e sem `USE` (a conexão já aponta
+    para o banco certo). Os scripts do projeto não têm procedures nem ';' dentro de strings.
+    """
+    linhas = [re.sub(r'(^|\s)--(\s.*)?$', '', l) for l in sql.splitlines()]
+    resultado = []
+    for comando in '\n'.join(linhas).split(';'):
+        comando = comando.strip()
+        if comando and not re.match(r'^USE\s', comando, re.IGNORECASE):
+            resultado.append(comando)
+    return resultado
+
+
+def aplicadas(cursor):
+    cursor.execute(CRIAR_TABELA)
+    cursor.execute("SELECT versao FROM schema_migrations")
+    return {versao for (versao,) in cursor.fetchall()}
+
+
+def migrar(ate=None, marcar_ate=None, pasta=PASTA_MIGRACOES, **db_config):
+    """
+    Aplica as migrações pendentes até a versão `ate` (inclusive; todas por padrão) e retorna
+    as versões aplicadas. `marcar_ate` só registra como aplicadas, sem executar, as migrações
+    até essa versão (bancos em que os scripts já foram rodados à mão).
+    No MySQL cada DDL faz commit sozinho: se um script falhar no meio, ele não é registrado e
+    os comandos anteriores a ele precisam ser conferidos antes de rodar de novo.
+    """
+    novas = []
+    with obterPool(**db_config).conexao() as conn, conn.cursor() as cursor:
+        feitas = aplicadas(cursor)
+        for versao, caminho in listarMigracoes(pasta):
+            if versao in feitas:
+                continue
+            if ate and versao[:4] > ate[:4]:
+                break
+            if marcar_ate and versao[:4] <= marcar_ate[:4]:
+                print(f"[INFO] Migração {versao} marcada como aplicada (não executada).")
+            else:
+                with open(caminho, encoding='utf-8') as f:
+                    for comando in comandos(f.read()):
+                        cursor.execute(comando)
+                print(f"[INFO] Migração {versao} aplicada.")
+            cursor.execute("INSERT INTO schema_migrations (versao) VALUES (%s)", (versao,))
+            conn.commit()
+            novas.append(versao)
+    return novas
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Migrações do banco (pasta migrations/)')
+    parser.add_argument('--status', action='store_true', help='só lista as migrações e se já foram aplicadas')
+    parser.add_argument('--ate', help='aplica só até esta versão (ex.: 0007)')
+    parser.add_argument('--marcar-ate', help='registra sem executar as migrações até esta versão')
+    parser.add_argument('--banco', default='agrineural')
+    args = parser.parse_args()
+
+    if args.status:
+        with obterPool(database=args.banco).conexao() as conn, conn.cursor() as cursor:
+            feitas = aplicadas(cursor)
+            conn.commit()
+        for versao, _ in listarMigracoes():
+            print(f"{'[x]' if versao in feitas else '[ ]'} {versao}")
+    else:
+        novas = migrar(ate=args.ate, marcar_ate=args.marcar_ate, database=args.banco)
+        if not novas:
+            print("[INFO] Nenhuma migração pendente.")
@@ -1,6 +1,6 @@
 # MVC/model/relatorio_dao.py
 
-import mysql.connector
+from MVC.model.conexao import obterPool
 
 class RelatorioDAO:
     def __init__(self,
@@ -8,44 +8,40 @@ class RelatorioDAO:
                  user: str = 'agrineural',
                  password: str = 'senha123',
                  database: str = 'agrineural'):
-        try:
-            self.conn = mysql.connector.connect(
-                host=host,
-                user=user,
-                password=password,
-                database=database
-            )
-            self.cursor = self.conn.cursor(dictionary=True) 
-            print("[INFO] Conexão com o banco de dados estabelecida (RelatorioDAO).")
-        except mysql.connector.Error as err:
-            print(f"[ERRO] Falha na conexão (RelatorioDAO): {err}")
-            raise
+        # Não abre conexão: cada método empresta uma do pool do processo
+        self._pool = obterPool(host=host, user=user, password=password, database=database)
 
-    def get_farm_image_stats(self, fazenda_id: int):
+    def get_farm_image_stats(self, fazenda_id: int, threshold: float = None):
         """
         Calcula o total de imagens, imagens anômalas e imagens normais para uma fazenda.
         Retorna também a data da última imagem (se disponível, caso a coluna data_registro seja adicionada futuramente).
+        Com `threshold`, as imagens que têm erro armazenado são recontadas com esse valor
+        (simulação, nada é gravado). Imagens descartadas pelo filtro prévio ficam fora do total
+        e são contadas à parte.
         """
-        sql = """
-            SELECT COUNT(i.id) AS total_images,
-                   SUM(CASE WHEN r.anomala = TRUE THEN 1 ELSE 0 END) AS anomalous_images,
+        if threshold is not None:
+            contagem_anomalas = "SUM(CASE WHEN i.erro IS NOT NULL THEN i.erro > %s ELSE i.anomala = TRUE END)"
+            parametros = (threshold, fazenda_id)
+        else:
+            contagem_anomalas = "SUM(CASE WHEN i.anomala = TRUE THEN 1 ELSE 0 END)"
+            parametros = (fazenda_id,)
+        sql = f"""
+            SELECT COUNT(CASE WHEN i.descarte IS NULL THEN i.id END) AS total_images,
+                   {contagem_anomalas} AS anomalous_images,
+                   COUNT(i.descarte) AS discarded_images,
                    -- MAX(i.data_registro) AS last_inspection -- Removido, pois data_registro não existe no schema atual
                    NULL AS last_inspection -- Placeholder para indicar que a data não está disponível
             FROM imagens i
-            JOIN resultados r ON i.id = r.id
             WHERE i.fazenda_id = %s
         """
-        self.cursor.execute(sql, (fazenda_id,))
-        return self.cursor.fetchone()
+        with self._pool.conexao() as conn, conn.cursor(dictionary=True) as cursor:
+            cursor.execute(sql, parametros)
+            return cursor.fetchone()
 
     # Métodos para weeklyAnalysis e monthlyTrend não serão implementados aqui
     # devido à ausência da coluna `data_registro` na tabela `imagens`.
 
     def fechar(self):
         """
-        Encerra a conexão com o banco de dados.
-        """
-        if self.conn.is_connected():
-            self.cursor.close()
-            self.conn.close()
-            print("[INFO] Conexão com o banco de dados encerrada (RelatorioDAO).")
\ No newline at end of file
+        Mantido por compatibilidade: as conexões já voltam ao pool ao fim de cada método.
+        """
\ No newline at end of file
@@ -0,0 +1,31 @@
+# MVC/model/saude_dao.py
+
+import mysql.connector
+from MVC.model.conexao import obterPool
+
+class SaudeDAO:
+    def __init__(self, password: str = 'senha123'):
+        self._pool = obterPool(password=password)
+        self._db_config = {
+            'host': 'localhost', 'user': 'agrineural',
+            'password': password, 'database': 'agrineural',
+            'connection_timeout': 2  # o health check não pode ficar preso esperando o banco
+        }
+
+    def verificar(self):
+        """
+        Abre uma conexão própria, fora do pool, e executa um SELECT 1. Lança a exceção do conector
+        se o banco não responder em 2s. Fora do pool, a verificação não disputa vaga com as
+        requisições e o timeout vale para conectar e para a consulta (o do pool só limita a
+        espera por uma conexão livre).
+        """
+        conn = mysql.connector.connect(**self._db_config)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+        finally:
+            conn.close()
+
+    def metricas(self):
+        return self._pool.metricas()
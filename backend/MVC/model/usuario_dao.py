@@ -1,5 +1,7 @@
 # Importa o conector do MySQL para Python
 import mysql.connector
+# Pool de conexões compartilhado pelos DAOs do processo
+from MVC.model.conexao import obterPool
 # Importa a fábrica que instancia o tipo certo de usuário (Produtor, Operador ou Mosaiqueiro)
 from MVC.model.usuario_factory import UsuarioFactory
 
@@ -7,21 +9,9 @@ from MVC.model.usuario_factory import UsuarioFactory
 class UsuarioDAO:
     def __init__(self, host='localhost', user='agrineural', password='senha123', database='agrineural'):
         """
-        Construtor: Estabelece conexão com o banco MySQL ao instanciar a classe.
+        Construtor: não abre conexão; cada método empresta uma do pool do processo e a devolve ao terminar.
         """
-        try:
-            self.conn = mysql.connector.connect(
-                host=host,
-                user=user,
-                password=password,
-                database=database
-            )
-            self.cursor = self.conn.cursor()  # Cria um cursor para executar comandos SQL
-            print("[INFO] Conexão com o banco de dados estabelecida com sucesso.")
-        except mysql.connector.Error as err:
-            # Se ocorrer erro ao conectar, exibe o erro e encerra o programa
-            print(f"[ERRO] Falha na conexão com o banco de dados: {err}")
-            exit(1)
+        self._pool = obterPool(host=host, user=user, password=password, database=database)
 
 
     def buscar_por_cpf(self, cpf):
@@ -31,8 +21,9 @@ class UsuarioDAO:
         """
         try:
             sql = "SELECT cpf, senha, tipo, nome FROM usuarios WHERE cpf = %s"
-            self.cursor.execute(sql, (cpf,))
-            row = self.cursor.fetchone()
+            with self._pool.conexao() as conn, conn.cursor() as cursor:
+                cursor.execute(sql, (cpf,))
+                row = cursor.fetchone()
 
             if row:
                 cpf, senha, tipo, nome = row
@@ -50,8 +41,9 @@ class UsuarioDAO:
         """
         try:
             sql = "INSERT INTO usuarios (cpf, senha, tipo, nome) VALUES (%s, %s, %s, %s)"
-            self.cursor.execute(sql, (cpf, senha, tipo, nome))
-            self.conn.commit()  # Confirma a inserção no banco
+            with self._pool.conexao() as conn, conn.cursor() as cursor:
+                cursor.execute(sql, (cpf, senha, tipo, nome))
+                conn.commit()  # Confirma a inserção no banco
             print("[INFO] Usuário cadastrado com sucesso.")
         except mysql.connector.IntegrityError:
             print("[ERRO] Já existe um usuário com esse CPF.")
@@ -66,8 +58,9 @@ class UsuarioDAO:
         """
         try:
             sql = "SELECT cpf, senha, tipo, nome FROM usuarios WHERE cpf = %s AND senha = %s"
-            self.cursor.execute(sql, (cpf, senha))
-            row = self.cursor.fetchone()
+            with self._pool.conexao() as conn, conn.cursor() as cursor:
+                cursor.execute(sql, (cpf, senha))
+                row = cursor.fetchone()
 
             if row:
                 cpf, senha, tipo, nome = row
@@ -79,9 +72,5 @@ class UsuarioDAO:
 
     def fechar(self):
         """
-        Encerra a conexão com o banco de dados.
-        Deve ser chamada quando o DAO não for mais necessário.
+        Mantido por compatibilidade: as conexões já voltam ao pool ao fim de cada método.
         """
-        self.cursor.close()
-        self.conn.close()
-        print("[INFO] Conexão com o banco de dados encerrada.")
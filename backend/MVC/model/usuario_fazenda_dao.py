@@ -1,5 +1,5 @@
-import mysql.connector
 from mysql.connector import IntegrityError
+from MVC.model.conexao import obterPool
 
 class UsuarioFazendaDAO:
     def __init__(self,
@@ -7,13 +7,7 @@ class UsuarioFazendaDAO:
                  user='agrineural',
                  password='senha123',
                  database='agrineural'):
-        self.conn = mysql.connector.connect(
-            host=host,
-            user=user,
-            password=password,
-            database=database
-        )
-        self.cursor = self.conn.cursor(dictionary=True)
+        self._pool = obterPool(host=host, user=user, password=password, database=database)
 
     def buscar_fazendas_por_ccir(self, ccir: str) -> list:
         """
@@ -29,8 +23,9 @@ class UsuarioFazendaDAO:
               FROM fazendas
              WHERE ccir = %s
         """
-        self.cursor.execute(sql, (ccir,))
-        return self.cursor.fetchall()
+        with self._pool.conexao() as conn, conn.cursor(dictionary=True) as cursor:
+            cursor.execute(sql, (ccir,))
+            return cursor.fetchall()
 
     def associar_fazenda(self, cpf_usuario: str, fazenda_id: int):
         """
@@ -41,11 +36,12 @@ class UsuarioFazendaDAO:
             INSERT INTO usuarios_fazendas (cpf_usuario, fazenda_id)
             VALUES (%s, %s)
         """
-        try:
-            self.cursor.execute(sql, (cpf_usuario, fazenda_id))
-            self.conn.commit()
-        except IntegrityError:
-            raise
+        with self._pool.conexao() as conn, conn.cursor() as cursor:
+            try:
+                cursor.execute(sql, (cpf_usuario, fazenda_id))
+                conn.commit()
+            except IntegrityError:
+                raise
 
     def buscar_fazendas_do_usuario(self, cpf_usuario: str) -> list:
         sql = """
@@ -54,5 +50,6 @@ class UsuarioFazendaDAO:
             JOIN usuarios_fazendas uf ON uf.fazenda_id = f.id
             WHERE uf.cpf_usuario = %s
         """
-        self.cursor.execute(sql, (cpf_usuario,))
-        return self.cursor.fetchall()
+        with self._pool.conexao() as conn, conn.cursor(dictionary=True) as cursor:
+            cursor.execute(sql, (cpf_usuario,))
+            return cursor.fetchall()
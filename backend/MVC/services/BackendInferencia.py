@@ -0,0 +1,237 @@
+import argparse
+import glob
+import os
+
+import cv2
+import numpy as np
+from MVC import config
+from MVC.services.DecodificacaoService import lerImagem
+
+# backends que executam o autoencoder; o TensorFlow só é importado pelo backend escolhido
+# exportação (a partir de backend/): python -m MVC.services.BackendInferencia exportar
+
+
+QUANTIZACOES = ('float16', 'int8')
+
+
+def caminhoTFLite(caminhoModelo, quantizacao=None):
+    sufixo = f".{quantizacao}.tflite" if quantizacao else '.tflite'
+    return os.path.splitext(caminhoModelo)[0] + sufixo
+
+
+_threadsConfiguradas = False
+
+
+def configurarThreadsTF(tf):
+    """
+    Aplica THREADS_INTRA/THREADS_INTER aos pools de threads do TensorFlow. Só tem efeito antes
+    da primeira operação do processo; depois disso o TensorFlow recusa a troca e o padrão continua.
+    """
+    global _threadsConfiguradas
+    if _threadsConfiguradas:
+        return
+    _threadsConfiguradas = True
+    try:
+        if config.THREADS_INTRA:
+            tf.config.threading.set_intra_op_parallelism_threads(config.THREADS_INTRA)
+        if config.THREADS_INTER:
+            tf.config.threading.set_inter_op_parallelism_threads(config.THREADS_INTER)
+    except RuntimeError as e:
+        print(f"[ERRO] Não foi possível configurar as threads do TensorFlow (runtime já iniciado): {e}")
+
+
+class BackendKeras:
+    nome = 'keras'
+
+    def __init__(self, caminhoModelo):
+        import tensorflow as tf
+        from tensorflow.keras.models import load_model
+        configurarThreadsTF(tf)
+        self.modelo = load_model(caminhoModelo, compile=False)
+
+        # Uma função concreta por tamanho de lote, rastreada uma única vez aqui: cada chamada
+        # depois disso executa o grafo direto, sem o data adapter do predict
+        self._funcoes = {}
+        self._tensor = tf.convert_to_tensor
+        if config.INFERENCIA_COMPILADA:
+            @tf.function
+            def reconstruir(entrada):
+                return self.modelo(entrada, training=False)
+
+            for tamanho in config.TAMANHOS_COMPILADOS:
+                assinatura = tf.TensorSpec((tamanho, *self.modelo.input_shape[1:]), tf.float32)
+                self._funcoes[tamanho] = reconstruir.get_concrete_function(assinatura)
+
+    def _proximaParte(self, restantes):
+        """
+        Tamanho compilado usado para as próximas `restantes` imagens: completa com zeros até
+        o menor tamanho que as comporta se isso desperdiçar menos da metade do lote; senão,
+        usa o maior tamanho que cabe nelas (ex.: 31 -> 32, mas 9 -> 8 + 1).
+        """
+        maior = config.TAMANHOS_COMPILADOS[-1]
+        if restantes >= maior:
+            return maior
+        acima = next(t for t in config.TAMANHOS_COMPILADOS if t >= restantes)
+        menores = [t for t in config.TAMANHOS_COMPILADOS if t <= restantes]
+        if restantes * 2 > acima or not menores:
+            return acima
+        return menores[-1]
+
+    def prever(self, lote):
+        if not self._funcoes:
+            return self.modelo.predict(lote, batch_size=len(lote), verbose=0)
+
+        lote = np.asarray(lote, dtype="float32")
+        saidas = []
+        inicio = 0
+        while inicio < len(lote):
+            tamanho = self._proximaParte(len(lote) - inicio)
+            parte = lote[inicio:inicio + tamanho]
+            quantidade = len(parte)
+            if quantidade < tamanho:
+                parte = np.concatenate([parte, np.zeros((tamanho - quantidade, *parte.shape[1:]), dtype="float32")])
+            saidas.append(self._funcoes[tamanho](self._tensor(parte)).numpy()[:quantidade])
+            inicio += quantidade
+        return np.concatenate(saidas)
+
+
+class BackendTFLite:
+    nome = 'tflite'
+    quantizacao = None
+
+    def __init__(self, caminhoModelo):
+        caminho = caminhoTFLite(caminhoModelo, self.quantizacao)
+        if not os.path.exists(caminho):
+            opcao = f" --quantizacao {self.quantizacao}" if self.quantizacao else ''
+            raise FileNotFoundError(
+                f"{caminho} não existe; gere com: python -m MVC.services.BackendInferencia exportar{opcao}"
+            )
+        try:
+            from tflite_runtime.interpreter import Interpreter  # runtime leve, sem o TensorFlow completo
+        except ImportError:
+            from tensorflow.lite import Interpreter
+
+        # Com model_path o TFLite mapeia o arquivo (mmap) em vez de copiá-lo: os pesos ficam no
+        # cache de páginas do sistema, uma única vez para todos os processos que usam o modelo
+        self.interpretador = Interpreter(model_path=caminho, num_threads=config.THREADS_INTRA or None)
+        self._entrada = self.interpretador.get_input_details()[0]['index']
+        self._saida = self.interpretador.get_output_details()[0]['index']
+        self._formato = None
+
+    def prever(self, lote):
+        lote = np.ascontiguousarray(lote, dtype="float32")
+        # O interpretador tem formato fixo: realoca só quando o tamanho do lote muda
+        if lote.shape != self._formato:
+            self.interpretador.resize_tensor_input(self._entrada, lote.shape)
+            self.interpretador.allocate_tensors()
+            self._formato = lote.shape
+        self.interpretador.set_tensor(self._entrada, lote)
+        self.interpretador.invoke()
+        return self.interpretador.get_tensor(self._saida)
+
+
+class BackendTFLiteFloat16(BackendTFLite):
+    nome = 'tflite-float16'
+    quantizacao = 'float16'
+
+
+class BackendTFLiteInt8(BackendTFLite):
+    nome = 'tflite-int8'
+    quantizacao = 'int8'
+
+
+BACKENDS = {
+    BackendKeras.nome: BackendKeras,
+    BackendTFLite.nome: BackendTFLite,
+    BackendTFLiteFloat16.nome: BackendTFLiteFloat16,
+    BackendTFLiteInt8.nome: BackendTFLiteInt8,
+}
+
+
+def importarRuntime(nome):
+    """
+    Só importa o runtime do backend, sem carregar modelo nem executar operações. Usado no
+    mestre do modo pre-fork para que as bibliotecas fiquem em páginas compartilhadas pelos workers.
+    """
+    if nome == BackendKeras.nome:
+        import tensorflow  # noqa: F401
+        return
+    try:
+        import tflite_runtime.interpreter  # noqa: F401
+    except ImportError:
+        import tensorflow  # noqa: F401
+
+
+def criarBackend(nome, caminhoModelo):
+    if nome not in BACKENDS:
+        raise ValueError(f"Backend de inferência desconhecido: {nome} (opções: {', '.join(BACKENDS)})")
+    return BACKENDS[nome](caminhoModelo)
+
+
+def _amostrasCalibracao(pasta, quantidade=100):
+    """
+    Gera entradas reais (pré-processadas como na análise) para calibrar a quantização int8.
+    """
+    caminhos = sorted(
+        p for p in glob.glob(os.path.join(pasta, '**', '*'), recursive=True)
+        if p.lower().endswith(('.jpg', '.jpeg', '.png', '.webp'))
+    )[:quantidade]
+    if not caminhos:
+        raise ValueError(f"Nenhuma imagem encontrada em {pasta} para calibrar a quantização")
+    for caminho in caminhos:
+        img = lerImagem(caminho)
+        if img is None:
+            continue
+        img = cv2.cvtColor(cv2.resize(img, (256, 256)), cv2.COLOR_BGR2RGB)
+        yield [np.expand_dims(img.astype("float32") / 255.0, axis=0)]
+
+
+def exportarTFLite(caminhoModelo=config.CAMINHO_MODELO, destino=None, quantizacao=None, pastaCalibracao=None):
+    """
+    Converte o checkpoint Keras (.h5) para TFLite, gravando ao lado do .h5 por padrão.
+    quantizacao='float16' guarda os pesos em float16; quantizacao='int8' quantiza pesos e
+    ativações em int8 usando imagens de `pastaCalibracao` (entrada e saída continuam float32).
+    """
+    import tensorflow as tf
+    from tensorflow.keras.models import load_model
+
+    if quantizacao not in (None, *QUANTIZACOES):
+        raise ValueError(f"Quantização desconhecida: {quantizacao}")
+
+    modelo = load_model(caminhoModelo, compile=False)
+
+    # from_keras_model falha com o Keras 3 (Conv2D vira um op que o conversor não reconhece):
+    # converte uma função concreta de lote 1; o backend TFLite redimensiona a entrada para cada lote
+    @tf.function(input_signature=[tf.TensorSpec((1, *modelo.input_shape[1:]), tf.float32)])
+    def reconstruir(entrada):
+        return modelo(entrada, training=False)
+
+    conversor = tf.lite.TFLiteConverter.from_concrete_functions([reconstruir.get_concrete_function()], modelo)
+    if quantizacao == 'float16':
+        conversor.optimizations = [tf.lite.Optimize.DEFAULT]
+        conversor.target_spec.supported_types = [tf.float16]
+    elif quantizacao == 'int8':
+        if not pastaCalibracao:
+            raise ValueError("A quantização int8 precisa de uma pasta de imagens para calibração")
+        conversor.optimizations = [tf.lite.Optimize.DEFAULT]
+        conversor.representative_dataset = lambda: _amostrasCalibracao(pastaCalibracao)
+
+    destino = destino or caminhoTFLite(caminhoModelo, quantizacao)
+    with open(destino, 'wb') as f:
+        f.write(conversor.convert())
+    print(f"[INFO] Modelo exportado para {destino}.")
+    return destino
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Ferramentas dos backends de inferência')
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+    exportar = subcomandos.add_parser('exportar', help='gera o modelo TFLite a partir do checkpoint .h5')
+    exportar.add_argument('--modelo', default=config.CAMINHO_MODELO)
+    exportar.add_argument('--destino', default=None)
+    exportar.add_argument('--quantizacao', choices=QUANTIZACOES, default=None)
+    exportar.add_argument('--calibracao', default=None, help='pasta de imagens usada na quantização int8')
+    args = parser.parse_args()
+
+    if args.comando == 'exportar':
+        exportarTFLite(args.modelo, args.destino, args.quantizacao, args.calibracao)
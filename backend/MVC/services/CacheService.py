@@ -0,0 +1,90 @@
+import hashlib
+import threading
+
+from MVC import config
+
+# cache de resultados por conteúdo: reenvios do mesmo arquivo não passam pelo modelo
+
+_lock = threading.Lock()
+contadores = {'acertos': 0, 'faltas': 0}  # deste processo, desde que subiu
+
+
+def hashConteudo(dados):
+    """
+    SHA-256 dos bytes da imagem (bytes ou memoryview, sem cópia).
+    """
+    return hashlib.sha256(dados).hexdigest()
+
+
+def hashArquivo(caminho, bloco=1024 * 1024):
+    h = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for parte in iter(lambda: f.read(bloco), b''):
+            h.update(parte)
+    return h.hexdigest()
+
+
+def versaoCache(modelo, ladrilhado=config.ANALISE_LADRILHADA, reduzida=config.DECODIFICACAO_REDUZIDA):
+    """
+    Chave de versão das entradas: o erro muda com o modelo, com o modo de análise e, fora dos
+    ladrilhos (que sempre leem a imagem inteira), com a decodificação reduzida.
+    """
+    if ladrilhado:
+        return modelo.versao + '+ladrilhos'
+    return modelo.versao + ('+reduzida' if reduzida else '')
+
+
+def versaoBase(versao):
+    """
+    Versão do modelo numa chave do cache, sem o backend (@tflite...) e o modo de análise.
+    """
+    return versao.split('+', 1)[0].split('@', 1)[0]
+
+
+def versoesValidas(modelo, registradas=()):
+    """
+    Versões cujas entradas ainda podem ser usadas: a do modelo atual e as publicadas no manifesto,
+    que podem voltar a ser ativadas ou estar em uso por workers com outro backend.
+    """
+    return sorted({versaoBase(modelo.versao), *registradas})
+
+
+def buscar(cache_dao, hashes, versao):
+    """
+    Consulta os hashes no cache e atualiza os contadores de acertos/faltas.
+    """
+    hashes = set(hashes)
+    encontrados = cache_dao.buscar(hashes, versao)
+    with _lock:
+        contadores['acertos'] += len(encontrados)
+        contadores['faltas'] += len(hashes) - len(encontrados)
+    return encontrados
+
+
+def analiseDoCache(modelo, entrada):
+    """
+    Monta, a partir de uma entrada do cache, a mesma análise devolvida pelo modelo.
+    O rótulo não é guardado: é recalculado com o threshold em uso.
+    """
+    analise = {'erro': entrada['erro'], 'resultado': modelo.classificar(entrada['erro']), 'cache': True}
+    if entrada['regioes'] is not None:
+        analise['regioes'] = entrada['regioes']
+    if entrada['mapa_erro']:
+        analise['caminhoMapa'] = entrada['mapa_erro']
+    return analise
+
+
+def entradaCache(analise, caminho_arquivo):
+    """
+    Entrada a gravar no cache para uma análise feita pelo modelo.
+    """
+    return {
+        'erro': analise['erro'], 'regioes': analise.get('regioes'),
+        'mapa_erro': caminho_arquivo + '.mapa.png' if 'mapa' in analise else None
+    }
+
+
+def estatisticas():
+    with _lock:
+        total = contadores['acertos'] + contadores['faltas']
+        return {**contadores, 'taxaAcerto': contadores['acertos'] / total if total else 0.0}
@@ -0,0 +1,136 @@
+import io
+import struct
+
+import cv2
+import numpy as np
+from MVC import config
+
+# leitura das imagens já na menor resolução útil para o modelo
+
+# Fator de redução -> flag do OpenCV. Para JPEG a redução acontece dentro do libjpeg
+# (escala no domínio DCT), sem decodificar a imagem inteira
+FLAGS_REDUCAO = {
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+}
+
+# Marcadores SOF do JPEG (C4, C8 e CC são outros segmentos)
+_MARCADORES_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def _dimensoesJpeg(f):
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b'\xff':
+            byte = f.read(1)
+        while byte == b'\xff':  # bytes de preenchimento
+            byte = f.read(1)
+        if not byte:
+            return None
+        marcador = byte[0]
+        if marcador in _MARCADORES_SOF:
+            f.read(3)  # tamanho do segmento + precisão
+            altura, largura = struct.unpack('>HH', f.read(4))
+            return largura, altura
+        if marcador in (0xD8, 0x01) or 0xD0 <= marcador <= 0xD7:  # marcadores sem segmento
+            continue
+        tamanho = f.read(2)
+        if len(tamanho) < 2:
+            return None
+        f.seek(struct.unpack('>H', tamanho)[0] - 2, 1)
+
+
+def _dimensoesWebp(cabecalho):
+    tipo = cabecalho[12:16]
+    if tipo == b'VP8 ':    # com perdas
+        largura, altura = struct.unpack('<HH', cabecalho[26:30])
+        return largura & 0x3FFF, altura & 0x3FFF
+    if tipo == b'VP8L':    # sem perdas
+        bits = struct.unpack('<I', cabecalho[21:25])[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if tipo == b'VP8X':    # estendido
+        largura = int.from_bytes(cabecalho[24:27], 'little') + 1
+        altura = int.from_bytes(cabecalho[27:30], 'little') + 1
+        return largura, altura
+    return None
+
+
+def _dimensoes(f):
+    cabecalho = f.read(32)
+    if cabecalho[:2] == b'\xff\xd8':
+        return _dimensoesJpeg(f)
+    if cabecalho[:8] == b'\x89PNG\r\n\x1a\n':
+        return struct.unpack('>II', cabecalho[16:24])
+    if cabecalho[:4] == b'RIFF' and cabecalho[8:12] == b'WEBP':
+        return _dimensoesWebp(cabecalho)
+    return None
+
+
+def dimensoesImagem(caminho):
+    """
+    Lê (largura, altura) do cabeçalho de arquivos JPEG, PNG ou WebP sem decodificar os pixels.
+    Retorna None para formatos desconhecidos ou cabeçalhos inválidos.
+    """
+    try:
+        with open(caminho, 'rb') as f:
+            return _dimensoes(f)
+    except (OSError, struct.error):
+        return None
+
+
+def dimensoesBytes(dados):
+    """
+    Mesmo que dimensoesImagem, para uma imagem que está em memória (bytes ou memoryview).
+    Só o começo do buffer é copiado, o bastante para passar pelos segmentos EXIF do JPEG.
+    """
+    try:
+        return _dimensoes(io.BytesIO(memoryview(dados)[:256 * 1024]))
+    except struct.error:
+        return None
+
+
+def fatorReducao(largura, altura, alvo=256):
+    """
+    Maior fator (8, 4 ou 2) que ainda deixa os dois lados com pelo menos `alvo` pixels,
+    para que o resize final para 256x256 nunca precise ampliar a imagem.
+    """
+    for fator in FLAGS_REDUCAO:
+        if min(largura, altura) // fator >= alvo:
+            return fator
+    return 1
+
+
+def lerImagem(caminho, alvo=256):
+    """
+    Lê a imagem em BGR usando a decodificação reduzida mais barata para o tamanho de origem.
+    Para WebP e PNG o OpenCV decodifica inteiro e reduz em seguida, o que ainda poupa o
+    resize de uma imagem grande; o ganho de decodificação em si é só no JPEG.
+    """
+    if config.DECODIFICACAO_REDUZIDA:
+        dimensoes = dimensoesImagem(caminho)
+        if dimensoes:
+            fator = fatorReducao(*dimensoes, alvo=alvo)
+            if fator > 1:
+                img = cv2.imread(caminho, FLAGS_REDUCAO[fator])
+                if img is not None:
+                    return img
+    return cv2.imread(caminho)
+
+
+def decodificarBytes(dados, alvo=256):
+    """
+    Decodifica uma imagem em memória (bytes ou memoryview) para BGR, com a mesma escolha
+    de redução de lerImagem. O buffer é lido direto, sem cópia para um arquivo ou array novo.
+    """
+    buffer = np.frombuffer(dados, dtype=np.uint8)
+    if config.DECODIFICACAO_REDUZIDA:
+        dimensoes = dimensoesBytes(dados)
+        if dimensoes:
+            fator = fatorReducao(*dimensoes, alvo=alvo)
+            if fator > 1:
+                img = cv2.imdecode(buffer, FLAGS_REDUCAO[fator])
+                if img is not None:
+                    return img
+    return cv2.imdecode(buffer, cv2.IMREAD_COLOR)
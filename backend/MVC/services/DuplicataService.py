@@ -0,0 +1,195 @@
+import itertools
+import math
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+from MVC import config
+from MVC.services.DecodificacaoService import dimensoesBytes, dimensoesImagem, fatorReducao
+
+# detecção de frames quase iguais (sobreposição entre fotos consecutivas do drone)
+
+_FLAGS_CINZA = {8: cv2.IMREAD_REDUCED_GRAYSCALE_8, 4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+                2: cv2.IMREAD_REDUCED_GRAYSCALE_2, 1: cv2.IMREAD_GRAYSCALE}
+
+
+def dhash(img, tamanho=8):
+    """
+    Hash de diferença (dHash) de 64 bits: cada bit diz se um pixel da imagem reduzida para
+    9x8 em tons de cinza é mais claro que o vizinho da direita. Frames parecidos diferem em
+    poucos bits, mesmo com pequenas mudanças de brilho ou enquadramento.
+    """
+    if img.ndim == 3:
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    reduzida = cv2.resize(img, (tamanho + 1, tamanho), interpolation=cv2.INTER_AREA)
+    bits = (reduzida[:, 1:] > reduzida[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def dhashArquivo(caminho):
+    """
+    dHash lido com a menor decodificação possível (o hash só usa 9x8 pixels).
+    Retorna None se o arquivo não puder ser lido.
+    """
+    dimensoes = dimensoesImagem(caminho)
+    fator = fatorReducao(*dimensoes, alvo=64) if dimensoes else 1
+    img = cv2.imread(caminho, _FLAGS_CINZA[fator])
+    return dhash(img) if img is not None else None
+
+
+def dhashBytes(dados):
+    """
+    Mesmo que dhashArquivo, para uma imagem em memória (bytes ou memoryview).
+    """
+    dimensoes = dimensoesBytes(dados)
+    fator = fatorReducao(*dimensoes, alvo=64) if dimensoes else 1
+    img = cv2.imdecode(np.frombuffer(dados, dtype=np.uint8), _FLAGS_CINZA[fator])
+    return dhash(img) if img is not None else None
+
+
+def distanciaHamming(a, b):
+    return (a ^ b).bit_count()
+
+
+def distanciaMetros(lat1, lng1, lat2, lng2):
+    # Aproximação equirretangular: suficiente para as poucas dezenas de metros que interessam aqui
+    x = math.radians(lng2 - lng1) * math.cos(math.radians((lat1 + lat2) / 2))
+    y = math.radians(lat2 - lat1)
+    return 6371000 * math.hypot(x, y)
+
+
+class IndiceMultiplo:
+    """
+    Busca por hashes a até `raio` bits de distância com multi-index hashing: o hash de 64 bits
+    é dividido em `partes` pedaços e cada pedaço indexa uma tabela. Se dois hashes diferem
+    em até `raio` bits, algum pedaço difere em no máximo raio // partes bits (casa dos pombos),
+    então basta consultar, em cada tabela, o pedaço e as suas variações com até esse número
+    de bits trocados, e conferir a distância só desses candidatos.
+    """
+
+    def __init__(self, raio, partes=4):
+        self.raio = raio
+        self.bits = 64 // partes
+        self._mascara = (1 << self.bits) - 1
+        subraio = raio // partes
+        self._variacoes = [0] + [
+            sum(1 << b for b in combinacao)
+            for n in range(1, subraio + 1) for combinacao in itertools.combinations(range(self.bits), n)
+        ]
+        self._tabelas = [{} for _ in range(partes)]
+        self.tamanho = 0
+
+    def _pedacos(self, hash_):
+        return [(hash_ >> (i * self.bits)) & self._mascara for i in range(len(self._tabelas))]
+
+    def inserir(self, hash_, valor):
+        entrada = (hash_, valor)
+        for tabela, pedaco in zip(self._tabelas, self._pedacos(hash_)):
+            tabela.setdefault(pedaco, []).append(entrada)
+        self.tamanho += 1
+
+    def buscar(self, hash_):
+        """
+        Retorna [(distancia, valor)] de tudo que está a até `raio` bits de `hash_`, do mais próximo ao mais distante.
+        """
+        vistos = set()
+        encontrados = []
+        for tabela, pedaco in zip(self._tabelas, self._pedacos(hash_)):
+            for variacao in self._variacoes:
+                for entrada in tabela.get(pedaco ^ variacao, ()):
+                    if id(entrada) in vistos:
+                        continue
+                    vistos.add(id(entrada))
+                    d = distanciaHamming(hash_, entrada[0])
+                    if d <= self.raio:
+                        encontrados.append((d, entrada[1]))
+        encontrados.sort(key=lambda e: e[0])
+        return encontrados
+
+
+class IndiceDuplicatas:
+    """
+    Um IndiceMultiplo por fazenda, carregado do banco na primeira consulta e atualizada
+    incrementalmente (só as imagens novas) a cada `atualizar`, para enxergar também
+    o que outros workers gravaram.
+    Guarda no máximo `fazendas` índices, descartando o da fazenda usada há mais tempo, que é
+    recarregado do banco se voltar a ser consultada. Cada imagem indexada ocupa cerca de 1 KB
+    (a linha lida do banco e as entradas nas tabelas), então a memória fica em torno de
+    `fazendas` x imagens por fazenda x 1 KB.
+    """
+
+    def __init__(self, imagem_dao, raio=config.DISTANCIA_DUPLICATA, metros=config.METROS_DUPLICATA,
+                 fazendas=config.FAZENDAS_INDICE_DUPLICATAS):
+        self.imagem_dao = imagem_dao
+        self.raio = raio
+        self.metros = metros
+        self.fazendas = fazendas
+        self._indices = OrderedDict()  # fazenda_id -> IndiceMultiplo, da usada há mais tempo à mais recente
+        self._indexados = {}  # fazenda_id -> ids já indexados
+        self._ultimo_id = {}  # fazenda_id -> maior imagens.id lido do banco
+        self._lock = threading.Lock()
+
+    def atualizar(self, fazenda_id):
+        with self._lock:
+            ultimo_id = self._ultimo_id.get(fazenda_id, 0)
+        linhas = self.imagem_dao.buscar_dhashes(fazenda_id, ultimo_id)
+        with self._lock:
+            if fazenda_id not in self._indices:
+                if ultimo_id:
+                    return  # descartado durante a consulta: só as linhas novas deixariam um índice incompleto
+                self._indices[fazenda_id] = IndiceMultiplo(self.raio)
+                self._descartarAntigos()
+            self._indices.move_to_end(fazenda_id)
+            for linha in linhas:
+                self._inserir(fazenda_id, linha)
+                self._ultimo_id[fazenda_id] = max(self._ultimo_id.get(fazenda_id, 0), linha['id'])
+
+    def _descartarAntigos(self):
+        while len(self._indices) > self.fazendas:
+            fazenda_id, _ = self._indices.popitem(last=False)
+            self._indexados.pop(fazenda_id, None)
+            self._ultimo_id.pop(fazenda_id, None)
+
+    def adicionar(self, fazenda_id, imagem):
+        with self._lock:
+            if fazenda_id in self._indices:  # fazendas ainda não carregadas entram na primeira atualização
+                self._inserir(fazenda_id, imagem)
+
+    def _inserir(self, fazenda_id, imagem):
+        # Imagens gravadas por este worker já entraram pelo `adicionar`
+        indexados = self._indexados.setdefault(fazenda_id, set())
+        if imagem['id'] not in indexados:
+            indexados.add(imagem['id'])
+            self._indices[fazenda_id].inserir(imagem['dhash'], imagem)
+
+    def buscarOriginal(self, fazenda_id, hash_, latitude, longitude):
+        """
+        Imagem já indexada da fazenda com hash a até `raio` bits e a até `metros` de distância,
+        ou None. Se ela própria for duplicata, o campo 'duplicata_de' aponta para a original.
+        """
+        with self._lock:
+            indice = self._indices.get(fazenda_id)
+            if indice:
+                self._indices.move_to_end(fazenda_id)
+            candidatos = indice.buscar(hash_) if indice else []
+        return self._primeiraPerto(candidatos, latitude, longitude)
+
+    def buscarEntre(self, registros, fazenda_id, hash_, latitude, longitude):
+        """
+        Mesma busca de buscarOriginal entre imagens que ainda não estão no índice (registros do
+        EscritorLote à espera de gravação), comparando com cada uma.
+        """
+        candidatos = sorted(
+            ((distanciaHamming(hash_, r['dhash']), r) for r in registros
+             if r['fazenda_id'] == fazenda_id and r.get('dhash') is not None),
+            key=lambda c: c[0]
+        )
+        return self._primeiraPerto([c for c in candidatos if c[0] <= self.raio], latitude, longitude)
+
+    def _primeiraPerto(self, candidatos, latitude, longitude):
+        # candidatos: [(distancia, imagem)] do hash mais próximo ao mais distante
+        for _, imagem in candidatos:
+            if distanciaMetros(latitude, longitude, imagem['latitude'], imagem['longitude']) <= self.metros:
+                return imagem
+        return None
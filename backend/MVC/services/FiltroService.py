@@ -0,0 +1,77 @@
+import threading
+
+import cv2
+import numpy as np
+from MVC import config
+
+# filtro prévio: descarta frames claramente inúteis (céu, borrão, solo exposto, exposição
+# estourada) com verificações baratas, antes do forward pass do autoencoder.
+# Cada etapa recebe a imagem BGR uint8 já reduzida para 256x256.
+
+EXG_VERDE = 0.1  # ExG acima do qual o pixel conta como vegetação
+
+
+def exposicao(img, cinza):
+    # Frações de pixels quase pretos e quase brancos, pelo histograma. As imagens do modelo
+    # são plantas recortadas sobre fundo branco, por isso só um frame praticamente todo
+    # estourado conta como superexposto
+    histograma = cv2.calcHist([cinza], [0], None, [256], [0, 256]).ravel() / cinza.size
+    if histograma[:16].sum() > config.LIMITE_SUBEXPOSICAO:
+        return "Subexposta"
+    if histograma[240:].sum() > config.LIMITE_SUPEREXPOSICAO:
+        return "Superexposta"
+    return None
+
+
+def vegetacao(img, cinza):
+    # Excesso de verde (ExG = 2g - r - b sobre as cores normalizadas): alto em folhas,
+    # baixo em céu, solo e asfalto
+    b, g, r = cv2.split(img.astype(np.float32))
+    soma = b + g + r + 1e-6
+    exg = (2 * g - r - b) / soma
+    verdes = np.count_nonzero(exg > EXG_VERDE) / exg.size
+    return "Sem vegetação" if verdes < config.LIMITE_VEGETACAO else None
+
+
+def desfoque(img, cinza):
+    # Variância do Laplaciano: imagens borradas (movimento ou foco) quase não têm bordas
+    variancia = cv2.Laplacian(cinza, cv2.CV_64F).var()
+    return "Desfocada" if variancia < config.LIMITE_DESFOQUE else None
+
+
+ETAPAS = {'exposicao': exposicao, 'vegetacao': vegetacao, 'desfoque': desfoque}
+
+_lock = threading.Lock()
+contadores = {'analisadas': 0, 'aprovadas': 0, **{etapa: 0 for etapa in ETAPAS}}  # deste processo
+
+
+def filtrar(img, etapas=None):
+    """
+    Passa a imagem pelas etapas na ordem configurada e retorna o motivo do descarte
+    da primeira que a reprovar, ou None se a imagem pode seguir para o modelo.
+    """
+    etapas = config.ETAPAS_FILTRO if etapas is None else etapas
+    if not etapas:
+        return None  # filtro desativado: nem converte para cinza
+    cinza = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    for etapa in etapas:
+        motivo = ETAPAS[etapa](img, cinza)
+        if motivo:
+            _contar(etapa)
+            return motivo
+    _contar('aprovadas')
+    return None
+
+
+def _contar(chave):
+    with _lock:
+        contadores['analisadas'] += 1
+        contadores[chave] += 1
+
+
+def estatisticas():
+    """
+    Quantas imagens cada etapa eliminou neste processo.
+    """
+    with _lock:
+        return dict(contadores)
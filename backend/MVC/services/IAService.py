@@ -1,26 +1,241 @@
+import os
+import threading
+from contextlib import nullcontext
+
 import cv2
 import numpy as np
-from tensorflow.keras.models import load_model
+from MVC import config
+from MVC.services.BackendInferencia import criarBackend
+from MVC.services.MapaAnomaliaService import reduzirMapa, regioesQuentes
+from MVC.services.LadrilhoService import gradeLadrilhos, extrairLadrilhos
+from MVC.services.DecodificacaoService import lerImagem, decodificarBytes
+from MVC.services.FiltroService import filtrar
+from MVC.services.PreprocessamentoService import Preprocessador, prepararEmParalelo
 
 # função para verificar se o mamoeiro é anômalo ou não
 
+TAMANHO_ENTRADA = (256, 256)  # resolução esperada pelo autoencoder
+DESCARTADA = "Descartada"     # rótulo das imagens barradas pelo filtro prévio (sem passar pelo modelo)
+
+# Limita as inferências simultâneas no processo (threads do Flask, aquecimento, troca de versão):
+# cada chamada já usa todos os threads do runtime, e chamadas em paralelo só disputam os mesmos núcleos
+_semaforoInferencia = (threading.BoundedSemaphore(config.INFERENCIAS_SIMULTANEAS)
+                       if config.INFERENCIAS_SIMULTANEAS > 0 else nullcontext())
+
 class ModeloAgrineural:
-    
-    def __init__(self):
-        self.modelo = load_model("MVC/services/model_checkpoint.h5transistor_AE_epoch_48.h5", compile=False)
-        self.threshold = 0.003638065652921796  # Definido como constante
-        
-        
+
+    def __init__(self, caminhoModelo=config.CAMINHO_MODELO, backend=config.BACKEND_INFERENCIA,
+                 versao=None, threshold=None):
+        self.backend = criarBackend(backend, caminhoModelo)
+        # gravada junto de cada resultado (nome da versão no manifesto ou, sem manifesto, o nome
+        # do checkpoint); inclui o backend quando não é o Keras original
+        self.versao = versao or os.path.splitext(os.path.basename(caminhoModelo))[0]
+        if backend != 'keras':
+            self.versao += f"@{backend}"
+        self.threshold = config.THRESHOLD_PADRAO if threshold is None else threshold
+        self._buffers = threading.local()  # um Preprocessador por thread (a instância é compartilhada)
+
     def setTrashold(self, novo_threshold):
         self.threshold = novo_threshold
-    
-    def analisarImagem(self, caminhoArquivo):
-        img = cv2.imread(caminhoArquivo)
-        img = cv2.resize(img, (256, 256))
+
+    def reconstruir(self, lote):
+        with _semaforoInferencia:
+            return self.backend.prever(lote)
+
+    def classificar(self, erro, threshold=None):
+        if threshold is None: threshold = self.threshold
+        return "Anômala" if erro > threshold else "Normal"
+
+    def preprocessar(self, img):
+        """
+        Converte uma imagem BGR (como lida pelo OpenCV) no tensor 256x256 RGB normalizado.
+        """
+        return self.normalizar(cv2.resize(img, TAMANHO_ENTRADA))
+
+    def normalizar(self, img):
         img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        img_norm = img.astype("float32") / 255.0
-        entrada = np.expand_dims(img_norm, axis=0)
+        return img.astype("float32") / 255.0
+
+    def triar(self, img):
+        """
+        Reduz a imagem BGR para a entrada do modelo e passa pelo filtro prévio.
+        Retorna (tensor, None) se ela segue para o modelo ou (None, motivo) se foi descartada.
+        """
+        img = cv2.resize(img, TAMANHO_ENTRADA)
+        motivo = filtrar(img)
+        if motivo:
+            return None, motivo
+        return self.normalizar(img), None
+
+    def preprocessador(self, capacidade):
+        """
+        Preprocessador desta thread com pelo menos `capacidade` posições, já vazio.
+        O buffer só é realocado quando um lote maior que o anterior é pedido.
+        """
+        pre = getattr(self._buffers, 'preprocessador', None)
+        if pre is None or pre.capacidade < capacidade:
+            pre = self._buffers.preprocessador = Preprocessador(capacidade, TAMANHO_ENTRADA)
+        pre.limpar()
+        return pre
+
+    def _analisarUma(self, img, comMapa=False):
+        # filtro prévio + modelo para uma imagem BGR, usando o buffer da thread
+        pre = self.preprocessador(1)
+        img = pre.redimensionar(img)
+        motivo = filtrar(img)
+        if motivo:
+            return {'erro': None, 'resultado': DESCARTADA, 'descarte': motivo}
+        pre.adicionar(img)
+        return self.analisarArrays(pre.preenchido(), comMapa=comMapa)[0]
+
+    def lerArquivo(self, caminhoArquivo):
+        img = lerImagem(caminhoArquivo, alvo=TAMANHO_ENTRADA[0])
+        if img is None:
+            raise ValueError(f"Não foi possível ler a imagem {caminhoArquivo}")
+        return img
+
+    def lerBytes(self, dados):
+        img = decodificarBytes(dados, alvo=TAMANHO_ENTRADA[0])
+        if img is None:
+            raise ValueError("Não foi possível decodificar a imagem enviada")
+        return img
+
+    def carregarImagem(self, caminhoArquivo):
+        return self.preprocessar(self.lerArquivo(caminhoArquivo))
+
+    def carregarBytes(self, dados):
+        return self.preprocessar(self.lerBytes(dados))
+
+    def analisarBytes(self, dados, comMapa=False):
+        """
+        Analisa uma imagem que está em memória (por exemplo, o conteúdo do upload),
+        sem precisar gravá-la e lê-la de volta do disco.
+        """
+        return self._analisarUma(self.lerBytes(dados), comMapa=comMapa)
+
+    def analisarImagem(self, caminhoArquivo):
+        return self._analisarUma(self.lerArquivo(caminhoArquivo))['resultado']
+
+    def analisarArrays(self, lote, tamanhoLote=config.TAMANHO_LOTE, comMapa=False):
+        """
+        Analisa um lote já pré-processado (N, 256, 256, 3) em float32.
+        Faz um único forward pass a cada `tamanhoLote` imagens e retorna,
+        para cada imagem, o erro de reconstrução e o rótulo.
+        Com `comMapa`, aproveita a mesma reconstrução para devolver também o mapa
+        de erro reduzido ('mapa') e as regiões de maior erro ('regioes').
+        """
+        resultados = []
+        for inicio in range(0, len(lote), tamanhoLote):
+            parte = lote[inicio:inicio + tamanhoLote]
+            reconstruidas = self.reconstruir(parte)
+            if not comMapa:
+                erros = np.mean((parte - reconstruidas) ** 2, axis=(1, 2, 3))
+                resultados.extend(
+                    {'erro': float(erro), 'resultado': self.classificar(erro)} for erro in erros
+                )
+                continue
+
+            mapas = np.mean((parte - reconstruidas) ** 2, axis=3)  # erro por pixel (N, 256, 256)
+            for mapa in mapas:
+                erro = mapa.mean()
+                reduzido = reduzirMapa(mapa)
+                resultados.append({
+                    'erro': float(erro), 'resultado': self.classificar(erro),
+                    'mapa': reduzido, 'regioes': regioesQuentes(reduzido)
+                })
+        return resultados
+
+    def analisarLadrilhado(self, img, tamanhoLote=config.TAMANHO_LOTE,
+                           sobreposicao=config.SOBREPOSICAO_LADRILHOS, k=config.REGIOES_QUENTES):
+        """
+        Analisa uma imagem BGR na resolução original, dividida em ladrilhos 256x256 sobrepostos
+        e enviados ao modelo em lotes. O maior erro entre os ladrilhos decide o rótulo, para que
+        lesões pequenas não sejam diluídas; também retorna o erro médio, a grade de erros
+        (linhas x colunas), a fração de ladrilhos anômalos e os `k` ladrilhos de maior erro.
+        """
+        altura, largura = img.shape[:2]
+        janelas, ys, xs = gradeLadrilhos(img, TAMANHO_ENTRADA[0], sobreposicao)
+        linhas, colunas = (m.ravel() for m in np.meshgrid(ys, xs, indexing='ij'))
+
+        erros = np.empty(len(linhas), dtype="float32")
+        for inicio in range(0, len(linhas), tamanhoLote):
+            fim = inicio + tamanhoLote
+            ladrilhos = extrairLadrilhos(janelas, linhas[inicio:fim], colunas[inicio:fim])
+            entrada = ladrilhos[..., ::-1].astype("float32") / 255.0  # BGR -> RGB e normalização
+            reconstruidas = self.reconstruir(entrada)
+            erros[inicio:fim] = np.mean((entrada - reconstruidas) ** 2, axis=(1, 2, 3))
+
+        grade = erros.reshape(len(ys), len(xs))
+        erro = float(grade.max())
+        piores = np.argsort(erros)[::-1][:k]
+        regioes = [{
+            'x': colunas[i] / largura, 'y': linhas[i] / altura,
+            'largura': min(1.0, TAMANHO_ENTRADA[1] / largura), 'altura': min(1.0, TAMANHO_ENTRADA[0] / altura),
+            'erro': float(erros[i])
+        } for i in piores]
+        return {
+            'erro': erro, 'resultado': self.classificar(erro), 'erroMedio': float(grade.mean()),
+            'grade': grade, 'fracaoAnomala': float((grade > self.threshold).mean()), 'regioes': regioes
+        }
+
+    def analisarLote(self, caminhos, tamanhoLote=config.TAMANHO_LOTE, comMapa=False, ladrilhado=False,
+                     threads=config.THREADS_DECODIFICACAO):
+        """
+        Analisa uma lista de arquivos em lotes de `tamanhoLote`, decodificando com `threads` threads.
+        Arquivos que não puderem ser lidos voltam com 'erro' e 'resultado' iguais a None
+        e a mensagem em 'falha', sem interromper o restante do lote. Imagens barradas pelo
+        filtro prévio voltam com o rótulo DESCARTADA e o motivo em 'descarte', sem ir ao modelo.
+        Com `ladrilhado`, cada arquivo é analisado na resolução original (ver analisarLadrilhado).
+        """
+        if ladrilhado:
+            resultados = []
+            for caminho in caminhos:
+                img = cv2.imread(caminho)
+                if img is None:
+                    resultados.append({'caminho': caminho, 'erro': None, 'resultado': None,
+                                       'falha': f"Não foi possível ler a imagem {caminho}"})
+                    continue
+                _, motivo = self.triar(img)
+                if motivo:
+                    resultados.append({'caminho': caminho, 'erro': None, 'resultado': DESCARTADA, 'descarte': motivo})
+                    continue
+                resultados.append({'caminho': caminho, **self.analisarLadrilhado(img, tamanhoLote=tamanhoLote)})
+            return resultados
+
+        # Threads de decodificação leem, redimensionam e filtram os arquivos à frente (no máximo
+        # `FILA_DECODIFICACAO` prontos) enquanto esta thread monta os lotes no buffer do
+        # preprocessador e chama o modelo. Em série, o resize usa o buffer fixo do preprocessador
+        pre = self.preprocessador(min(tamanhoLote, len(caminhos)) or 1)
+        redimensionar = pre.redimensionar if threads <= 1 else (lambda img: cv2.resize(img, TAMANHO_ENTRADA))
+
+        def preparar(caminho):
+            try:
+                img = redimensionar(self.lerArquivo(caminho))
+                return img, filtrar(img), None
+            except Exception as e:
+                return None, None, str(e)
+
+        resultados, pendentes = [], []
+
+        def executarLote():
+            analises = self.analisarArrays(pre.preenchido(), tamanhoLote=tamanhoLote, comMapa=comMapa)
+            for posicao, analise in zip(pendentes, analises):
+                resultados[posicao].update(analise)
+            pendentes.clear()
+            pre.limpar()
 
-        reconstruida = self.modelo.predict(entrada)[0]
-        erro = np.mean((img_norm - reconstruida) ** 2)
-        return  "Anômala" if erro > self.threshold else "Normal"
\ No newline at end of file
+        preparados = prepararEmParalelo(preparar, caminhos, threads, config.FILA_DECODIFICACAO)
+        for caminho, (img, motivo, falha) in zip(caminhos, preparados):
+            if falha:
+                resultados.append({'caminho': caminho, 'erro': None, 'resultado': None, 'falha': falha})
+            elif motivo:
+                resultados.append({'caminho': caminho, 'erro': None, 'resultado': DESCARTADA, 'descarte': motivo})
+            else:
+                pre.adicionar(img)
+                pendentes.append(len(resultados))
+                resultados.append({'caminho': caminho})
+                if pre.cheio:
+                    executarLote()
+        if pendentes:
+            executarLote()
+        return resultados
@@ -0,0 +1,42 @@
+import numpy as np
+from MVC import config
+
+# divisão de imagens grandes (frames do drone) em ladrilhos no tamanho de entrada do modelo
+
+
+def posicoes(comprimento, tamanho, passo):
+    """
+    Início de cada ladrilho ao longo de um eixo. O último ladrilho é encostado na borda
+    para que toda a imagem seja coberta sem precisar de padding.
+    """
+    if comprimento <= tamanho:
+        return np.array([0])
+    inicios = np.arange(0, comprimento - tamanho, passo)
+    return np.append(inicios, comprimento - tamanho)
+
+
+def gradeLadrilhos(img, tamanho=256, sobreposicao=config.SOBREPOSICAO_LADRILHOS):
+    """
+    Retorna (janelas, ys, xs): `janelas` é uma view (sem cópia) com todas as janelas
+    tamanho x tamanho da imagem e `ys`/`xs` são os inícios de linha/coluna da grade.
+    Imagens menores que o ladrilho são ampliadas com a borda replicada.
+    """
+    if not 0 <= sobreposicao < tamanho:
+        raise ValueError(f"A sobreposição ({sobreposicao}) deve estar entre 0 e {tamanho - 1} pixels.")
+    altura, largura = img.shape[:2]
+    if altura < tamanho or largura < tamanho:
+        img = np.pad(img, ((0, max(0, tamanho - altura)), (0, max(0, tamanho - largura)), (0, 0)), mode='edge')
+        altura, largura = img.shape[:2]
+
+    passo = tamanho - sobreposicao
+    janelas = np.lib.stride_tricks.sliding_window_view(img, (tamanho, tamanho), axis=(0, 1))
+    return janelas, posicoes(altura, tamanho, passo), posicoes(largura, tamanho, passo)
+
+
+def extrairLadrilhos(janelas, ys, xs):
+    """
+    Copia para um array contíguo (N, tamanho, tamanho, canais) os ladrilhos nas posições
+    (ys[i], xs[i]). Uma única indexação vetorizada, sem laço por pixel.
+    """
+    # sliding_window_view coloca as dimensões da janela no final: (..., canais, tamanho, tamanho)
+    return np.ascontiguousarray(janelas[ys, xs].transpose(0, 2, 3, 1))
@@ -1,16 +1,12 @@
-from mysql.connector import connect, Error
+from mysql.connector import Error
+from MVC.model.conexao import conexao
 
 
 # função para salvar a localização do produtor
 
 def salvarLocalizacaoProdutor(cpf, latitude, longitude, extTerritorial):
     try:
-        with connect(
-            host="localhost",
-            user="agrineural",
-            password="senha123",
-            database="agrineural"
-        ) as conn:
+        with conexao() as conn:
             with conn.cursor() as cursor:
                 cursor.execute(
                     """
@@ -0,0 +1,47 @@
+import cv2
+import numpy as np
+from MVC import config
+
+# funções para localizar onde, dentro da imagem, está o erro de reconstrução
+
+
+def reduzirMapa(mapa, tamanho=config.TAMANHO_MAPA_ERRO):
+    """
+    Reduz o mapa de erro por pixel (256x256) para tamanho x tamanho pela média de cada bloco.
+    """
+    return cv2.resize(mapa.astype("float32"), (tamanho, tamanho), interpolation=cv2.INTER_AREA)
+
+
+def regioesQuentes(mapa, k=config.REGIOES_QUENTES, grade=8):
+    """
+    Divide o mapa numa grade `grade` x `grade` e retorna as `k` células com maior erro médio.
+    As coordenadas são frações (0 a 1) da imagem, para valerem em qualquer resolução.
+    """
+    altura, largura = mapa.shape
+    celula_y, celula_x = altura // grade, largura // grade
+    celulas = mapa[:celula_y * grade, :celula_x * grade].reshape(grade, celula_y, grade, celula_x).mean(axis=(1, 3))
+
+    k = min(k, celulas.size)
+    maiores = np.argpartition(celulas.ravel(), -k)[-k:]
+    maiores = maiores[np.argsort(celulas.ravel()[maiores])[::-1]]
+
+    regioes = []
+    for indice in maiores:
+        linha, coluna = divmod(int(indice), grade)
+        regioes.append({
+            'x': coluna / grade, 'y': linha / grade,
+            'largura': 1 / grade, 'altura': 1 / grade,
+            'erro': float(celulas[linha, coluna])
+        })
+    return regioes
+
+
+def salvarMapa(mapa, caminho, escala=config.ESCALA_MAPA_ERRO):
+    """
+    Grava o mapa como PNG em tons de cinza (uint8). O valor 255 corresponde a `escala`
+    de erro quadrático, então erro = pixel / 255 * escala.
+    """
+    imagem = np.clip(mapa / escala * 255.0, 0, 255).astype("uint8")
+    if not cv2.imwrite(caminho, imagem):
+        raise ValueError(f"Não foi possível gravar o mapa de erro em {caminho}")
+    return caminho
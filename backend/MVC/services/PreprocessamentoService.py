@@ -0,0 +1,81 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+# pré-processamento das imagens direto no buffer de entrada do modelo, sem arrays intermediários
+
+
+class Preprocessador:
+    """
+    Mantém um lote float32 (capacidade, altura, largura, 3) alocado uma única vez e reutilizado
+    entre lotes. Cada imagem é redimensionada para um buffer uint8 fixo e escrita na sua posição
+    do lote numa só operação: inversão BGR -> RGB por view (sem cópia), conversão e escala.
+    O conteúdo do lote só vale até a próxima chamada de `limpar`.
+    """
+
+    def __init__(self, capacidade, tamanho=(256, 256)):
+        largura, altura = tamanho
+        self.tamanho = tamanho
+        self.lote = np.empty((capacidade, altura, largura, 3), dtype="float32")
+        self._redimensionada = np.empty((altura, largura, 3), dtype=np.uint8)
+        self.quantidade = 0
+
+    @property
+    def capacidade(self):
+        return len(self.lote)
+
+    @property
+    def cheio(self):
+        return self.quantidade == self.capacidade
+
+    def limpar(self):
+        self.quantidade = 0
+
+    def redimensionar(self, img):
+        """
+        Redimensiona a imagem BGR para o tamanho de entrada no buffer uint8 reutilizado.
+        O retorno é sobrescrito pela próxima chamada.
+        """
+        if img.shape == self._redimensionada.shape:
+            return img
+        return cv2.resize(img, self.tamanho, dst=self._redimensionada)
+
+    def adicionar(self, img):
+        """
+        Escreve a imagem BGR já no tamanho de entrada na próxima posição do lote, em RGB e
+        normalizada para [0, 1]. Retorna a posição usada.
+        """
+        if self.cheio:
+            raise ValueError(f"O lote já tem {self.capacidade} imagens")
+        np.divide(img[..., ::-1], 255.0, out=self.lote[self.quantidade], dtype="float32")
+        self.quantidade += 1
+        return self.quantidade - 1
+
+    def preenchido(self):
+        # view das posições ocupadas, sem cópia
+        return self.lote[:self.quantidade]
+
+
+def prepararEmParalelo(preparar, itens, threads, limite):
+    """
+    Aplica `preparar` a cada item em `threads` threads (a leitura e o resize do OpenCV liberam
+    o GIL) e devolve os resultados na ordem dos itens, conforme quem consome vai pedindo.
+    No máximo `limite` itens ficam preparados ou em preparo à frente do consumidor: se ele
+    (o modelo) estiver mais lento, as threads esperam, e a memória fica limitada.
+    Com threads <= 1 tudo roda em série, na thread de quem chamou.
+    """
+    if threads <= 1:
+        for item in itens:
+            yield preparar(item)
+        return
+
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='decodificacao') as executor:
+        fila = deque()
+        for item in itens:
+            if len(fila) >= limite:
+                yield fila.popleft().result()
+            fila.append(executor.submit(preparar, item))
+        while fila:
+            yield fila.popleft().result()
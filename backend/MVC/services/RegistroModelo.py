@@ -0,0 +1,254 @@
+import argparse
+import json
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+
+from MVC import config
+from MVC.services.IAService import ModeloAgrineural
+
+# registro que mantém uma única instância do modelo por processo, na versão indicada pelo
+# manifesto da pasta de modelos, trocando de versão sem reiniciar o processo
+# publicar/ativar versões (a partir de backend/): python -m MVC.services.RegistroModelo --help
+
+MANIFESTO = 'manifest.json'
+
+
+def lerManifesto(pasta=config.PASTA_MODELOS):
+    with open(os.path.join(pasta, MANIFESTO), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def gravarManifesto(manifesto, pasta=config.PASTA_MODELOS):
+    # Grava num arquivo temporário e substitui de uma vez: quem lê nunca vê um JSON pela metade
+    caminho = os.path.join(pasta, MANIFESTO)
+    with open(caminho + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, indent=2)
+    os.replace(caminho + '.tmp', caminho)
+
+
+def versaoAtual(pasta=config.PASTA_MODELOS):
+    """
+    Retorna (versao, caminho do checkpoint, threshold) da versão ativa no manifesto.
+    """
+    manifesto = lerManifesto(pasta)
+    versao = manifesto['atual']
+    entrada = manifesto['versoes'][versao]
+    return versao, os.path.join(pasta, entrada['arquivo']), entrada.get('threshold')
+
+
+def publicarVersao(checkpoint, versao, threshold, ativar=True, pasta=config.PASTA_MODELOS):
+    """
+    Copia o checkpoint para a pasta de modelos e registra a versão no manifesto.
+    Com `ativar`, os processos em execução passam a usá-la na próxima verificação.
+    """
+    manifesto = lerManifesto(pasta)
+    destino = os.path.join(pasta, os.path.basename(checkpoint))
+    if os.path.abspath(checkpoint) != os.path.abspath(destino):
+        shutil.copy2(checkpoint, destino)
+    manifesto['versoes'][versao] = {'arquivo': os.path.basename(checkpoint), 'threshold': threshold}
+    if ativar:
+        manifesto['atual'] = versao
+    gravarManifesto(manifesto, pasta)
+
+
+def ativarVersao(versao, pasta=config.PASTA_MODELOS):
+    manifesto = lerManifesto(pasta)
+    if versao not in manifesto['versoes']:
+        raise ValueError(f"Versão desconhecida: {versao} (opções: {', '.join(manifesto['versoes'])})")
+    manifesto['atual'] = versao
+    gravarManifesto(manifesto, pasta)
+
+
+class RegistroModelo:
+
+    def __init__(self, caminhoModelo=None, pastaModelos=config.PASTA_MODELOS):
+        # Um checkpoint fixo (argumento ou AGRINEURAL_MODELO) desliga o manifesto
+        if caminhoModelo is None and config.MODELO_FIXO:
+            caminhoModelo = config.CAMINHO_MODELO
+        self.caminhoModelo = caminhoModelo
+        self.pastaModelos = pastaModelos
+        self._lock = threading.Lock()
+        self._lockRecarga = threading.Lock()
+        self._modelo = None
+        self._pid = None
+        self.versao = None              # versão do manifesto carregada neste processo
+        self.cargas = 0                 # quantas vezes um checkpoint foi lido neste processo
+        self.tempoCarga = None          # segundos gastos no load_model
+        self.tempoAquecimento = None    # segundos gastos no aquecimento
+        self.aquecido = False
+        self.erroCarga = None           # mensagem da última falha ao carregar/aquecer em segundo plano
+        self._aquecimento = None
+        self._monitor = None
+
+    def versoesRegistradas(self):
+        """
+        Versões publicadas no manifesto (nenhuma com um checkpoint fixo).
+        """
+        if self.caminhoModelo:
+            return []
+        return list(lerManifesto(self.pastaModelos)['versoes'])
+
+    def _alvo(self):
+        # (versao, caminho, threshold) que este processo deveria estar usando
+        if self.caminhoModelo:
+            return None, self.caminhoModelo, None
+        return versaoAtual(self.pastaModelos)
+
+    def _carregar(self):
+        versao, caminho, threshold = self._alvo()
+        inicio = time.perf_counter()
+        modelo = ModeloAgrineural(caminhoModelo=caminho, versao=versao, threshold=threshold)
+        self.tempoCarga = time.perf_counter() - inicio
+        self.cargas += 1
+        print(f"[INFO] Modelo {modelo.versao} carregado em {self.tempoCarga:.2f}s (pid {os.getpid()}).")
+        return modelo, versao
+
+    def obterModelo(self):
+        """
+        Retorna o modelo do processo atual, carregando o checkpoint na primeira chamada.
+        Se o processo foi criado por fork depois da carga, carrega uma cópia própria.
+        Quem pegou o modelo continua com a mesma instância mesmo que a versão seja trocada.
+        """
+        modelo = self._modelo
+        if modelo is not None and self._pid == os.getpid():
+            return modelo
+
+        with self._lock:
+            if self._modelo is None or self._pid != os.getpid():
+                self._modelo, self.versao = self._carregar()
+                self._pid = os.getpid()
+                self.aquecido = False
+            return self._modelo
+
+    def _aquecer(self, modelo, tamanhosLote):
+        inicio = time.perf_counter()
+        for tamanho in tamanhosLote:
+            entrada = np.zeros((tamanho, 256, 256, 3), dtype="float32")
+            modelo.reconstruir(entrada)
+        return time.perf_counter() - inicio
+
+    def aquecer(self, tamanhosLote=config.TAMANHOS_LOTE_AQUECIMENTO):
+        """
+        Executa inferências com entradas vazias para pagar o custo da primeira chamada
+        antes de chegar a primeira requisição real.
+        """
+        modelo = self.obterModelo()
+        self.tempoAquecimento = self._aquecer(modelo, tamanhosLote)
+        self.aquecido = True
+        print(f"[INFO] Modelo aquecido em {self.tempoAquecimento:.2f}s (lotes {tuple(tamanhosLote)}).")
+        return modelo
+
+    def aquecerEmSegundoPlano(self, tamanhosLote=config.TAMANHOS_LOTE_AQUECIMENTO):
+        """
+        Carrega e aquece o modelo numa thread, sem segurar a subida do servidor.
+        Enquanto isso `aquecido` fica False (o /health/ready responde 503).
+        """
+        def aquecer():
+            try:
+                self.aquecer(tamanhosLote)
+                self.erroCarga = None
+            except Exception as e:
+                self.erroCarga = str(e)
+                print(f"[ERRO] Falha ao carregar o modelo: {e}")
+
+        if self._aquecimento is None or not self._aquecimento.is_alive():
+            self._aquecimento = threading.Thread(target=aquecer, name='aquecimento-modelo', daemon=True)
+            self._aquecimento.start()
+        return self._aquecimento
+
+    def recarregar(self, tamanhosLote=config.TAMANHOS_LOTE_AQUECIMENTO):
+        """
+        Se o manifesto aponta para outra versão, carrega e aquece a nova ao lado da atual e
+        só então troca a referência. Requisições em andamento terminam com o modelo antigo,
+        as seguintes já recebem o novo. Retorna True se houve troca.
+        """
+        with self._lockRecarga:
+            versao, caminho, threshold = self._alvo()
+            if self._modelo is not None and self._pid == os.getpid() and versao == self.versao:
+                return False
+
+            inicio = time.perf_counter()
+            novo = ModeloAgrineural(caminhoModelo=caminho, versao=versao, threshold=threshold)
+            tempoCarga = time.perf_counter() - inicio
+            tempoAquecimento = self._aquecer(novo, tamanhosLote)
+
+            with self._lock:
+                anterior = self._modelo.versao if self._modelo is not None else None
+                self._modelo, self.versao, self._pid = novo, versao, os.getpid()
+                self.cargas += 1
+                self.tempoCarga, self.tempoAquecimento = tempoCarga, tempoAquecimento
+                self.aquecido = True
+                self.erroCarga = None
+            print(f"[INFO] Modelo trocado de {anterior} para {novo.versao} "
+                  f"(carga {tempoCarga:.2f}s, aquecimento {tempoAquecimento:.2f}s).")
+            return True
+
+    def recarregarEmSegundoPlano(self):
+        def recarregar():
+            try:
+                self.recarregar()
+            except Exception as e:
+                # O modelo em uso continua atendendo
+                self.erroCarga = str(e)
+                print(f"[ERRO] Falha ao trocar o modelo: {e}")
+
+        thread = threading.Thread(target=recarregar, name='recarga-modelo', daemon=True)
+        thread.start()
+        return thread
+
+    def iniciarMonitor(self, intervalo=config.INTERVALO_MANIFESTO):
+        """
+        Verifica o manifesto a cada `intervalo` segundos e troca de modelo quando a versão ativa muda.
+        Sem efeito com um checkpoint fixo.
+        """
+        if self.caminhoModelo or (self._monitor is not None and self._monitor.is_alive()):
+            return self._monitor
+
+        def monitorar():
+            while True:
+                time.sleep(intervalo)
+                try:
+                    if self.aquecido and versaoAtual(self.pastaModelos)[0] != self.versao:
+                        self.recarregar()
+                except Exception as e:
+                    print(f"[ERRO] Falha ao verificar o manifesto de modelos: {e}")
+
+        self._monitor = threading.Thread(target=monitorar, name='monitor-modelo', daemon=True)
+        self._monitor.start()
+        return self._monitor
+
+
+# Instância única usada pelos controllers
+registro = RegistroModelo()
+
+
+def obterModelo():
+    return registro.obterModelo()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Versões do modelo registradas no manifesto')
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+    subcomandos.add_parser('listar', help='mostra as versões e qual está ativa')
+    publicar = subcomandos.add_parser('publicar', help='registra um novo checkpoint')
+    publicar.add_argument('checkpoint')
+    publicar.add_argument('--versao', required=True)
+    publicar.add_argument('--threshold', type=float, required=True)
+    publicar.add_argument('--sem-ativar', action='store_true', help='só registra, sem trocar a versão ativa')
+    ativar = subcomandos.add_parser('ativar', help='torna uma versão registrada a ativa (também serve de rollback)')
+    ativar.add_argument('versao')
+    args = parser.parse_args()
+
+    if args.comando == 'listar':
+        manifesto = lerManifesto()
+        for versao, entrada in manifesto['versoes'].items():
+            marcador = '*' if versao == manifesto['atual'] else ' '
+            print(f"{marcador} {versao}: {entrada['arquivo']} (threshold {entrada.get('threshold')})")
+    elif args.comando == 'publicar':
+        publicarVersao(args.checkpoint, args.versao, args.threshold, ativar=not args.sem_ativar)
+    elif args.comando == 'ativar':
+        ativarVersao(args.versao)
@@ -0,0 +1,47 @@
+from MVC.services.IAService import DESCARTADA
+from MVC.services.MapaAnomaliaService import salvarMapa
+
+# gravação do resultado de uma análise, usada pelos workers (em lote) e pelo upload síncrono
+
+
+def montarRegistro(modelo, analise, nome, caminho_arquivo, latitude, longitude,
+                   fazenda_id=None, threshold=None, dhash=None, duplicata_de=None):
+    """
+    Classifica a análise (com o threshold da fazenda, se houver) e salva o mapa de erro ao lado
+    do upload. Retorna (resultado, registro), em que registro tem os campos de imagem + resultado
+    para o banco, ou é None se a imagem não pertence a uma fazenda.
+    """
+    if analise['resultado'] is None:
+        raise Exception(analise['falha'])
+    # Imagens barradas pelo filtro prévio não têm erro: ficam gravadas com o motivo do descarte
+    descarte = analise.get('descarte')
+    resultado = DESCARTADA if descarte else modelo.classificar(analise['erro'], threshold)
+
+    # Mapa de erro salvo ao lado do upload (mesmo forward pass, sem custo extra de inferência)
+    caminho_mapa = analise.get('caminhoMapa')  # análises vindas do cache reaproveitam o mapa já salvo
+    if 'mapa' in analise:
+        caminho_mapa = salvarMapa(analise['mapa'], caminho_arquivo + '.mapa.png')
+
+    if fazenda_id is None:
+        return resultado, None
+    return resultado, {
+        'fazenda_id': fazenda_id, 'nome_arquivo': nome, 'latitude': latitude, 'longitude': longitude,
+        'anomala': (resultado == "Anômala"), 'erro': analise['erro'], 'versao_modelo': modelo.versao,
+        'mapa_erro': caminho_mapa, 'regioes': analise.get('regioes'), 'dhash': dhash,
+        'duplicata_de': duplicata_de, 'descarte': descarte
+    }
+
+
+def registrarResultado(modelo, analise, imagem_dao, nome, caminho_arquivo, latitude, longitude,
+                       fazenda_id=None, threshold=None, dhash=None, duplicata_de=None):
+    """
+    Como montarRegistro, gravando imagem + resultado no banco na hora (uploads síncronos).
+    Retorna (resultado, imagem_id).
+    """
+    resultado, registro = montarRegistro(modelo, analise, nome, caminho_arquivo, latitude, longitude,
+                                         fazenda_id, threshold, dhash, duplicata_de)
+    imagem_id = None
+    if registro is not None:
+        imagem_id = imagem_dao.salvar_imagem_e_resultado(**registro)
+        if imagem_id is None: raise Exception("Falha ao salvar dados no banco.")
+    return resultado, imagem_id
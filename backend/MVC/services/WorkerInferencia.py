@@ -0,0 +1,276 @@
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import time
+
+from MVC import config
+from MVC.model import conexao
+from MVC.model.cache_dao import CacheResultadoDAO
+from MVC.model.escritor_lote import EscritorLote
+from MVC.model.fazenda_dao import FazendaDAO
+from MVC.model.imagem_dao import ImagemDAO
+from MVC.model.job_dao import JobDAO
+from MVC.services import CacheService, FiltroService
+from MVC.services.DuplicataService import IndiceDuplicatas, dhashArquivo
+from MVC.services.RegistroModelo import registro
+from MVC.services.ResultadoService import montarRegistro
+
+# processos que consomem a fila jobs_analise, cada um com o seu modelo carregado
+# uso (a partir de backend/): python -m MVC.services.WorkerInferencia --workers 4
+
+INTERVALO_RECUPERACAO = 60  # segundos entre verificações de jobs travados
+
+
+def escreverStatus(caminho_status, texto):
+    # Apenas os envios pela rota legada /upload têm arquivo de status
+    if caminho_status:
+        with open(caminho_status, 'w', encoding='utf-8') as f:
+            f.write(texto)
+
+
+def registrarFalha(job, mensagem, job_dao):
+    definitivo = job_dao.falhar(job['id'], mensagem)
+    print(f"[ERRO] Job {job['id']} ({job['nome']}) falhou na tentativa {job['tentativas'] + 1}: {mensagem}")
+    if definitivo:
+        escreverStatus(job['caminho_status'], f"Erro no processamento! — {mensagem}")
+
+
+def _hashes(jobs):
+    hashes = {}
+    for job in jobs:
+        try:
+            hashes[job['id']] = CacheService.hashArquivo(job['caminho_arquivo'])
+        except OSError:
+            pass  # arquivo sumiu: segue para o modelo, que registra a falha
+    return hashes
+
+
+def _dhashes(jobs, indice):
+    # Só imagens de fazenda entram no índice de duplicatas
+    dhashes = {}
+    for fazenda_id in {job['fazenda_id'] for job in jobs if job['fazenda_id'] is not None}:
+        indice.atualizar(fazenda_id)
+    for job in jobs:
+        if job['fazenda_id'] is not None:
+            dhashes[job['id']] = dhashArquivo(job['caminho_arquivo'])
+    return dhashes
+
+
+def _buscarOriginal(indice, escritor, job, dhash):
+    if dhash is None:
+        return None
+    # Primeiro entre as imagens já gravadas; depois entre as que esperam no escritor (frames vizinhos do mesmo lote)
+    return (indice.buscarOriginal(job['fazenda_id'], dhash, job['latitude'], job['longitude'])
+            or indice.buscarEntre(escritor.pendentes(), job['fazenda_id'], dhash, job['latitude'], job['longitude']))
+
+
+def _referencia(original):
+    # Original da cadeia de duplicatas: o id, ou o próprio registro se ele ainda não foi gravado
+    if original is None:
+        return None
+    return original['duplicata_de'] or original.get('id') or original
+
+
+def _concluir(job, resultado, analise, imagem_id, job_dao):
+    job_dao.concluir(job['id'], resultado, imagem_id)
+    motivo = f" ({analise['descarte']})" if analise.get('descarte') else ''
+    escreverStatus(job['caminho_status'], f"Concluído com sucesso! — Resultado: {resultado}{motivo}")
+
+
+def _aoGravar(job, resultado, analise, registro, job_dao, indice):
+    # Chamado pelo escritor depois da gravação do lote com o id da imagem (None se falhou)
+    def concluir(imagem_id):
+        try:
+            if imagem_id is None:
+                raise Exception("Falha ao salvar dados no banco.")
+            _concluir(job, resultado, analise, imagem_id, job_dao)
+            if indice and registro['dhash'] is not None:
+                duplicata_de = registro['duplicata_de']
+                indice.adicionar(job['fazenda_id'], {
+                    'id': imagem_id, 'dhash': registro['dhash'], 'latitude': job['latitude'],
+                    'longitude': job['longitude'], 'erro': analise['erro'],
+                    'duplicata_de': duplicata_de['id'] if isinstance(duplicata_de, dict) else duplicata_de
+                })
+        except Exception as e:
+            registrarFalha(job, str(e), job_dao)
+    return concluir
+
+
+def processarJobs(jobs, modelo, job_dao, imagem_dao, fazenda_dao, cache_dao=None, indice=None, escritor=None):
+    """
+    Analisa os jobs reservados num único lote e grava o resultado de cada um.
+    Imagens já analisadas por esta versão do modelo (mesmo conteúdo) vêm do cache,
+    sem passar pelo modelo. Com o `indice` de duplicatas, frames quase iguais a uma imagem
+    anterior da fazenda são marcados (e, com PULAR_DUPLICATAS, reaproveitam o erro dela).
+    Imagens de fazendas com threshold próprio são classificadas com ele.
+    Imagens + resultados vão para o `escritor` e cada job é concluído quando o lote dele é
+    gravado; sem escritor, tudo é gravado numa transação ao fim desta chamada.
+    """
+    escritor_proprio = escritor is None
+    if escritor_proprio:
+        escritor = EscritorLote(imagem_dao)
+    versao = CacheService.versaoCache(modelo)
+    try:
+        hashes = _hashes(jobs) if cache_dao else {}
+        em_cache = CacheService.buscar(cache_dao, hashes.values(), versao) if cache_dao else {}
+        dhashes = _dhashes(jobs, indice) if indice else {}
+        originais = {}
+        if indice and config.PULAR_DUPLICATAS:
+            for job in jobs:
+                original = _buscarOriginal(indice, escritor, job, dhashes.get(job['id']))
+                if original is not None and original['erro'] is not None:
+                    originais[job['id']] = original
+        faltantes = [job for job in jobs if hashes.get(job['id']) not in em_cache and job['id'] not in originais]
+        analisadas = modelo.analisarLote([job['caminho_arquivo'] for job in faltantes],
+                                         comMapa=config.GERAR_MAPA_ERRO, ladrilhado=config.ANALISE_LADRILHADA)
+        analisadas = {job['id']: analise for job, analise in zip(faltantes, analisadas)}
+        thresholds = fazenda_dao.buscar_thresholds({job['fazenda_id'] for job in jobs if job['fazenda_id'] is not None})
+    except Exception as e:
+        for job in jobs:
+            registrarFalha(job, str(e), job_dao)
+        return
+
+    novas = {}
+    for job in jobs:
+        hash_ = hashes.get(job['id'])
+        dhash = dhashes.get(job['id'])
+        if job['id'] in analisadas:
+            analise = analisadas[job['id']]
+        elif job['id'] in originais:
+            erro = originais[job['id']]['erro']
+            analise = {'erro': erro, 'resultado': modelo.classificar(erro)}
+        else:
+            analise = CacheService.analiseDoCache(modelo, em_cache[hash_])
+        try:
+            # Procura depois dos jobs anteriores do lote entrarem no escritor: pega também frames vizinhos no mesmo lote
+            original = originais.get(job['id']) or (_buscarOriginal(indice, escritor, job, dhash) if indice else None)
+            resultado, registro = montarRegistro(
+                modelo, analise, job['nome'], job['caminho_arquivo'], job['latitude'], job['longitude'],
+                fazenda_id=job['fazenda_id'], threshold=thresholds.get(job['fazenda_id']), dhash=dhash,
+                duplicata_de=_referencia(original)
+            )
+            if registro is None:
+                _concluir(job, resultado, analise, None, job_dao)
+            else:
+                escritor.adicionar(registro, _aoGravar(job, resultado, analise, registro, job_dao, indice))
+            if hash_ and job['id'] in analisadas and not analise.get('descarte'):
+                novas[hash_] = CacheService.entradaCache(analise, job['caminho_arquivo'])
+        except Exception as e:
+            registrarFalha(job, str(e), job_dao)
+
+    if escritor_proprio:
+        escritor.descarregar()
+
+    if novas:
+        try:
+            cache_dao.salvar(novas, versao)
+        except Exception as e:
+            print(f"[ERRO] Falha ao gravar no cache de resultados: {e}")
+
+
+def executarWorker(parar=None):
+    nome_worker = f"{socket.gethostname()}-{os.getpid()}"
+    job_dao = JobDAO(password='senha123')
+    imagem_dao = ImagemDAO(password='senha123')
+    fazenda_dao = FazendaDAO(password='senha123')
+    cache_dao = CacheResultadoDAO(password='senha123')
+    indice = IndiceDuplicatas(imagem_dao)
+    escritor = EscritorLote(imagem_dao)
+
+    # Cada processo carrega e aquece o próprio modelo antes de consumir a fila; depois troca
+    # de versão quando o manifesto muda (verificação periódica ou SIGHUP), sem parar a fila
+    if hasattr(signal, 'SIGHUP'):
+        # Instalado antes da carga: um SIGHUP sem handler encerraria o processo
+        signal.signal(signal.SIGHUP, lambda *_: registro.aquecido and registro.recarregarEmSegundoPlano())
+    registro.aquecer()
+    registro.iniciarMonitor()
+    print(f"[INFO] Worker {nome_worker} pronto.")
+
+    ultima_recuperacao = 0
+    lotes = 0
+    versao_cache = None
+    while parar is None or not parar.is_set():
+        try:
+            # O lote inteiro usa a mesma instância, mesmo que uma troca aconteça no meio dele
+            modelo = registro.obterModelo()
+            if modelo.versao != versao_cache:
+                # Só saem as versões retiradas do manifesto: as demais podem voltar a ser ativadas
+                # ou estar em uso por workers com outro backend
+                validas = CacheService.versoesValidas(modelo, registro.versoesRegistradas())
+                removidas = cache_dao.invalidar(validas)
+                if removidas:
+                    print(f"[INFO] {removidas} resultados de versões fora do manifesto removidos do cache.")
+                versao_cache = modelo.versao
+
+            if time.monotonic() - ultima_recuperacao > INTERVALO_RECUPERACAO:
+                job_dao.recuperar_expirados()
+                ultima_recuperacao = time.monotonic()
+
+            jobs = job_dao.reservar(nome_worker, config.TAMANHO_LOTE)
+            if not jobs:
+                escritor.descarregar()  # fila vazia: não há mais jobs para juntar ao lote
+                time.sleep(config.INTERVALO_FILA)
+                continue
+
+            processarJobs(jobs, modelo, job_dao, imagem_dao, fazenda_dao, cache_dao, indice, escritor)
+            escritor.descarregarVencido()
+            lotes += 1
+            if lotes % 100 == 0:
+                cache = CacheService.estatisticas()
+                print(f"[INFO] Worker {nome_worker}: cache com {cache['acertos']} acertos e "
+                      f"{cache['faltas']} faltas ({cache['taxaAcerto']:.0%}).")
+                if config.ETAPAS_FILTRO:
+                    filtro = FiltroService.estatisticas()
+                    print(f"[INFO] Worker {nome_worker}: filtro prévio aprovou {filtro['aprovadas']} de "
+                          f"{filtro['analisadas']} imagens (descartes: exposição {filtro['exposicao']}, "
+                          f"vegetação {filtro['vegetacao']}, desfoque {filtro['desfoque']}).")
+                for banco, pool in conexao.metricas().items():
+                    print(f"[INFO] Worker {nome_worker}: pool {banco} com {pool['abertas']} conexões, "
+                          f"espera média {pool['espera_media_ms']:.1f} ms (maior {pool['maior_espera_ms']:.1f} ms), "
+                          f"pico de {pool['pico_em_uso']} em uso, {pool['timeouts']} timeouts.")
+        except Exception as e:
+            # Banco fora do ar, por exemplo: espera e tenta de novo
+            print(f"[ERRO] Worker {nome_worker}: {e}")
+            time.sleep(config.INTERVALO_FILA)
+    escritor.descarregar()
+
+
+def iniciarPool(numWorkers=config.NUM_WORKERS_INFERENCIA):
+    """
+    Sobe `numWorkers` processos de inferência. Usa 'spawn' para que nenhum processo
+    herde o estado do TensorFlow de outro.
+    """
+    contexto = multiprocessing.get_context('spawn')
+    parar = contexto.Event()
+    processos = []
+    for i in range(numWorkers):
+        processo = contexto.Process(target=executarWorker, args=(parar,), name=f'inferencia-{i}')
+        processo.start()
+        processos.append(processo)
+    return contexto, processos, parar
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Pool de workers de inferência do Agrineural')
+    parser.add_argument('--workers', type=int, default=config.NUM_WORKERS_INFERENCIA)
+    args = parser.parse_args()
+
+    contexto, processos, parar = iniciarPool(args.workers)
+    if hasattr(signal, 'SIGHUP'):
+        # kill -HUP no processo principal pede a todos os workers que releiam o manifesto
+        signal.signal(signal.SIGHUP, lambda *_: [os.kill(p.pid, signal.SIGHUP) for p in processos if p.is_alive()])
+    try:
+        while True:
+            time.sleep(5)
+            # Substitui workers que morreram (ex.: falta de memória)
+            for i, processo in enumerate(processos):
+                if not processo.is_alive():
+                    print(f"[ERRO] {processo.name} encerrou com código {processo.exitcode}; reiniciando.")
+                    processos[i] = contexto.Process(target=executarWorker, args=(parar,), name=processo.name)
+                    processos[i].start()
+    except KeyboardInterrupt:
+        parar.set()
+        for processo in processos:
+            processo.join()
@@ -1,5 +1,12 @@
+import os
+
 import pytest
-from MVC.app import app
+
+# Antes de importar o app: sem o carregamento do modelo em segundo plano e sem a thread que
+# vigia o manifesto, que mudariam o estado do registro no meio dos testes (ver MVC/app.py)
+os.environ['AGRINEURAL_AQUECER'] = '0'
+
+from MVC.app import app  # noqa: E402
 
 
 @pytest.fixture
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from MVC import config
+from MVC.services.IAService import ModeloAgrineural
+from MVC.services.BackendInferencia import criarBackend, exportarTFLite
+
+
+@pytest.fixture(scope='module')
+def caminho_tflite(tmp_path_factory):
+    # Exporta o checkpoint para TFLite (float32 e as duas quantizações) numa pasta temporária,
+    # ao lado de uma cópia do .h5; a imagem de teste serve de calibração para o int8
+    import shutil
+    pasta = tmp_path_factory.mktemp('modelo')
+    caminho_h5 = str(pasta / 'modelo.h5')
+    shutil.copy(config.CAMINHO_MODELO, caminho_h5)
+    exportarTFLite(caminho_h5)
+    exportarTFLite(caminho_h5, quantizacao='float16')
+    exportarTFLite(caminho_h5, quantizacao='int8', pastaCalibracao='MVC/tests/imagens')
+    return caminho_h5
+
+
+def _errosKerasEBackend(caminho_h5, backend):
+    keras = ModeloAgrineural(caminhoModelo=caminho_h5, backend='keras')
+    outro = ModeloAgrineural(caminhoModelo=caminho_h5, backend=backend)
+    entrada = np.stack([keras.carregarImagem('MVC/tests/imagens/teste.jpg'),
+                        np.random.default_rng(0).random((256, 256, 3), dtype=np.float32)])
+    return ([r['erro'] for r in keras.analisarArrays(entrada)],
+            [r['erro'] for r in outro.analisarArrays(entrada)], outro)
+
+
+class TestBackendInferencia:
+
+    def test_backend_desconhecido(self):
+        with pytest.raises(ValueError):
+            criarBackend('inexistente', config.CAMINHO_MODELO)
+
+    # Tolerâncias relativas sobre o erro de reconstrução (MSE): float32 só difere pela ordem das
+    # operações; pesos em float16 têm ~3 dígitos; int8 quantiza também as ativações, então só se
+    # exige que o erro fique na mesma faixa (ver benchmarks/calibrar_quantizacao.py para o
+    # efeito na decisão)
+    @pytest.mark.parametrize('backend, rtol', [
+        ('tflite', 1e-3),
+        ('tflite-float16', 1e-2),
+        ('tflite-int8', 0.25),
+    ])
+    def test_paridade_tflite_keras(self, caminho_tflite, backend, rtol):
+        erros_keras, erros, modelo = _errosKerasEBackend(caminho_tflite, backend)
+
+        np.testing.assert_allclose(erros, erros_keras, rtol=rtol)
+        assert modelo.versao.endswith(f"@{backend}")  # resultados gravados indicam o backend usado
+
+    def test_compilado_igual_ao_predict(self):
+        from unittest.mock import patch
+        compilado = criarBackend('keras', config.CAMINHO_MODELO)
+        with patch.object(config, 'INFERENCIA_COMPILADA', False):
+            predict = criarBackend('keras', config.CAMINHO_MODELO)
+
+        # 5 completa até 8; 9 vira 8 + 1; 40 vira 32 + 8
+        for quantidade in (1, 5, 9, 40):
+            lote = np.random.default_rng(quantidade).random((quantidade, 256, 256, 3), dtype=np.float32)
+            np.testing.assert_allclose(compilado.prever(lote), predict.prever(lote), rtol=1e-4, atol=1e-6)
+
+    def test_compilado_nao_fica_mais_lento_que_predict(self):
+        # Micro-benchmark com margem larga, para não falhar por ruído da máquina: mediana do custo
+        # por chamada (uma imagem, depois do aquecimento) em rodadas alternadas entre os dois.
+        # O compilado costuma ser bem mais rápido; o teste só pega uma regressão grosseira
+        import time
+        from unittest.mock import patch
+        compilado = criarBackend('keras', config.CAMINHO_MODELO)
+        with patch.object(config, 'INFERENCIA_COMPILADA', False):
+            predict = criarBackend('keras', config.CAMINHO_MODELO)
+        entrada = np.random.default_rng(0).random((1, 256, 256, 3), dtype=np.float32)
+
+        def tempoPorChamada(backend, chamadas=10):
+            inicio = time.perf_counter()
+            for _ in range(chamadas):
+                backend.prever(entrada)
+            return (time.perf_counter() - inicio) / chamadas
+
+        tempos = {compilado: [], predict: []}
+        for backend in tempos:
+            backend.prever(entrada)  # aquecimento
+        for _ in range(7):
+            for backend in tempos:
+                tempos[backend].append(tempoPorChamada(backend))
+
+        assert np.median(tempos[compilado]) < 1.5 * np.median(tempos[predict])
@@ -0,0 +1,80 @@
+from unittest.mock import patch, MagicMock
+from MVC.model.cache_dao import CacheResultadoDAO
+from MVC.model.conexao import PoolConexoes
+from MVC.services import CacheService
+from MVC.services.WorkerInferencia import processarJobs
+
+
+def _job(id, caminho):
+    return {'id': id, 'nome': f'{id}.jpg', 'caminho_arquivo': caminho, 'fazenda_id': 1,
+            'latitude': 0.0, 'longitude': 0.0, 'caminho_status': None, 'tentativas': 0}
+
+
+def _modelo():
+    modelo = MagicMock()
+    modelo.versao = 'teste'
+    modelo.classificar.side_effect = lambda erro, threshold=None: "Anômala" if erro > 0.5 else "Normal"
+    modelo.analisarLote.side_effect = lambda caminhos, **kw: [
+        {'caminho': c, 'erro': 0.1, 'resultado': 'Normal'} for c in caminhos
+    ]
+    return modelo
+
+
+class TestCacheService:
+
+    def test_hash_igual_para_bytes_e_arquivo(self, tmp_path):
+        arquivo = tmp_path / 'a.jpg'
+        arquivo.write_bytes(b'conteudo da imagem')
+
+        assert CacheService.hashArquivo(str(arquivo)) == CacheService.hashConteudo(memoryview(b'conteudo da imagem'))
+
+    def test_reenvio_nao_passa_pelo_modelo(self, tmp_path):
+        (tmp_path / 'a.jpg').write_bytes(b'imagem a')
+        (tmp_path / 'b.jpg').write_bytes(b'imagem b')
+        hash_a = CacheService.hashConteudo(b'imagem a')
+
+        cache_dao = MagicMock()
+        cache_dao.buscar.return_value = {hash_a: {'erro': 0.9, 'regioes': None, 'mapa_erro': None}}
+        fazenda_dao = MagicMock()
+        fazenda_dao.buscar_thresholds.return_value = {}
+        imagem_dao = MagicMock()
+        imagem_dao.salvar_lote.side_effect = lambda registros: [10] * len(registros)
+        job_dao = MagicMock()
+        modelo = _modelo()
+
+        processarJobs([_job(1, str(tmp_path / 'a.jpg')), _job(2, str(tmp_path / 'b.jpg'))],
+                      modelo, job_dao, imagem_dao, fazenda_dao, cache_dao)
+
+        # só a imagem nova foi analisada; a outra veio do cache com o rótulo recalculado
+        assert modelo.analisarLote.call_args[0][0] == [str(tmp_path / 'b.jpg')]
+        job_dao.concluir.assert_any_call(1, "Anômala", 10)
+        job_dao.concluir.assert_any_call(2, "Normal", 10)
+        novas, versao = cache_dao.salvar.call_args[0]
+        assert list(novas) == [CacheService.hashConteudo(b'imagem b')] and versao == 'teste'
+
+    def test_versoes_validas_ignoram_backend_e_modo(self):
+        assert CacheService.versaoBase('v3@tflite-int8+ladrilhos') == 'v3'
+        modelo = MagicMock(versao='v3@tflite')
+        assert CacheService.versoesValidas(modelo, ['v2', 'v3']) == ['v2', 'v3']
+        assert CacheService.versoesValidas(modelo) == ['v3']  # checkpoint fixo, sem manifesto
+
+    def test_versao_do_cache_separa_os_modos_de_decodificacao(self):
+        modelo = MagicMock(versao='v3')
+        assert CacheService.versaoCache(modelo, ladrilhado=False, reduzida=False) == 'v3'
+        assert CacheService.versaoCache(modelo, ladrilhado=False, reduzida=True) == 'v3+reduzida'
+        assert CacheService.versaoCache(modelo, ladrilhado=True, reduzida=True) == 'v3+ladrilhos'
+        assert CacheService.versaoBase('v3@tflite+reduzida') == 'v3'
+
+    def test_invalidar_compara_so_o_nome_da_versao(self):
+        conn = MagicMock()
+        conn.in_transaction = False
+        cursor = conn.cursor.return_value
+        cursor.rowcount = 4
+        dao = CacheResultadoDAO()
+        with patch('mysql.connector.connect', return_value=conn):
+            dao._pool = PoolConexoes(tamanho=1, excedente=0)
+            assert dao.invalidar(['v2', 'v3']) == 4
+
+        sql, parametros = cursor.execute.call_args.args
+        assert "SUBSTRING_INDEX(SUBSTRING_INDEX(versao_modelo, '+', 1), '@', 1) NOT IN (%s, %s)" in sql
+        assert parametros == ('v2', 'v3')
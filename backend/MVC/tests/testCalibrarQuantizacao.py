@@ -0,0 +1,38 @@
+import subprocess
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from benchmarks.calibrar_quantizacao import executar, thresholdEquivalente
+
+REFERENCIA = [0.1, 0.2, 0.3, 0.4]
+
+
+class TestThresholdEquivalente:
+
+    @pytest.mark.parametrize('erros, esperado', [
+        (REFERENCIA, 0.2),  # mesma escala: o maior erro ainda normal
+        ([e * 2 for e in REFERENCIA], 0.4),  # variante que dobra o erro
+        ([e + 0.1 for e in REFERENCIA], 0.3),  # variante com deslocamento constante
+    ])
+    def test_reproduz_as_decisoes_da_referencia(self, erros, esperado):
+        threshold = thresholdEquivalente(REFERENCIA, erros, 0.25)
+
+        assert threshold == pytest.approx(esperado)
+        np.testing.assert_array_equal(np.asarray(erros) > threshold, np.asarray(REFERENCIA) > 0.25)
+
+    def test_ordem_trocada_perde_o_minimo_de_decisoes(self):
+        # nenhum corte separa 0.3 de 0.2 quando a variante inverte as duas imagens
+        erros = [0.1, 0.3, 0.2, 0.4]
+        threshold = thresholdEquivalente(REFERENCIA, erros, 0.25)
+
+        assert ((np.asarray(erros) > threshold) != (np.asarray(REFERENCIA) > 0.25)).sum() == 1
+
+
+class TestExecutar:
+
+    def test_variante_que_falha_nao_aborta_o_relatorio(self, capsys):
+        erro = subprocess.CalledProcessError(1, 'python', stderr="Traceback...\nFileNotFoundError: modelo.int8.tflite\n")
+        with patch('benchmarks.calibrar_quantizacao.subprocess.run', side_effect=erro):
+            assert executar('tflite-int8', ['a.jpg']) is None
+        assert "[ERRO] Backend tflite-int8 falhou: FileNotFoundError: modelo.int8.tflite" in capsys.readouterr().out
@@ -0,0 +1,185 @@
+import threading
+import time
+from unittest.mock import patch, MagicMock
+
+import mysql.connector
+import pytest
+from MVC.model.conexao import PoolConexoes, PoolEsgotado
+
+
+def conexaoFalsa():
+    conn = MagicMock()
+    conn.in_transaction = False
+    return conn
+
+
+def conexaoComTransacao():
+    # in_transaction como no mysql-connector com autocommit desligado: qualquer comando abre uma
+    # transação, que só termina no commit/rollback, e start_transaction() falha se já houver uma
+    conn = MagicMock()
+    conn.in_transaction = False
+    ultimo = []
+
+    def iniciar():
+        if conn.in_transaction:
+            raise mysql.connector.errors.ProgrammingError('Transaction already in progress')
+        conn.in_transaction = True
+
+    def encerrar():
+        conn.in_transaction = False
+
+    def executar(sql, parametros=None):
+        conn.in_transaction = True
+        ultimo[:] = [sql]
+
+    conn.start_transaction.side_effect = iniciar
+    conn.commit.side_effect = encerrar
+    conn.rollback.side_effect = encerrar
+    cursor = conn.cursor.return_value
+    cursor.__enter__.return_value = cursor
+    cursor.execute.side_effect = executar
+    cursor.fetchone.side_effect = lambda: (1,) if 'LOCK' in ultimo[0] else (0,) if 'COUNT' in ultimo[0] else None
+    return conn
+
+
+@patch('mysql.connector.connect', side_effect=lambda **kw: conexaoFalsa())
+class TestPoolConexoes:
+
+    def test_reutiliza_a_conexao(self, mock_connect):
+        pool = PoolConexoes(tamanho=2, excedente=0)
+        with pool.conexao() as primeira:
+            pass
+        with pool.conexao() as segunda:
+            pass
+        assert primeira is segunda
+        assert mock_connect.call_count == 1 # um único handshake para as duas consultas
+
+    def test_esgotado_apos_timeout(self, mock_connect):
+        pool = PoolConexoes(tamanho=1, excedente=1, timeout=0.1)
+        a, b = pool.emprestar(), pool.emprestar()
+        inicio = time.monotonic()
+        with pytest.raises(PoolEsgotado):
+            pool.emprestar()
+        assert time.monotonic() - inicio >= 0.1
+        assert pool.metricas()['timeouts'] == 1
+        pool.devolver(a)
+        pool.devolver(b)
+        assert pool.metricas()['abertas'] == 1 # a excedente é fechada ao voltar
+        b.close.assert_called_once()
+
+    def test_espera_uma_conexao_ser_devolvida(self, mock_connect):
+        pool = PoolConexoes(tamanho=1, excedente=0, timeout=2)
+        conn = pool.emprestar()
+        threading.Timer(0.05, pool.devolver, args=(conn,)).start()
+        assert pool.emprestar() is conn
+        metricas = pool.metricas()
+        assert metricas['esperas'] == 1 and metricas['maior_espera_ms'] >= 40
+        assert metricas['utilizacao'] == 1.0
+
+    def test_troca_conexao_morta(self, mock_connect):
+        pool = PoolConexoes(tamanho=1, excedente=0, ociosidade=0)
+        with pool.conexao() as morta:
+            morta.ping.side_effect = mysql.connector.errors.InterfaceError('MySQL Connection not available')
+        with pool.conexao() as nova:
+            pass
+        assert nova is not morta
+        assert pool.metricas()['conexoes_trocadas'] == 1
+
+    def test_desfaz_transacao_esquecida(self, mock_connect):
+        pool = PoolConexoes(tamanho=1, excedente=0)
+        with pool.conexao() as conn:
+            conn.in_transaction = True
+        conn.rollback.assert_called_once() # o próximo usuário não herda a transação
+
+    def test_erro_de_conexao_descarta(self, mock_connect):
+        pool = PoolConexoes(tamanho=1, excedente=0)
+        with pytest.raises(mysql.connector.errors.OperationalError):
+            with pool.conexao() as conn:
+                raise mysql.connector.errors.OperationalError('Lost connection to MySQL server')
+        conn.close.assert_called_once()
+        assert pool.metricas()['abertas'] == 0
+
+    def test_varias_threads(self, mock_connect):
+        pool = PoolConexoes(tamanho=3, excedente=0, timeout=5)
+        def usar():
+            for _ in range(20):
+                with pool.conexao():
+                    time.sleep(0.001)
+        threads = [threading.Thread(target=usar) for _ in range(8)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        metricas = pool.metricas()
+        assert mock_connect.call_count <= 3 and metricas['pico_em_uso'] <= 3
+        assert metricas['emprestimos'] == 160 and metricas['em_uso'] == 0
+
+
+@patch('mysql.connector.connect', side_effect=lambda **kw: conexaoFalsa())
+class TestUnidadeDeTrabalho:
+
+    def test_uma_conexao_por_unidade(self, mock_connect):
+        from MVC.model.conexao import iniciarUnidade, encerrarUnidade
+        pool = PoolConexoes(tamanho=2, excedente=0)
+        iniciarUnidade()
+        with pool.conexao() as primeira:
+            pass
+        with pool.conexao() as segunda:
+            assert pool.metricas()['em_uso'] == 1 # continua emprestada entre as consultas
+        encerrarUnidade()
+        assert primeira is segunda
+        assert pool.metricas()['em_uso'] == 0
+
+    def test_liberar_devolve_a_conexao_e_mantem_a_unidade(self, mock_connect):
+        # Como no upload síncrono: consulta ao cache, inferência sem banco, gravação do resultado
+        from MVC.model.conexao import iniciarUnidade, encerrarUnidade, liberarUnidade
+        pool = PoolConexoes(tamanho=2, excedente=0)
+        iniciarUnidade()
+        with pool.conexao():
+            liberarUnidade()  # bloco aberto: a conexão continua presa
+            assert pool.metricas()['em_uso'] == 1
+        liberarUnidade()
+        assert pool.metricas()['em_uso'] == 0  # livre durante a inferência
+        with pool.conexao():
+            pass
+        with pool.conexao():
+            assert pool.metricas()['em_uso'] == 1  # a unidade continua valendo depois
+        encerrarUnidade()
+        assert pool.metricas()['em_uso'] == 0
+
+    def test_threads_nao_dividem_conexao(self, mock_connect):
+        from MVC.model.conexao import iniciarUnidade, encerrarUnidade
+        pool = PoolConexoes(tamanho=4, excedente=0)
+        conexoes, barreira = [], threading.Barrier(4)
+        def requisicao():
+            iniciarUnidade()
+            with pool.conexao() as conn:
+                conexoes.append(conn)
+                barreira.wait() # todas as "requisições" com a conexão emprestada ao mesmo tempo
+            encerrarUnidade()
+        threads = [threading.Thread(target=requisicao) for _ in range(4)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        assert len({id(c) for c in conexoes}) == 4
+        assert pool.metricas()['livres'] == 4
+
+    def test_consulta_seguida_de_transacao_na_mesma_unidade(self, mock_connect):
+        # Como no POST /upload: o login é conferido com um SELECT e depois os jobs entram na fila
+        from MVC.model.conexao import iniciarUnidade, encerrarUnidade
+        from MVC.model.job_dao import JobDAO
+        from MVC.model.usuario_dao import UsuarioDAO
+        conn = conexaoComTransacao()
+        mock_connect.side_effect = lambda **kw: conn
+        pool = PoolConexoes(tamanho=1, excedente=0)
+        usuario_dao, job_dao = UsuarioDAO(), JobDAO()
+        usuario_dao._pool = job_dao._pool = pool
+
+        iniciarUnidade()
+        try:
+            assert usuario_dao.buscar_por_cpf('123') is None
+            assert not conn.in_transaction  # o SELECT não deixa a transação aberta para o próximo DAO
+            ids = job_dao.enfileirar([{'cpf_usuario': '123', 'nome': 'a.jpg', 'caminho_arquivo': 'uploads/a.jpg',
+                                       'latitude': 0.0, 'longitude': 0.0}])
+        finally:
+            encerrarUnidade()
+        assert ids is not None and len(ids) == 1
+        conn.commit.assert_called_once()
+        assert mock_connect.call_count == 1
@@ -0,0 +1,25 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+def _importarConfig(**ambiente):
+    # importa a configuração num processo novo, com as variáveis de ambiente dadas (None remove)
+    env = {k: v for k, v in {**os.environ, **ambiente}.items() if v is not None}
+    return subprocess.run([sys.executable, '-c', 'from MVC import config; print(config.GERAR_MAPA_ERRO)'],
+                          env=env, capture_output=True, text=True)
+
+
+class TestConfig:
+
+    def test_mapa_de_erro_desligado_por_padrao(self):
+        assert _importarConfig(AGRINEURAL_MAPA_ERRO=None).stdout.strip() == 'False'
+
+    @pytest.mark.parametrize('tamanho, valido', [('8', True), ('64', True), ('7', False), ('0', False)])
+    def test_tamanho_minimo_do_mapa(self, tamanho, valido):
+        saida = _importarConfig(AGRINEURAL_TAMANHO_MAPA=tamanho)
+        assert (saida.returncode == 0) is valido
+        if not valido:
+            assert 'AGRINEURAL_TAMANHO_MAPA' in saida.stderr
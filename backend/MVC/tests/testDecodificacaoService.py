@@ -0,0 +1,104 @@
+import io
+import struct
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+from MVC import config
+from MVC.services import DecodificacaoService
+from MVC.services.DecodificacaoService import (_dimensoesJpeg, _dimensoesWebp, decodificarBytes,
+                                               dimensoesBytes, dimensoesImagem, fatorReducao, lerImagem)
+
+
+def _imagem(largura, altura):
+    # gradiente com um pouco de ruído, para que os codecs não gerem arquivos triviais
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 255, largura, dtype=np.float32)
+    img = np.stack([np.tile(x, (altura, 1))] * 3, axis=-1) + rng.normal(0, 8, (altura, largura, 3))
+    return np.clip(img, 0, 255).astype(np.uint8)
+
+
+def _codificar(extensao, largura, altura, parametros=()):
+    ok, dados = cv2.imencode(extensao, _imagem(largura, altura), list(parametros))
+    assert ok
+    return dados.tobytes()
+
+
+class TestDimensoes:
+
+    @pytest.mark.parametrize('parametros', [(), (cv2.IMWRITE_JPEG_PROGRESSIVE, 1)])
+    def test_jpeg_baseline_e_progressivo(self, parametros):
+        dados = _codificar('.jpg', 640, 480, parametros)
+        assert dimensoesBytes(dados) == (640, 480)
+
+    def test_jpeg_com_exif_e_preenchimento_antes_do_sof(self):
+        dados = _codificar('.jpg', 300, 200)
+        exif = b'\xff\xe1' + struct.pack('>H', 2 + 1000) + b'Exif\x00\x00' + bytes(994)
+        # segmento APP1 grande e bytes 0xFF de preenchimento antes do próximo marcador
+        dados = dados[:2] + exif + b'\xff\xff' + dados[2:]
+        assert _dimensoesJpeg(io.BytesIO(dados)) == (300, 200)
+
+    def test_jpeg_truncado(self):
+        dados = _codificar('.jpg', 300, 200)
+        assert _dimensoesJpeg(io.BytesIO(dados[:20])) is None
+
+    def test_png_pelo_cabecalho_ihdr(self, tmp_path):
+        caminho = tmp_path / 'a.png'
+        caminho.write_bytes(_codificar('.png', 123, 45))
+        assert dimensoesImagem(str(caminho)) == (123, 45)
+
+    def test_webp_com_perdas(self):
+        assert dimensoesBytes(_codificar('.webp', 321, 123, (cv2.IMWRITE_WEBP_QUALITY, 80))) == (321, 123)
+
+    def test_webp_sem_perdas(self):
+        assert dimensoesBytes(_codificar('.webp', 321, 123, (cv2.IMWRITE_WEBP_QUALITY, 101))) == (321, 123)
+
+    def test_webp_estendido(self):
+        # VP8X: largura-1 e altura-1 em 24 bits little-endian, a partir do byte 24
+        cabecalho = (b'RIFF' + bytes(4) + b'WEBP' + b'VP8X' + bytes(8)
+                     + (4000 - 1).to_bytes(3, 'little') + (3000 - 1).to_bytes(3, 'little') + bytes(2))
+        assert _dimensoesWebp(cabecalho) == (4000, 3000)
+
+    def test_formato_desconhecido(self, tmp_path):
+        caminho = tmp_path / 'a.bmp'
+        caminho.write_bytes(_codificar('.bmp', 10, 10))
+        assert dimensoesImagem(str(caminho)) is None
+        assert dimensoesImagem(str(tmp_path / 'inexistente.jpg')) is None
+
+
+class TestReducao:
+
+    @pytest.mark.parametrize('largura, altura, fator', [
+        (4000, 3000, 8),  # 3000 / 8 = 375
+        (2048, 1024, 4),  # 1024 / 4 = 256, exatamente o alvo
+        (1000, 600, 2),
+        (500, 300, 1),    # reduzir deixaria um lado abaixo de 256
+        (256, 256, 1),
+    ])
+    def test_fator(self, largura, altura, fator):
+        assert fatorReducao(largura, altura) == fator
+
+    def test_ler_imagem_reduzida(self, tmp_path):
+        caminho = str(tmp_path / 'grande.jpg')
+        cv2.imwrite(caminho, _imagem(2048, 1024))
+
+        with patch.object(config, 'DECODIFICACAO_REDUZIDA', True):
+            reduzida = lerImagem(caminho)
+            da_memoria = decodificarBytes(open(caminho, 'rb').read())
+        with patch.object(config, 'DECODIFICACAO_REDUZIDA', False):
+            inteira = lerImagem(caminho)
+
+        assert reduzida.shape == (256, 512, 3)  # fator 4, nenhum lado abaixo de 256
+        assert inteira.shape == (1024, 2048, 3)
+        np.testing.assert_array_equal(reduzida, da_memoria)  # mesma escolha para arquivo e bytes
+
+    def test_ler_imagem_volta_a_decodificacao_completa(self, tmp_path):
+        caminho = str(tmp_path / 'a.jpg')
+        cv2.imwrite(caminho, _imagem(600, 400))
+        with patch.object(config, 'DECODIFICACAO_REDUZIDA', True), \
+             patch.object(DecodificacaoService, 'dimensoesImagem', return_value=None):  # cabeçalho ilegível
+            assert lerImagem(caminho).shape == (400, 600, 3)
+
+    def test_ler_imagem_inexistente(self, tmp_path):
+        assert lerImagem(str(tmp_path / 'inexistente.jpg')) is None
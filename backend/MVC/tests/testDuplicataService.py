@@ -0,0 +1,70 @@
+import random
+import cv2
+from MVC.services.DuplicataService import IndiceMultiplo, IndiceDuplicatas, dhash, distanciaHamming
+from unittest.mock import MagicMock
+
+
+class TestDuplicataService:
+
+    def test_indice_multiplo_igual_a_busca_exaustiva(self):
+        gerador = random.Random(0)
+        hashes = [gerador.getrandbits(64) for _ in range(2000)]
+        # alguns hashes próximos uns dos outros, como frames consecutivos
+        hashes += [h ^ (1 << gerador.randrange(64)) for h in hashes[:200]]
+        indice = IndiceMultiplo(raio=6)
+        for i, h in enumerate(hashes):
+            indice.inserir(h, i)
+
+        for consulta in hashes[:50] + [gerador.getrandbits(64) for _ in range(50)]:
+            esperado = sorted(i for i, h in enumerate(hashes) if distanciaHamming(consulta, h) <= 6)
+            assert sorted(i for _, i in indice.buscar(consulta)) == esperado
+
+    def test_dhash_de_frames_parecidos(self):
+        img = cv2.imread('MVC/tests/imagens/teste.jpg')
+        altura, largura = img.shape[:2]
+        # mesmo ponto com um pouco mais de luz e um deslocamento pequeno
+        parecida = cv2.convertScaleAbs(img[altura // 50:, largura // 50:], alpha=1.1, beta=5)
+        outra = cv2.rotate(img, cv2.ROTATE_180)
+
+        assert distanciaHamming(dhash(img), dhash(parecida)) <= 6
+        assert distanciaHamming(dhash(img), dhash(outra)) > 6
+
+    def test_indice_filtra_por_distancia(self):
+        imagem_dao = MagicMock()
+        imagem_dao.buscar_dhashes.return_value = [
+            {'id': 1, 'dhash': 0b1011, 'latitude': -15.0, 'longitude': -47.0, 'duplicata_de': None, 'erro': 0.01},
+        ]
+        indice = IndiceDuplicatas(imagem_dao, raio=2, metros=15)
+        indice.atualizar(7)
+
+        assert indice.buscarOriginal(7, 0b1001, -15.00005, -47.0)['id'] == 1  # ~5 m de distância
+        assert indice.buscarOriginal(7, 0b1001, -15.001, -47.0) is None        # ~110 m: outro ponto do voo
+        assert indice.buscarOriginal(8, 0b1011, -15.0, -47.0) is None          # outra fazenda
+
+    def test_busca_entre_registros_ainda_nao_gravados(self):
+        indice = IndiceDuplicatas(MagicMock(), raio=2, metros=15)
+        pendentes = [
+            {'fazenda_id': 7, 'dhash': 0b1111, 'latitude': -15.0, 'longitude': -47.0},
+            {'fazenda_id': 7, 'dhash': 0b1011, 'latitude': -15.0, 'longitude': -47.0},
+            {'fazenda_id': 8, 'dhash': 0b1001, 'latitude': -15.0, 'longitude': -47.0},
+        ]
+
+        assert indice.buscarEntre(pendentes, 7, 0b1001, -15.00005, -47.0) is pendentes[1]  # o hash mais próximo
+        assert indice.buscarEntre(pendentes, 7, 0b110000, -15.0, -47.0) is None
+
+    def test_descarta_a_fazenda_usada_ha_mais_tempo(self):
+        imagem_dao = MagicMock()
+        imagem_dao.buscar_dhashes.side_effect = lambda fazenda_id, apos: [] if apos else [
+            {'id': fazenda_id, 'dhash': 0b1011, 'latitude': -15.0, 'longitude': -47.0, 'duplicata_de': None, 'erro': 0.01},
+        ]
+        indice = IndiceDuplicatas(imagem_dao, raio=2, metros=15, fazendas=2)
+        indice.atualizar(1)
+        indice.atualizar(2)
+        indice.buscarOriginal(1, 0b1011, -15.0, -47.0)  # a 1 passa a ser a mais recente
+        indice.atualizar(3)
+
+        assert indice.buscarOriginal(2, 0b1011, -15.0, -47.0) is None  # fora da memória
+        assert indice.buscarOriginal(1, 0b1011, -15.0, -47.0)['id'] == 1
+        indice.atualizar(2)
+        imagem_dao.buscar_dhashes.assert_called_with(2, 0)  # recarregada do início, não só as novas
+        assert indice.buscarOriginal(2, 0b1011, -15.0, -47.0)['id'] == 2
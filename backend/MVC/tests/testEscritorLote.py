@@ -0,0 +1,140 @@
+from unittest.mock import patch, MagicMock
+
+import mysql.connector
+import pytest
+from MVC.model.conexao import PoolConexoes
+from MVC.model.escritor_lote import EscritorLote
+from MVC.model.imagem_dao import ImagemDAO
+
+
+def _registro(nome, duplicata_de=None):
+    return {'fazenda_id': 1, 'nome_arquivo': nome, 'latitude': -15.0, 'longitude': -47.0, 'anomala': False,
+            'erro': 0.001, 'versao_modelo': 'v1', 'mapa_erro': None, 'regioes': None, 'dhash': 7,
+            'duplicata_de': duplicata_de, 'descarte': None}
+
+
+def _dao(modo_autoinc, ids):
+    # ImagemDAO com um pool próprio sobre uma conexão falsa; `ids` são os lastrowid de cada INSERT em imagens
+    conn = MagicMock()
+    conn.in_transaction = False
+    cursor = conn.cursor.return_value
+    cursor.fetchone.return_value = (modo_autoinc, 1)
+    proximos = iter(ids)
+
+    def executar(sql, parametros=None):
+        if 'INSERT INTO imagens' in sql:
+            cursor.lastrowid = next(proximos)
+    cursor.execute.side_effect = executar
+    cursor.executemany.side_effect = executar
+
+    dao = ImagemDAO()
+    with patch('mysql.connector.connect', return_value=conn):
+        dao._pool = PoolConexoes(tamanho=1, excedente=0)
+        dao._pool.devolver(dao._pool.emprestar())
+    return dao, conn, cursor
+
+
+def _chamadas(metodo, trecho):
+    return [c.args[1] for c in metodo.call_args_list if trecho in c.args[0]]
+
+
+class TestEscritorLote:
+
+    def test_lote_num_insert_com_ids_consecutivos(self):
+        dao, conn, cursor = _dao(modo_autoinc=1, ids=[100])
+        original = _registro('a.jpg')
+        registros = [original, _registro('b.jpg', duplicata_de=original), _registro('c.jpg', duplicata_de=50)]
+
+        assert dao.salvar_lote(registros) == [100, 101, 102]
+        imagens, = _chamadas(cursor.executemany, 'INSERT INTO imagens')
+        assert [linha[5] for linha in imagens] == [None, None, 50]  # a original de b.jpg ainda não tinha id
+        assert _chamadas(cursor.executemany, 'UPDATE imagens') == [[(100, 101)]]
+        assert [linha[6:8] for linha in imagens] == [(False, 0.001)] * 3  # resultado na mesma linha
+        assert not _chamadas(cursor.execute, 'resultados') and not _chamadas(cursor.executemany, 'resultados')
+        conn.commit.assert_called_once()
+
+    def test_modo_intercalado_insere_uma_a_uma(self):
+        dao, conn, cursor = _dao(modo_autoinc=2, ids=[7, 9])
+        original = _registro('a.jpg')
+
+        assert dao.salvar_lote([original, _registro('b.jpg', duplicata_de=original)]) == [7, 9]
+        assert [linha[5] for linha in _chamadas(cursor.execute, 'INSERT INTO imagens')] == [None, 7]
+        assert not _chamadas(cursor.executemany, 'UPDATE imagens')
+        conn.commit.assert_called_once()  # uma transação para o lote inteiro
+
+    def test_falha_desfaz_o_lote(self):
+        dao, conn, cursor = _dao(modo_autoinc=1, ids=[100])
+        cursor.executemany.side_effect = mysql.connector.Error('tabela cheia')
+        registros = [_registro('a.jpg'), _registro('b.jpg')]
+
+        assert dao.salvar_lote(registros) is None
+        conn.rollback.assert_called()
+        assert all('id' not in r for r in registros)
+
+    def test_grava_ao_encher_e_avisa_cada_registro(self):
+        imagem_dao = MagicMock()
+        imagem_dao.salvar_lote.side_effect = lambda registros: list(range(1, len(registros) + 1))
+        escritor = EscritorLote(imagem_dao, tamanho=2, intervalo=60)
+        gravados = []
+
+        for nome in ('a.jpg', 'b.jpg', 'c.jpg'):
+            escritor.adicionar(_registro(nome), gravados.append)
+        assert gravados == [1, 2] and imagem_dao.salvar_lote.call_count == 1
+        assert [r['nome_arquivo'] for r in escritor.pendentes()] == ['c.jpg']
+
+        escritor.descarregarVencido()  # o c.jpg ainda não esperou o intervalo
+        assert len(escritor.pendentes()) == 1
+        escritor.intervalo = 0
+        escritor.descarregarVencido()
+        assert gravados == [1, 2, 1] and not escritor.pendentes()
+
+    def test_falha_avisa_com_none(self):
+        imagem_dao = MagicMock()
+        imagem_dao.salvar_lote.side_effect = mysql.connector.errors.PoolError('esgotado')
+        escritor = EscritorLote(imagem_dao, tamanho=10)
+        gravados = []
+        for nome in ('a.jpg', 'b.jpg'):
+            escritor.adicionar(_registro(nome), gravados.append)
+
+        assert escritor.descarregar() == 0
+        assert gravados == [None, None]
+
+    def test_original_de_lote_que_falhou_entra_como_null(self):
+        dao, conn, cursor = _dao(modo_autoinc=1, ids=[100])
+        original_perdida = _registro('a.jpg')  # ficou sem id: o lote dela falhou
+
+        assert dao.salvar_lote([_registro('b.jpg', duplicata_de=original_perdida)]) == [100]
+        imagens, = _chamadas(cursor.executemany, 'INSERT INTO imagens')
+        assert imagens[0][5] is None
+        assert not _chamadas(cursor.executemany, 'UPDATE imagens')
+
+    def test_erro_de_conexao_propaga(self):
+        dao, conn, cursor = _dao(modo_autoinc=1, ids=[100])
+        cursor.executemany.side_effect = mysql.connector.errors.OperationalError('servidor sumiu')
+        registros = [_registro('a.jpg')]
+
+        with pytest.raises(mysql.connector.errors.OperationalError):
+            dao.salvar_lote(registros)
+        assert 'id' not in registros[0]
+
+    def test_lote_recusado_regrava_um_a_um(self):
+        proximo = iter(range(1, 10))
+
+        def salvar_lote(registros):
+            # O banco recusa qualquer transação que contenha o registro ruim
+            if any(r['nome_arquivo'] == 'ruim.jpg' for r in registros):
+                return None
+            for r in registros:
+                r['id'] = next(proximo)
+            return [r['id'] for r in registros]
+
+        imagem_dao = MagicMock()
+        imagem_dao.salvar_lote.side_effect = salvar_lote
+        escritor = EscritorLote(imagem_dao, tamanho=10)
+        gravados = []
+        for nome in ('a.jpg', 'ruim.jpg', 'c.jpg'):
+            escritor.adicionar(_registro(nome), gravados.append)
+
+        assert escritor.descarregar() == 2
+        assert gravados == [1, None, 2]
+        assert imagem_dao.salvar_lote.call_count == 4  # o lote e depois cada registro
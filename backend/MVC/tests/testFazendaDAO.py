@@ -0,0 +1,63 @@
+from unittest.mock import patch, MagicMock
+
+from MVC.model.conexao import PoolConexoes
+from MVC.model.fazenda_dao import FazendaDAO
+from MVC.model.relatorio_dao import RelatorioDAO
+
+
+def _comPoolFalso(dao):
+    # Troca o pool do DAO por um sobre uma conexão falsa e retorna (conn, cursor)
+    conn = MagicMock()
+    conn.in_transaction = False
+    cursor = conn.cursor.return_value
+    cursor.__enter__.return_value = cursor
+    with patch('mysql.connector.connect', return_value=conn):
+        dao._pool = PoolConexoes(tamanho=1, excedente=0)
+        dao._pool.devolver(dao._pool.emprestar())
+    return conn, cursor
+
+
+class TestReclassificar:
+
+    def test_grava_o_threshold_e_reclassifica_a_versao_ativa(self):
+        dao = FazendaDAO()
+        conn, cursor = _comPoolFalso(dao)
+        cursor.rowcount = 12
+
+        assert dao.reclassificar(3, 0.0042, threshold_fazenda=0.0042, versao_modelo='v2') == 12
+        fazenda, imagens = cursor.execute.call_args_list
+        assert fazenda.args[1] == (0.0042, 3)
+        assert 'versao_modelo <=> %s' in imagens.args[0]  # outras versões ficam como estão
+        assert imagens.args[1] == (0.0042, 3, 'v2')
+        conn.commit.assert_called_once()
+
+    def test_volta_ao_padrao(self):
+        dao = FazendaDAO()
+        conn, cursor = _comPoolFalso(dao)
+
+        dao.reclassificar(3, 0.0036, versao_modelo='v2')
+        assert cursor.execute.call_args_list[0].args[1] == (None, 3)  # NULL: usa o threshold do modelo
+
+
+class TestRelatorioThreshold:
+
+    def test_sem_threshold_conta_a_classificacao_gravada(self):
+        dao = RelatorioDAO()
+        conn, cursor = _comPoolFalso(dao)
+
+        dao.get_farm_image_stats(3)
+        sql, parametros = cursor.execute.call_args.args
+        assert 'i.anomala = TRUE' in sql and 'i.erro >' not in sql
+        assert parametros == (3,)
+
+    def test_threshold_recalcula_pelo_erro(self):
+        dao = RelatorioDAO()
+        conn, cursor = _comPoolFalso(dao)
+        cursor.fetchone.return_value = {'total_images': 10, 'anomalous_images': 4, 'discarded_images': 1,
+                                        'last_inspection': None}
+
+        assert dao.get_farm_image_stats(3, threshold=0.01)['anomalous_images'] == 4
+        sql, parametros = cursor.execute.call_args.args
+        assert 'i.erro > %s' in sql
+        assert parametros == (0.01, 3)
+        conn.commit.assert_not_called()  # simulação: nada é gravado
@@ -0,0 +1,42 @@
+import cv2
+import numpy as np
+from MVC.services import FiltroService
+
+
+# O filtro vem desligado (AGRINEURAL_FILTRO=''); os testes passam as etapas explicitamente
+TODAS = ('exposicao', 'desfoque', 'vegetacao')
+
+
+def _teste():
+    return cv2.resize(cv2.imread('MVC/tests/imagens/teste.jpg'), (256, 256))
+
+
+class TestFiltroService:
+
+    def test_imagem_valida_passa(self):
+        assert FiltroService.filtrar(_teste(), etapas=TODAS) is None
+
+    def test_cada_etapa_descarta(self):
+        escura = (_teste() * 0.05).astype(np.uint8)
+        cinza = cv2.cvtColor(cv2.cvtColor(_teste(), cv2.COLOR_BGR2GRAY), cv2.COLOR_GRAY2BGR)  # sem nenhum verde
+        borrada = cv2.GaussianBlur(_teste(), (15, 15), 5)
+
+        assert FiltroService.filtrar(escura, etapas=TODAS) == "Subexposta"
+        assert FiltroService.filtrar(np.full((256, 256, 3), 255, np.uint8), etapas=TODAS) == "Superexposta"
+        assert FiltroService.filtrar(cinza, etapas=TODAS) == "Sem vegetação"
+        assert FiltroService.filtrar(borrada, etapas=TODAS) == "Desfocada"
+
+    def test_contadores_por_etapa(self):
+        antes = FiltroService.estatisticas()
+        FiltroService.filtrar(_teste(), etapas=TODAS)
+        FiltroService.filtrar(cv2.GaussianBlur(_teste(), (15, 15), 5), etapas=TODAS)
+        depois = FiltroService.estatisticas()
+
+        assert depois['analisadas'] - antes['analisadas'] == 2
+        assert depois['aprovadas'] - antes['aprovadas'] == 1
+        assert depois['desfoque'] - antes['desfoque'] == 1
+
+    def test_etapas_configuraveis(self):
+        borrada = cv2.GaussianBlur(_teste(), (15, 15), 5)
+        assert FiltroService.filtrar(borrada, etapas=('exposicao',)) is None
+        assert FiltroService.filtrar(borrada, etapas=()) is None # filtro desativado
@@ -0,0 +1,38 @@
+from unittest.mock import patch, MagicMock
+from MVC.services.RegistroModelo import registro
+
+
+class TestHealth:
+
+    def test_live(self, client):
+        response = client.get('/health/live')
+        assert response.status_code == 200
+
+    @patch('MVC.controllers.healthController.SaudeDAO')
+    def test_ready_espera_o_modelo(self, mock_saude, client):
+        mock_saude.return_value.metricas.return_value = {}
+        with patch.object(registro, 'aquecido', False):
+            response = client.get('/health/ready')
+        assert response.status_code == 503 # o balanceador não manda tráfego para um worker frio
+        assert response.get_json()['verificacoes']['modelo']['ok'] is False
+
+    @patch('MVC.controllers.healthController.SaudeDAO')
+    def test_ready_sem_banco(self, mock_saude, client):
+        mock_saude.return_value.metricas.return_value = {}
+        mock_saude.return_value.verificar.side_effect = Exception('Can\'t connect to MySQL server')
+        with patch.object(registro, 'aquecido', True), \
+             patch.object(registro, 'obterModelo', return_value=MagicMock(versao='teste')):
+            response = client.get('/health/ready')
+        assert response.status_code == 503
+        assert response.get_json()['verificacoes']['banco']['ok'] is False
+
+    @patch('MVC.controllers.healthController.SaudeDAO')
+    def test_ready(self, mock_saude, client, tmp_path):
+        mock_saude.return_value.metricas.return_value = {'em_uso': 0, 'utilizacao': 0.0}
+        from MVC.app import app
+        with patch.object(registro, 'aquecido', True), \
+             patch.object(registro, 'obterModelo', return_value=MagicMock(versao='teste')), \
+             patch.dict(app.config, {'UPLOAD_FOLDER': str(tmp_path)}):
+            response = client.get('/health/ready')
+        assert response.status_code == 200
+        assert response.get_json()['verificacoes']['modelo']['versao'] == 'teste'
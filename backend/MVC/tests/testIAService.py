@@ -1,3 +1,5 @@
+from unittest.mock import patch
+from MVC import config
 from MVC.services.IAService import ModeloAgrineural # importação da funcionalidade
 
 
@@ -18,3 +20,88 @@ class TestModeloAgrineural:
         resultado = modelo.analisarImagem('MVC/tests/imagens/teste.jpg') 
         assert resultado in ['Normal', 'Anômala'] 
 
+    def test_analisarLote(self):
+        modelo = ModeloAgrineural()
+        caminhos = ['MVC/tests/imagens/teste.jpg'] * 3 + ['MVC/tests/imagens/inexistente.jpg']
+        resultados = modelo.analisarLote(caminhos, tamanhoLote=2)
+        assert len(resultados) == 4 # um resultado por arquivo, na mesma ordem
+        for resultado in resultados[:3]:
+            assert resultado['resultado'] in ['Normal', 'Anômala']
+            assert resultado['erro'] >= 0
+        assert resultados[3]['resultado'] is None # arquivo inválido não derruba o lote
+        assert 'falha' in resultados[3]
+
+    def test_analisarLote_igual_a_analisarImagem(self):
+        modelo = ModeloAgrineural()
+        individual = modelo.analisarImagem('MVC/tests/imagens/teste.jpg')
+        em_lote = modelo.analisarLote(['MVC/tests/imagens/teste.jpg'])[0]['resultado']
+        assert individual == em_lote
+
+    def test_analisarLote_com_mapa(self):
+        modelo = ModeloAgrineural()
+        sem_mapa = modelo.analisarLote(['MVC/tests/imagens/teste.jpg'])[0]
+        com_mapa = modelo.analisarLote(['MVC/tests/imagens/teste.jpg'], comMapa=True)[0]
+        assert abs(sem_mapa['erro'] - com_mapa['erro']) < 1e-6 # o mapa não muda o erro da imagem
+        assert com_mapa['mapa'].shape == (64, 64)
+        assert len(com_mapa['regioes']) == 5
+        assert com_mapa['regioes'][0]['erro'] >= com_mapa['regioes'][-1]['erro'] # ordenadas do maior para o menor
+
+    def test_analisarLadrilhado(self):
+        import cv2
+        modelo = ModeloAgrineural()
+        img = cv2.imread('MVC/tests/imagens/teste.jpg')
+        img = cv2.resize(img, (1000, 600)) # força mais de um ladrilho em cada eixo
+        resultado = modelo.analisarLadrilhado(img, tamanhoLote=4)
+        assert resultado['resultado'] in ['Normal', 'Anômala']
+        assert resultado['grade'].shape == (3, 5) # 600 e 1000 pixels com ladrilhos de 256 e passo 224
+        assert resultado['erro'] == resultado['grade'].max()
+
+    def test_analisarBytes_igual_ao_arquivo(self):
+        modelo = ModeloAgrineural()
+        with open('MVC/tests/imagens/teste.jpg', 'rb') as f:
+            dados = f.read()
+        do_arquivo = modelo.analisarLote(['MVC/tests/imagens/teste.jpg'])[0]
+        da_memoria = modelo.analisarBytes(memoryview(dados))
+        assert abs(do_arquivo['erro'] - da_memoria['erro']) < 1e-6 # mesma decodificação, com ou sem disco
+        assert do_arquivo['resultado'] == da_memoria['resultado']
+
+    def test_analisarLote_descarta_antes_do_modelo(self, tmp_path):
+        import cv2
+        borrada = str(tmp_path / 'borrada.jpg')
+        cv2.imwrite(borrada, cv2.GaussianBlur(cv2.imread('MVC/tests/imagens/teste.jpg'), (51, 51), 20))
+        modelo = ModeloAgrineural()
+        with patch.object(config, 'ETAPAS_FILTRO', ('exposicao', 'desfoque', 'vegetacao')):  # desligado por padrão
+            resultados = modelo.analisarLote(['MVC/tests/imagens/teste.jpg', borrada])
+        assert resultados[0]['resultado'] in ['Normal', 'Anômala']
+        assert resultados[1]['resultado'] == 'Descartada' # barrada pelo filtro prévio
+        assert resultados[1]['descarte'] == 'Desfocada' and resultados[1]['erro'] is None
+
+    def test_analisarLote_paralelo_igual_ao_serial(self):
+        modelo = ModeloAgrineural()
+        caminhos = ['MVC/tests/imagens/teste.jpg'] * 5 + ['MVC/tests/imagens/inexistente.jpg']
+        serial = modelo.analisarLote(caminhos, tamanhoLote=2, threads=1)
+        paralelo = modelo.analisarLote(caminhos, tamanhoLote=2, threads=4)
+        assert [r['resultado'] for r in serial] == [r['resultado'] for r in paralelo]
+        assert [r['erro'] for r in serial] == [r['erro'] for r in paralelo] # mesma ordem e mesmos valores
+
+    def test_inferencias_simultaneas_limitadas(self):
+        import threading, time
+        from unittest.mock import patch
+        ativas, maximo, lock = [0], [0], threading.Lock()
+
+        def prever(lote):
+            with lock:
+                ativas[0] += 1
+                maximo[0] = max(maximo[0], ativas[0])
+            time.sleep(0.05)
+            with lock:
+                ativas[0] -= 1
+            return lote
+
+        modelo = ModeloAgrineural()
+        with patch.object(modelo.backend, 'prever', side_effect=prever), \
+             patch('MVC.services.IAService._semaforoInferencia', threading.BoundedSemaphore(1)):
+            threads = [threading.Thread(target=modelo.reconstruir, args=(None,)) for _ in range(4)]
+            for t in threads: t.start()
+            for t in threads: t.join()
+        assert maximo[0] == 1 # uma inferência por vez no processo
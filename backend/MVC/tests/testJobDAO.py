@@ -0,0 +1,121 @@
+from unittest.mock import patch, MagicMock
+
+import mysql.connector
+import pytest
+from MVC.model.conexao import PoolConexoes
+from MVC.model.job_dao import JobDAO, TRAVA_FILA
+
+
+def _job(nome):
+    return {'cpf_usuario': '12345678900', 'nome': nome, 'caminho_arquivo': f"uploads/{nome}",
+            'latitude': -15.0, 'longitude': -47.0}
+
+
+def _dao(respostas=None):
+    # JobDAO com um pool próprio sobre uma conexão falsa; `respostas` diz o que fetchone devolve
+    # depois de cada comando que contém a chave
+    conn = MagicMock()
+    conn.in_transaction = False
+    cursor = conn.cursor.return_value
+    respostas = {'GET_LOCK': (1,), 'RELEASE_LOCK': (1,), 'COUNT': (0,), **(respostas or {})}
+    ultimo = []
+    proximo_id = iter(range(1, 100))
+
+    def executar(sql, parametros=None):
+        ultimo[:] = [sql]
+        if 'INSERT' in sql:
+            cursor.lastrowid = next(proximo_id)
+    cursor.execute.side_effect = executar
+    cursor.fetchone.side_effect = lambda: next((v for k, v in respostas.items() if k in ultimo[0]), None)
+
+    dao = JobDAO()
+    with patch('mysql.connector.connect', return_value=conn):
+        dao._pool = PoolConexoes(tamanho=1, excedente=0)
+        dao._pool.devolver(dao._pool.emprestar())
+    return dao, conn, cursor
+
+
+def _sqls(cursor):
+    return [c.args[0] for c in cursor.execute.call_args_list]
+
+
+class TestEnfileirar:
+
+    def test_conta_e_insere_sob_a_trava(self):
+        dao, conn, cursor = _dao()
+
+        assert dao.enfileirar([_job('a.jpg'), _job('b.jpg')], limite=10) == [1, 2]
+        sqls = _sqls(cursor)
+        assert 'GET_LOCK' in sqls[0] and cursor.execute.call_args_list[0].args[1][0] == TRAVA_FILA
+        assert 'COUNT' in sqls[1]
+        assert 'RELEASE_LOCK' in sqls[-1]  # só depois do commit: o próximo já conta estes jobs
+        conn.commit.assert_called_once()
+
+    def test_fila_cheia(self):
+        dao, conn, cursor = _dao({'COUNT': (9,)})
+
+        assert dao.enfileirar([_job('a.jpg'), _job('b.jpg')], limite=10) is None
+        assert not [sql for sql in _sqls(cursor) if 'INSERT' in sql]
+        conn.rollback.assert_called()
+        assert 'RELEASE_LOCK' in _sqls(cursor)[-1]
+
+    def test_trava_ocupada_e_tratada_como_fila_cheia(self):
+        dao, conn, cursor = _dao({'GET_LOCK': (0,)})
+
+        assert dao.enfileirar([_job('a.jpg')], limite=10) is None
+        assert not [sql for sql in _sqls(cursor) if 'COUNT' in sql or 'RELEASE_LOCK' in sql]
+
+    def test_erro_desfaz_e_libera_a_trava(self):
+        dao, conn, cursor = _dao()
+        executar = cursor.execute.side_effect
+
+        def falhar_no_insert(sql, parametros=None):
+            executar(sql, parametros)
+            if 'INSERT' in sql:
+                raise mysql.connector.errors.IntegrityError('fazenda inexistente')
+        cursor.execute.side_effect = falhar_no_insert
+
+        with pytest.raises(mysql.connector.errors.IntegrityError):
+            dao.enfileirar([_job('a.jpg')], limite=10)
+        conn.rollback.assert_called()
+        assert 'RELEASE_LOCK' in _sqls(cursor)[-1]
+
+
+class TestConsumo:
+
+    def test_reservar_pula_linhas_travadas(self):
+        dao, conn, cursor = _dao()
+        cursor.fetchall.return_value = [{'id': 3}, {'id': 4}]
+
+        assert dao.reservar('worker-1', 2) == [{'id': 3}, {'id': 4}]
+        selecao, marcacao = cursor.execute.call_args_list
+        assert 'FOR UPDATE SKIP LOCKED' in selecao.args[0] and selecao.args[1] == (2,)
+        assert "status = 'processando'" in marcacao.args[0] and marcacao.args[1] == ('worker-1', 3, 4)
+        conn.commit.assert_called_once()
+
+    def test_reservar_fila_vazia(self):
+        dao, conn, cursor = _dao()
+        cursor.fetchall.return_value = []
+
+        assert dao.reservar('worker-1', 2) == []
+        assert cursor.execute.call_count == 1  # nada a marcar
+
+    @pytest.mark.parametrize('status, desistiu', [('pendente', False), ('erro', True)])
+    def test_falhar_tenta_de_novo_ate_o_limite(self, status, desistiu):
+        dao, conn, cursor = _dao({'SELECT status': (status,)})
+
+        assert dao.falhar(7, 'x' * 2000) is desistiu
+        atualizacao = cursor.execute.call_args_list[0]
+        assert "IF(tentativas >= max_tentativas, 'erro', 'pendente')" in atualizacao.args[0]
+        assert atualizacao.args[1] == ('x' * 1000, 7)  # mensagem cortada no tamanho da coluna
+        conn.commit.assert_called_once()
+
+    def test_recuperar_expirados(self):
+        dao, conn, cursor = _dao()
+        cursor.rowcount = 2
+
+        assert dao.recuperar_expirados(600) == 2
+        sql, parametros = cursor.execute.call_args.args
+        assert "status = 'processando'" in sql and 'INTERVAL %s SECOND' in sql
+        assert parametros == (600,)
+        conn.commit.assert_called_once()
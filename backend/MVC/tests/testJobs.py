@@ -0,0 +1,32 @@
+from unittest.mock import patch
+
+
+def _job(cpf_usuario):
+    return {'id': 5, 'status': 'concluido', 'cpf_usuario': cpf_usuario, 'nome': 'a.jpg', 'fazenda_id': None,
+            'tentativas': 1, 'resultado': 'Normal', 'imagem_id': 10, 'mensagem_erro': None}
+
+
+class TestJobs:
+
+    def test_sem_login(self, client):
+        assert client.get('/jobs/5').status_code == 401
+
+    @patch('MVC.controllers.jobsController.JobDAO')
+    def test_job_do_usuario(self, mock_job_dao, client):
+        with client.session_transaction() as sess:
+            sess['cpf'] = '12345678900'
+        mock_job_dao.return_value.buscar.return_value = _job('12345678900')
+
+        response = client.get('/jobs/5')
+        assert response.status_code == 200
+        assert response.get_json()['job']['estado'] == 'concluido'
+
+    @patch('MVC.controllers.jobsController.JobDAO')
+    def test_job_de_outro_usuario(self, mock_job_dao, client):
+        with client.session_transaction() as sess:
+            sess['cpf'] = '12345678900'
+        mock_job_dao.return_value.buscar.return_value = _job('99999999999')
+
+        response = client.get('/jobs/5')
+        assert response.status_code == 404  # não revela que o job existe
+        assert 'job' not in response.get_json()
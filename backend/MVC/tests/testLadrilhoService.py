@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+from MVC.services.LadrilhoService import gradeLadrilhos, posicoes
+
+
+class TestLadrilhoService:
+
+    def test_grade_cobre_a_imagem(self):
+        img = np.zeros((600, 1000, 3), dtype=np.uint8)
+        janelas, ys, xs = gradeLadrilhos(img, 256, 32)
+        assert list(ys) == [0, 224, 344]  # o último encosta na borda
+        assert list(xs) == [0, 224, 448, 672, 744]
+        assert janelas.shape[-2:] == (256, 256)
+
+    def test_sem_sobreposicao(self):
+        assert list(posicoes(512, 256, 256)) == [0, 256]
+
+    @pytest.mark.parametrize('sobreposicao', [256, 300, -1])
+    def test_sobreposicao_invalida(self, sobreposicao):
+        with pytest.raises(ValueError):
+            gradeLadrilhos(np.zeros((600, 1000, 3), dtype=np.uint8), 256, sobreposicao)
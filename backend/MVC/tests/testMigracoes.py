@@ -0,0 +1,45 @@
+from unittest.mock import patch, MagicMock
+from MVC.model.migracoes import comandos, listarMigracoes, migrar
+
+
+def bancoFalso(ja_aplicadas):
+    # Conexão falsa que registra os comandos executados
+    conn = MagicMock()
+    conn.in_transaction = False
+    cursor = conn.cursor.return_value
+    cursor.__enter__.return_value = cursor
+    cursor.fetchall.return_value = [(v,) for v in ja_aplicadas]
+    return conn, cursor
+
+
+class TestMigracoes:
+
+    def test_comandos(self):
+        sql = "USE agrineural;\n-- comentário; com ponto e vírgula\nALTER TABLE a ADD b INT; -- fim\nCREATE INDEX i ON a (b);\n"
+        assert comandos(sql) == ["ALTER TABLE a ADD b INT", "CREATE INDEX i ON a (b)"]
+
+    def test_lista_em_ordem(self, tmp_path):
+        for nome in ('0002_b.sql', '0001_a.sql', 'leia-me.txt'):
+            (tmp_path / nome).write_text('SELECT 1;')
+        assert [v for v, _ in listarMigracoes(str(tmp_path))] == ['0001_a', '0002_b']
+
+    def test_aplica_so_as_pendentes(self, tmp_path):
+        (tmp_path / '0001_a.sql').write_text('CREATE TABLE a (x INT);')
+        (tmp_path / '0002_b.sql').write_text('CREATE INDEX i ON a (x);')
+        (tmp_path / '0003_c.sql').write_text('ALTER TABLE a ADD y INT;')
+        conn, cursor = bancoFalso(['0001_a'])
+        with patch('mysql.connector.connect', return_value=conn):
+            novas = migrar(ate='0002', pasta=str(tmp_path), database='teste_migracoes')
+        executados = [c.args[0] for c in cursor.execute.call_args_list]
+        assert novas == ['0002_b'] # 0001 já aplicada, 0003 depois do limite
+        assert 'CREATE INDEX i ON a (x)' in executados
+        assert 'CREATE TABLE a (x INT)' not in executados
+
+    def test_marcar_sem_executar(self, tmp_path):
+        (tmp_path / '0001_a.sql').write_text('CREATE TABLE a (x INT);')
+        conn, cursor = bancoFalso([])
+        with patch('mysql.connector.connect', return_value=conn):
+            novas = migrar(marcar_ate='0001', pasta=str(tmp_path), database='teste_marcar')
+        executados = [c.args[0] for c in cursor.execute.call_args_list]
+        assert novas == ['0001_a']
+        assert 'CREATE TABLE a (x INT)' not in executados # só registrada em schema_migrations
@@ -0,0 +1,75 @@
+import tracemalloc
+
+import cv2
+import numpy as np
+from MVC.services.PreprocessamentoService import Preprocessador, prepararEmParalelo
+
+
+def imagens(quantidade, altura=600, largura=800):
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, (altura, largura, 3), dtype=np.uint8) for _ in range(quantidade)]
+
+
+class TestPreprocessador:
+
+    def test_igual_ao_preprocessamento_antigo(self):
+        pre = Preprocessador(4)
+        for img in imagens(3):
+            pre.adicionar(pre.redimensionar(img))
+        esperado = np.stack([
+            cv2.cvtColor(cv2.resize(img, (256, 256)), cv2.COLOR_BGR2RGB).astype("float32") / 255.0
+            for img in imagens(3)
+        ])
+        assert pre.preenchido().shape == (3, 256, 256, 3)
+        assert np.array_equal(pre.preenchido(), esperado) # mesmos valores, bit a bit
+
+    def test_lote_cheio(self):
+        pre = Preprocessador(1)
+        pre.adicionar(pre.redimensionar(imagens(1)[0]))
+        try:
+            pre.adicionar(pre.redimensionar(imagens(1)[0]))
+            assert False, "deveria recusar a imagem"
+        except ValueError:
+            pass
+
+    def test_reutiliza_o_buffer_sem_alocar(self):
+        pre = Preprocessador(8)
+        lote = imagens(8)
+        buffer = pre.lote
+        for img in lote:  # primeiro lote: eventuais alocações únicas do OpenCV/NumPy
+            pre.adicionar(pre.redimensionar(img))
+
+        tracemalloc.start()
+        for _ in range(3):
+            pre.limpar()
+            for img in lote:
+                pre.adicionar(pre.redimensionar(img))
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert pre.lote is buffer
+        # uma única imagem float32 256x256 já teria 768 KB; sobra só o buffer interno dos ufuncs
+        assert pico < 256 * 1024
+
+
+class TestPrepararEmParalelo:
+
+    def test_mantem_a_ordem(self):
+        import random, time
+        def preparar(i):
+            time.sleep(random.random() / 100)
+            return i * 2
+        assert list(prepararEmParalelo(preparar, range(50), threads=4, limite=8)) == [i * 2 for i in range(50)]
+
+    def test_limita_o_que_fica_a_frente(self):
+        import threading
+        preparados, lock = [0], threading.Lock()
+        def preparar(i):
+            with lock:
+                preparados[0] += 1
+            return i
+        maximo = 0
+        for consumidos, _ in enumerate(prepararEmParalelo(preparar, range(100), threads=4, limite=5), 1):
+            with lock:
+                maximo = max(maximo, preparados[0] - consumidos)
+        assert maximo <= 5 # o consumidor lento segura as threads (contrapressão)
@@ -0,0 +1,85 @@
+from unittest.mock import patch, MagicMock
+from MVC.services.RegistroModelo import registro
+
+
+def _logar(client, cpf='98765432100'):
+    with client.session_transaction() as sess:
+        sess['cpf'] = cpf
+
+
+class TestReclassificar:
+
+    @patch('MVC.controllers.produtorController.FazendaDAO')
+    def test_sem_threshold_volta_ao_da_versao_ativa(self, mock_fazenda_dao, client):
+        _logar(client)
+        dao = mock_fazenda_dao.return_value
+        dao.buscar_fazenda_por_id.return_value = {'id': 1, 'cpf_produtor': '98765432100'}
+        dao.reclassificar.return_value = 3
+
+        with patch.object(registro, 'obterModelo', return_value=MagicMock(versao='v2', threshold=0.005)):
+            response = client.post('/area-produtor/fazendas/1/reclassificar', json={})
+
+        assert response.status_code == 200
+        assert response.get_json()['threshold'] == 0.005  # o do manifesto, não o padrão global
+        dao.reclassificar.assert_called_once_with(1, 0.005, threshold_fazenda=None, versao_modelo='v2')
+
+    @patch('MVC.controllers.produtorController.FazendaDAO')
+    def test_threshold_da_fazenda(self, mock_fazenda_dao, client):
+        _logar(client)
+        dao = mock_fazenda_dao.return_value
+        dao.buscar_fazenda_por_id.return_value = {'id': 1, 'cpf_produtor': '98765432100'}
+        dao.reclassificar.return_value = 0
+
+        with patch.object(registro, 'obterModelo', return_value=MagicMock(versao='v2', threshold=0.005)):
+            response = client.post('/area-produtor/fazendas/1/reclassificar', json={'threshold': 0.01})
+
+        assert response.status_code == 200
+        dao.reclassificar.assert_called_once_with(1, 0.01, threshold_fazenda=0.01, versao_modelo='v2')
+
+    @patch('MVC.controllers.produtorController.FazendaDAO')
+    def test_fazenda_de_outro_produtor(self, mock_fazenda_dao, client):
+        _logar(client)
+        dao = mock_fazenda_dao.return_value
+        dao.buscar_fazenda_por_id.return_value = {'id': 1, 'cpf_produtor': '11111111111'}
+
+        response = client.post('/area-produtor/fazendas/1/reclassificar', json={'threshold': 0.01})
+        assert response.status_code == 403
+        dao.reclassificar.assert_not_called()
+
+
+class TestRelatorio:
+
+    def _fazenda(self):
+        return {'id': 1, 'cpf_produtor': '98765432100', 'nome': 'Fazenda', 'ccir': '123', 'latitude': -15.0,
+                'longitude': -47.0, 'ext_territorial': 100, 'producerName': 'Produtor', 'producerCpf': '98765432100'}
+
+    @patch('MVC.controllers.produtorController.RelatorioDAO')
+    @patch('MVC.controllers.produtorController.FazendaDAO')
+    def test_threshold_simulado(self, mock_fazenda_dao, mock_relatorio_dao, client):
+        _logar(client)
+        mock_fazenda_dao.return_value.buscar_fazenda_por_id.return_value = self._fazenda()
+        relatorio = mock_relatorio_dao.return_value
+        relatorio.get_farm_image_stats.return_value = {'total_images': 10, 'anomalous_images': 8,
+                                                       'discarded_images': 2, 'last_inspection': None}
+
+        response = client.get('/area-produtor/relatorio/1?threshold=0.002')
+
+        assert response.status_code == 200
+        relatorio.get_farm_image_stats.assert_called_once_with(1, threshold=0.002)
+        farm = response.get_json()['farm']
+        assert (farm['anomalousImages'], farm['normalImages'], farm['status']) == (8, 2, 'critical')
+
+    @patch('MVC.controllers.produtorController.RelatorioDAO')
+    @patch('MVC.controllers.produtorController.FazendaDAO')
+    def test_sem_threshold_usa_a_classificacao_gravada(self, mock_fazenda_dao, mock_relatorio_dao, client):
+        _logar(client)
+        mock_fazenda_dao.return_value.buscar_fazenda_por_id.return_value = self._fazenda()
+        relatorio = mock_relatorio_dao.return_value
+        relatorio.get_farm_image_stats.return_value = {'total_images': 10, 'anomalous_images': 1,
+                                                       'discarded_images': 0, 'last_inspection': None}
+
+        response = client.get('/area-produtor/relatorio/1')
+
+        assert response.status_code == 200
+        relatorio.get_farm_image_stats.assert_called_once_with(1, threshold=None)
+        assert response.get_json()['farm']['status'] == 'healthy'
@@ -0,0 +1,73 @@
+import threading
+from unittest.mock import patch, MagicMock
+from MVC import config
+from MVC.services.RegistroModelo import RegistroModelo
+
+
+@patch.object(config, 'INFERENCIA_COMPILADA', False) # o modelo falso não pode ser rastreado pelo tf.function
+class TestRegistroModelo:
+
+    @patch('tensorflow.keras.models.load_model')
+    def test_carrega_apenas_uma_vez(self, mock_load_model):
+        registro = RegistroModelo()
+
+        primeiro = registro.obterModelo()
+        segundo = registro.obterModelo()
+
+        assert primeiro is segundo # mesma instância nas duas chamadas
+        assert mock_load_model.call_count == 1 # o checkpoint não foi lido de novo
+        assert registro.cargas == 1
+
+    @patch('tensorflow.keras.models.load_model')
+    def test_carrega_uma_vez_com_varias_threads(self, mock_load_model):
+        registro = RegistroModelo()
+        modelos = []
+
+        threads = [threading.Thread(target=lambda: modelos.append(registro.obterModelo())) for _ in range(16)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+
+        assert len({id(m) for m in modelos}) == 1 # todas as threads receberam o mesmo modelo
+        assert mock_load_model.call_count == 1
+
+    @patch('tensorflow.keras.models.load_model')
+    def test_aquecimento_registra_tempo(self, mock_load_model):
+        mock_load_model.return_value = MagicMock()
+        registro = RegistroModelo()
+
+        registro.aquecer(tamanhosLote=(1, 4))
+
+        assert registro.aquecido
+        assert registro.tempoCarga is not None
+        assert registro.tempoAquecimento is not None
+        assert mock_load_model.return_value.predict.call_count == 2 # um predict por tamanho de lote
+        assert mock_load_model.call_count == 1
+
+    @patch('tensorflow.keras.models.load_model')
+    def test_troca_de_versao_pelo_manifesto(self, mock_load_model, tmp_path):
+        import json
+        from MVC.services.RegistroModelo import ativarVersao
+        (tmp_path / 'manifest.json').write_text(json.dumps({
+            'atual': 'v1',
+            'versoes': {'v1': {'arquivo': 'v1.h5', 'threshold': 0.1}, 'v2': {'arquivo': 'v2.h5', 'threshold': 0.2}}
+        }))
+        registro = RegistroModelo(pastaModelos=str(tmp_path))
+
+        em_andamento = registro.obterModelo()
+        assert registro.recarregar() is False # manifesto sem mudança: nada é carregado
+
+        ativarVersao('v2', pasta=str(tmp_path))
+        assert registro.recarregar() is True
+        novo = registro.obterModelo()
+
+        assert novo.versao == 'v2' and novo.threshold == 0.2 # threshold vem da versão no manifesto
+        assert em_andamento.versao == 'v1' # quem já tinha o modelo termina com ele
+        assert mock_load_model.call_args[0][0] == str(tmp_path / 'v2.h5')
+
+    def test_versoes_registradas(self, tmp_path):
+        import json
+        (tmp_path / 'manifest.json').write_text(json.dumps({
+            'atual': 'v2', 'versoes': {'v1': {'arquivo': 'v1.h5'}, 'v2': {'arquivo': 'v2.h5'}}
+        }))
+        assert RegistroModelo(pastaModelos=str(tmp_path)).versoesRegistradas() == ['v1', 'v2']
+        assert RegistroModelo(caminhoModelo='fixo.h5').versoesRegistradas() == []
@@ -0,0 +1,26 @@
+from unittest.mock import patch, MagicMock
+
+import mysql.connector
+import pytest
+from MVC.model.saude_dao import SaudeDAO
+
+
+class TestSaudeDAO:
+
+    def test_conexao_propria_com_timeout_curto(self):
+        dao = SaudeDAO()
+        conn = MagicMock()
+        with patch('mysql.connector.connect', return_value=conn) as connect, \
+                patch.object(dao._pool, 'emprestar') as emprestar:
+            dao.verificar()
+
+        assert connect.call_args.kwargs['connection_timeout'] == 2
+        conn.cursor.return_value.__enter__.return_value.execute.assert_called_once_with("SELECT 1")
+        conn.close.assert_called_once()
+        emprestar.assert_not_called()  # não ocupa vaga do pool das requisições
+
+    def test_banco_fora_do_ar(self):
+        erro = mysql.connector.errors.InterfaceError("Can't connect to MySQL server")
+        with patch('mysql.connector.connect', side_effect=erro):
+            with pytest.raises(mysql.connector.errors.InterfaceError):
+                SaudeDAO().verificar()
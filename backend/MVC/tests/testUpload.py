@@ -66,4 +66,113 @@ class TestOperadorController:
         response = client.post('/upload', data=data, content_type='multipart/form-data')
         
         assert response.status_code == 400 # verifica se retorna o erro especificado
-        assert b'Latitude ou longitude inv\xc3\xa1lida para imagem_teste.jpg' in response.data # verifica se retornou a mensagem de erro
\ No newline at end of file
+        assert b'Latitude ou longitude inv\xc3\xa1lida para imagem_teste.jpg' in response.data # verifica se retornou a mensagem de erro
+
+    @patch('MVC.controllers.uploadController.JobDAO')
+    @patch('MVC.model.usuario_dao.UsuarioDAO.buscar_por_cpf')
+    def test_upload_fila_cheia(self, mock_buscar_por_cpf, mock_job_dao, client, tmp_path):
+        with client.session_transaction() as sess:
+            sess['cpf'] = '12345678900'
+        mock_buscar_por_cpf.return_value = Operador(cpf='12345678900', senha='senha123', nome='Operador Teste')
+        mock_job_dao.return_value.enfileirar.return_value = None  # limite de jobs em andamento
+
+        with patch('MVC.controllers.uploadController.UPLOAD_FOLDER', str(tmp_path / 'uploads')), \
+             patch('MVC.controllers.uploadController.STATUS_FOLDER', str(tmp_path / 'status')):
+            response = client.post('/upload', data={'imagens': [(BytesIO(b'jpg'), 'a.jpg')],
+                                                    'latitude_0': '-15.0', 'longitude_0': '-47.0'},
+                                   content_type='multipart/form-data')
+
+        assert response.status_code == 429
+        assert not list((tmp_path / 'uploads').rglob('*a.jpg'))  # a imagem não fica órfã
+
+
+    @patch('MVC.controllers.operadorController.JobDAO')
+    def test_mesmo_nome_nao_sobrescreve_a_fila(self, mock_job_dao, client, tmp_path):
+        with client.session_transaction() as sess:
+            sess['cpf'] = '12345678900'
+        mock_job_dao.return_value.enfileirar.return_value = [1]
+
+        with patch('MVC.controllers.operadorController.UPLOAD_FOLDER', str(tmp_path)):
+            for conteudo in (b'primeiro', b'segundo'):  # o segundo chega antes de o worker ler o primeiro
+                response = client.post('/area-operador/upload/imagem', data={
+                    'imagem': (BytesIO(conteudo), 'frame.jpg'), 'fazenda_id': '1',
+                    'latitude': '-15.0', 'longitude': '-47.0'
+                }, content_type='multipart/form-data')
+                assert response.status_code == 202
+
+        jobs = [c.args[0][0] for c in mock_job_dao.return_value.enfileirar.call_args_list]
+        assert [job['nome'] for job in jobs] == ['frame.jpg', 'frame.jpg']
+        caminhos = [job['caminho_arquivo'] for job in jobs]
+        assert caminhos[0] != caminhos[1]
+        assert [open(c, 'rb').read() for c in caminhos] == [b'primeiro', b'segundo']
+
+
+class TestUploadSincrono:
+
+    def _enviar(self, client):
+        with client.session_transaction() as sess:
+            sess['cpf'] = '12345678900'
+        return client.post('/area-operador/upload/imagem', data={
+            'imagem': (BytesIO(b'bytes do jpg'), 'frame.jpg'), 'fazenda_id': '1',
+            'latitude': '-15.0', 'longitude': '-47.0', 'sincrono': '1'
+        }, content_type='multipart/form-data')
+
+    @patch('MVC.controllers.operadorController.registrarResultado', return_value=('Normal', 10))
+    @patch('MVC.controllers.operadorController.FazendaDAO')
+    @patch('MVC.controllers.operadorController.dhashBytes', return_value=None)
+    @patch('MVC.controllers.operadorController.CacheService')
+    @patch('MVC.controllers.operadorController.CacheResultadoDAO')
+    @patch('MVC.controllers.operadorController.obterModelo')
+    def test_responde_com_o_resultado(self, mock_modelo, mock_cache_dao, mock_cache, mock_dhash,
+                                      mock_fazenda_dao, mock_registrar, client, tmp_path):
+        mock_cache.buscar.return_value = {}
+        mock_modelo.return_value.analisarBytes.return_value = {'erro': 0.001, 'resultado': 'Normal'}
+        mock_fazenda_dao.return_value.buscar_thresholds.return_value = {}
+
+        with patch('MVC.controllers.operadorController.UPLOAD_FOLDER', str(tmp_path)):
+            response = self._enviar(client)
+
+        assert response.status_code == 201
+        assert response.get_json()['data']['imagemId'] == 10
+        gravado, = tmp_path.glob('*_frame.jpg')  # nome único no disco
+        assert gravado.read_bytes() == b'bytes do jpg'  # gravado em paralelo à análise
+        mock_cache_dao.return_value.salvar.assert_called_once()
+
+    @patch('MVC.controllers.operadorController.registrarResultado', return_value=('Normal', 10))
+    @patch('MVC.controllers.operadorController.FazendaDAO')
+    @patch('MVC.controllers.operadorController.dhashBytes', return_value=None)
+    @patch('MVC.controllers.operadorController.CacheService')
+    @patch('MVC.controllers.operadorController.CacheResultadoDAO')
+    @patch('MVC.controllers.operadorController.obterModelo')
+    def test_conexao_livre_durante_a_inferencia(self, mock_modelo, mock_cache_dao, mock_cache, mock_dhash,
+                                                mock_fazenda_dao, mock_registrar, client, tmp_path):
+        ordem = []
+        mock_cache.buscar.side_effect = lambda *a: ordem.append('buscar_cache') or {}
+        mock_modelo.return_value.analisarBytes.side_effect = \
+            lambda *a, **kw: ordem.append('inferencia') or {'erro': 0.001, 'resultado': 'Normal'}
+        mock_fazenda_dao.return_value.buscar_thresholds.return_value = {}
+        mock_registrar.side_effect = lambda *a, **kw: ordem.append('gravar') or ('Normal', 10)
+
+        with patch('MVC.controllers.operadorController.UPLOAD_FOLDER', str(tmp_path)), \
+                patch('MVC.controllers.operadorController.conexao.liberarUnidade',
+                      side_effect=lambda: ordem.append('liberar')):
+            assert self._enviar(client).status_code == 201
+
+        # a conexão da consulta ao cache volta ao pool antes da inferência; a gravação empresta outra
+        assert ordem == ['buscar_cache', 'liberar', 'inferencia', 'gravar']
+
+    @patch('MVC.controllers.operadorController.CacheService')
+    @patch('MVC.controllers.operadorController.CacheResultadoDAO')
+    @patch('MVC.controllers.operadorController.obterModelo')
+    def test_erro_na_analise(self, mock_modelo, mock_cache_dao, mock_cache, client, tmp_path, capsys):
+        mock_cache.buscar.return_value = {}
+        mock_modelo.return_value.analisarBytes.side_effect = ValueError('imagem corrompida')
+
+        with patch('MVC.controllers.operadorController.UPLOAD_FOLDER', str(tmp_path)):
+            response = self._enviar(client)
+
+        assert response.status_code == 500
+        # o modelo recebeu os bytes reais do multipart, lidos do SpooledTemporaryFile do werkzeug
+        assert mock_modelo.return_value.analisarBytes.call_args.args[0] == b'bytes do jpg'
+        assert 'imagem corrompida' in capsys.readouterr().out  # o erro real chega ao log
+        assert not list(tmp_path.glob('*_frame.jpg'))  # e a imagem não fica no disco
@@ -0,0 +1,64 @@
+# Latência e memória de cada backend de inferência, cada um num processo novo.
+# Uso, a partir de backend/ (o backend tflite precisa do modelo exportado antes):
+#   python -m MVC.services.BackendInferencia exportar
+#   python -m benchmarks.bench_backends --backends keras tflite --lotes 1 8 32
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+
+def medirNoProcessoFilho(backend, lotes, repeticoes):
+    inicio = time.perf_counter()
+    from MVC.services.IAService import ModeloAgrineural
+    modelo = ModeloAgrineural(backend=backend)
+    carga = time.perf_counter() - inicio
+
+    latencias = {}
+    for tamanho in lotes:
+        entrada = np.random.default_rng(0).random((tamanho, 256, 256, 3), dtype=np.float32)
+        modelo.reconstruir(entrada)  # aquecimento
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            modelo.reconstruir(entrada)
+            tempos.append(time.perf_counter() - inicio)
+        latencias[tamanho] = float(np.median(tempos)) * 1000 / tamanho
+
+    print(json.dumps({
+        'carga_s': carga,
+        'ms_por_imagem': latencias,
+        'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--backends', nargs='+', default=['keras', 'tflite'])
+    parser.add_argument('--lotes', nargs='+', type=int, default=[1, 8, 32])
+    parser.add_argument('--repeticoes', type=int, default=10)
+    parser.add_argument('--interno', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.interno:
+        medirNoProcessoFilho(args.interno, args.lotes, args.repeticoes)
+        sys.exit(0)
+
+    print(f"{'backend':<16} {'carga (s)':>9} {'pico RSS (MB)':>13} " + ' '.join(f"{'ms/img lote ' + str(l):>14}" for l in args.lotes))
+    for backend in args.backends:
+        saida = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_backends', '--interno', backend,
+             '--lotes', *map(str, args.lotes), '--repeticoes', str(args.repeticoes)],
+            capture_output=True, text=True
+        )
+        if saida.returncode != 0:
+            print(f"{backend:<16} falhou: {saida.stderr.strip().splitlines()[-1]}")
+            continue
+        medida = json.loads(saida.stdout.strip().splitlines()[-1])
+        print(f"{backend:<16} {medida['carga_s']:>9.2f} {medida['rss_mb']:>13.1f} "
+              + ' '.join(f"{medida['ms_por_imagem'][str(l)]:>14.2f}" for l in args.lotes))
@@ -0,0 +1,92 @@
+# Compara a leitura completa (cv2.imread + resize) com a leitura reduzida
+# (IMREAD_REDUCED_*) em latência, pico de memória (RSS) e diferença no erro do modelo.
+# Uso, a partir de backend/:
+#   python -m benchmarks.bench_decodificacao [pastas...] [--modelo]
+
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from MVC.services.DecodificacaoService import dimensoesImagem, fatorReducao, FLAGS_REDUCAO
+
+EXTENSOES = ('.jpg', '.jpeg', '.png', '.webp')
+
+
+def decodificar(caminho, modo):
+    if modo == 'completa':
+        img = cv2.imread(caminho)
+    else:
+        fator = fatorReducao(*dimensoesImagem(caminho))
+        img = cv2.imread(caminho, FLAGS_REDUCAO[fator]) if fator > 1 else cv2.imread(caminho)
+    img = cv2.resize(img, (256, 256))
+    return cv2.cvtColor(img, cv2.COLOR_BGR2RGB).astype("float32") / 255.0
+
+
+def medirNoProcessoFilho(caminho, modo, repeticoes):
+    # Executado num processo novo para que o pico de RSS seja só desta decodificação
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        decodificar(caminho, modo)
+        tempos.append(time.perf_counter() - inicio)
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({'ms': min(tempos) * 1000, 'rss_kb': pico}))
+
+
+def medir(caminho, modo, repeticoes):
+    saida = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_decodificacao', '--interno', modo, caminho,
+         '--repeticoes', str(repeticoes)],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('pastas', nargs='*', default=['uploads', 'MVC/uploads', 'MVC/tests/imagens'])
+    parser.add_argument('--modelo', action='store_true', help='calcula a diferença no erro de reconstrução')
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--interno', nargs=2, metavar=('MODO', 'CAMINHO'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.interno:
+        medirNoProcessoFilho(args.interno[1], args.interno[0], args.repeticoes)
+        sys.exit(0)
+
+    caminhos = sorted(
+        p for pasta in args.pastas for p in glob.glob(os.path.join(pasta, '**', '*'), recursive=True)
+        if p.lower().endswith(EXTENSOES)
+    )
+
+    modelo = None
+    if args.modelo:
+        from MVC.services.RegistroModelo import registro
+        modelo = registro.aquecer()
+
+    print(f"{'arquivo':<45} {'dimensões':>11} {'fator':>5} {'ms compl.':>9} {'ms red.':>8} "
+          f"{'RSS compl. MB':>13} {'RSS red. MB':>11} {'Δ erro':>9}")
+    for caminho in caminhos:
+        dimensoes = dimensoesImagem(caminho)
+        if not dimensoes:
+            continue
+        completa = medir(caminho, 'completa', args.repeticoes)
+        reduzida = medir(caminho, 'reduzida', args.repeticoes)
+
+        drift = float('nan')
+        if modelo is not None:
+            erros = [r['erro'] for r in modelo.analisarArrays(
+                np.stack([decodificar(caminho, 'completa'), decodificar(caminho, 'reduzida')]))]
+            drift = erros[1] - erros[0]
+
+        print(f"{caminho[-45:]:<45} {'%dx%d' % dimensoes:>11} {fatorReducao(*dimensoes):>5} "
+              f"{completa['ms']:>9.1f} {reduzida['ms']:>8.1f} "
+              f"{completa['rss_kb'] / 1024:>13.1f} {reduzida['rss_kb'] / 1024:>11.1f} {drift:>9.2e}")
@@ -0,0 +1,142 @@
+# Latência de FazendaDAO.buscar_imagens_e_resultados_por_fazenda (mapa de calor, com e sem duplicatas
+# agrupadas) e do relatório com os resultados na tabela `resultados` (JOIN, até a migração 0007)
+# e dentro de `imagens` (migração 0008), num banco de teste separado com 1 milhão de imagens.
+# Confere também que as duas versões devolvem as mesmas linhas.
+# Uso, a partir de backend/ (o usuário do MySQL precisa poder criar bancos):
+#   python -m benchmarks.bench_desnormalizacao --imagens 1000000 --fazendas 500
+# O banco `agrineural_bench` é recriado a cada execução (use --manter para não apagá-lo no fim).
+
+import argparse
+import time
+
+import numpy as np
+
+from MVC.model.conexao import obterPool
+from MVC.model.fazenda_dao import FazendaDAO
+from MVC.model.migracoes import migrar
+from MVC.model.relatorio_dao import RelatorioDAO
+from benchmarks.bench_indices import criarBanco, popular
+
+# As consultas de fazenda_dao e relatorio_dao antes da migração 0008
+ANTES = {
+    'mapa de calor': """
+        SELECT
+            i.nome, i.latitude AS lat, i.longitude AS lng,
+            (r.anomala OR COALESCE(MAX(rd.anomala), 0)) AS anomala, r.regioes,
+            COUNT(d.id) AS duplicatas
+        FROM imagens AS i
+        JOIN resultados AS r ON i.id = r.id
+        LEFT JOIN imagens AS d ON d.duplicata_de = i.id
+        LEFT JOIN resultados AS rd ON rd.id = d.id
+        WHERE i.fazenda_id = %s AND i.duplicata_de IS NULL AND r.descarte IS NULL
+        GROUP BY i.id, r.id
+    """,
+    'mapa de calor (todas)': """
+        SELECT
+            i.nome, i.latitude AS lat, i.longitude AS lng, r.anomala, r.regioes
+        FROM imagens AS i
+        JOIN resultados AS r ON i.id = r.id
+        WHERE i.fazenda_id = %s AND r.descarte IS NULL
+    """,
+    'relatório': """
+        SELECT COUNT(CASE WHEN r.descarte IS NULL THEN i.id END) AS total_images,
+               SUM(CASE WHEN r.anomala = TRUE THEN 1 ELSE 0 END) AS anomalous_images,
+               COUNT(r.descarte) AS discarded_images,
+               NULL AS last_inspection
+        FROM imagens i
+        JOIN resultados r ON i.id = r.id
+        WHERE i.fazenda_id = %s
+    """,
+}
+
+
+def depois(banco):
+    fazenda_dao = FazendaDAO(database=banco)
+    relatorio_dao = RelatorioDAO(database=banco)
+    return {
+        'mapa de calor': lambda fazenda: fazenda_dao.buscar_imagens_e_resultados_por_fazenda(fazenda),
+        'mapa de calor (todas)': lambda fazenda: fazenda_dao.buscar_imagens_e_resultados_por_fazenda(
+            fazenda, colapsar_duplicatas=False),
+        'relatório': lambda fazenda: [relatorio_dao.get_farm_image_stats(fazenda)],
+    }
+
+
+def marcarDuplicatas(banco, por_fazenda=50):
+    # Alguns frames de cada fazenda viram duplicatas da imagem anterior, para o agrupamento ter o que juntar
+    with obterPool(database=banco).conexao() as conn, conn.cursor() as cursor:
+        cursor.execute("""
+            UPDATE imagens AS i
+            JOIN (
+                SELECT id, LAG(id) OVER (PARTITION BY fazenda_id ORDER BY id) AS anterior,
+                       ROW_NUMBER() OVER (PARTITION BY fazenda_id ORDER BY id) AS posicao
+                FROM imagens
+            ) AS a ON a.id = i.id
+            SET i.duplicata_de = a.anterior
+            WHERE a.posicao %% 20 = 0 AND a.posicao <= %s
+        """, (por_fazenda * 20,))
+        conn.commit()
+
+
+def normalizar(linhas):
+    # anomala volta como 0/1 de uma expressão ou como BOOLEAN da coluna; compara pelo valor
+    return sorted(
+        tuple((k, int(v) if k == 'anomala' and v is not None else v) for k, v in sorted(linha.items()))
+        for linha in linhas
+    )
+
+
+def medir(consultas, fazenda, repeticoes):
+    medicoes = {}
+    for nome, consulta in consultas.items():
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            linhas = consulta(fazenda)
+            tempos.append(time.perf_counter() - inicio)
+        medicoes[nome] = (float(np.median(tempos)) * 1000, normalizar(linhas))
+    return medicoes
+
+
+def consultasAntes(banco):
+    def executar(sql):
+        def consulta(fazenda):
+            with obterPool(database=banco).conexao() as conn, conn.cursor(dictionary=True) as cursor:
+                cursor.execute(sql, (fazenda,))
+                return cursor.fetchall()
+        return consulta
+    return {nome: executar(sql) for nome, sql in ANTES.items()}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--imagens', type=int, default=1_000_000)
+    parser.add_argument('--fazendas', type=int, default=500)
+    parser.add_argument('--repeticoes', type=int, default=20)
+    parser.add_argument('--banco', default='agrineural_bench')
+    parser.add_argument('--manter', action='store_true', help='não apaga o banco de teste no fim')
+    args = parser.parse_args()
+
+    criarBanco(args.banco)
+    fazenda = popular(args.banco, args.imagens, args.fazendas)['fazenda']
+    migrar(ate='0007', database=args.banco)
+    marcarDuplicatas(args.banco)
+    antes = medir(consultasAntes(args.banco), fazenda, args.repeticoes)
+
+    inicio = time.perf_counter()
+    migrar(ate='0008', database=args.banco)
+    print(f"[INFO] Migração 0008 em {time.perf_counter() - inicio:.0f}s.")
+    with obterPool(database=args.banco).conexao() as conn, conn.cursor() as cursor:
+        cursor.execute("ANALYZE TABLE imagens")
+        cursor.fetchall()
+    medicoes = medir(depois(args.banco), fazenda, args.repeticoes)
+
+    print(f"\nFazenda {fazenda}, mediana de {args.repeticoes} execuções:")
+    for nome in ANTES:
+        (ms_antes, linhas_antes), (ms_depois, linhas_depois) = antes[nome], medicoes[nome]
+        iguais = 'mesmas linhas' if linhas_antes == linhas_depois else 'LINHAS DIFERENTES'
+        print(f"   {nome:>22}: {ms_antes:8.2f} ms -> {ms_depois:8.2f} ms ({ms_antes / ms_depois:.1f}x, "
+              f"{len(linhas_depois)} linhas, {iguais})")
+
+    if not args.manter:
+        with obterPool(database=None).conexao() as conn, conn.cursor() as cursor:
+            cursor.execute(f"DROP DATABASE {args.banco}")
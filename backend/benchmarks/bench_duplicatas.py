@@ -0,0 +1,53 @@
+# Latência da busca de duplicatas no índice multi-hash comparada à varredura de todos os hashes.
+# Os hashes simulam voos: sequências de frames consecutivos que diferem em poucos bits.
+# Uso, a partir de backend/:
+#   python -m benchmarks.bench_duplicatas [--imagens 200000] [--raio 6]
+
+import argparse
+import random
+import time
+
+from MVC.services.DuplicataService import IndiceMultiplo, distanciaHamming
+
+
+def gerarHashes(quantidade, gerador, frames_por_trecho=20):
+    hashes = []
+    while len(hashes) < quantidade:
+        atual = gerador.getrandbits(64)
+        for _ in range(frames_por_trecho):
+            for _ in range(gerador.randrange(4)):
+                atual ^= 1 << gerador.randrange(64)
+            hashes.append(atual)
+    return hashes[:quantidade]
+
+
+def medir(funcao, consultas):
+    inicio = time.perf_counter()
+    for consulta in consultas:
+        funcao(consulta)
+    return (time.perf_counter() - inicio) / len(consultas) * 1000
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--imagens', type=int, default=200000)
+    parser.add_argument('--raio', type=int, default=6)
+    parser.add_argument('--consultas', type=int, default=200)
+    args = parser.parse_args()
+
+    gerador = random.Random(0)
+    hashes = gerarHashes(args.imagens, gerador)
+    inicio = time.perf_counter()
+    indice = IndiceMultiplo(args.raio)
+    for i, h in enumerate(hashes):
+        indice.inserir(h, i)
+    print(f"Índice com {args.imagens} hashes montado em {time.perf_counter() - inicio:.1f}s")
+
+    # metade das consultas são frames novos de trechos existentes, metade são hashes sem parecido
+    consultas = [h ^ (1 << gerador.randrange(64)) for h in gerador.sample(hashes, args.consultas // 2)]
+    consultas += [gerador.getrandbits(64) for _ in range(args.consultas - len(consultas))]
+
+    ms_indice = medir(indice.buscar, consultas)
+    ms_varredura = medir(lambda c: [h for h in hashes if distanciaHamming(c, h) <= args.raio], consultas[:20])
+    print(f"Índice:     {ms_indice:.3f} ms por consulta")
+    print(f"Varredura:  {ms_varredura:.3f} ms por consulta")
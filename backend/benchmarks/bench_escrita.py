@@ -0,0 +1,102 @@
+# Gravação de imagens + resultados: um INSERT e um commit por imagem (ImagemDAO.salvar_imagem_e_resultado,
+# como no upload síncrono) contra o EscritorLote (ImagemDAO.salvar_lote, usado pelos workers),
+# num banco de teste separado.
+# Uso, a partir de backend/ (o usuário do MySQL precisa poder criar bancos):
+#   python -m benchmarks.bench_escrita --imagens 1000 10000 --lotes 50 200 1000
+# O banco `agrineural_bench_escrita` é recriado a cada execução e apagado no fim.
+
+import argparse
+import time
+
+import numpy as np
+
+from MVC.model.conexao import obterPool
+from MVC.model.escritor_lote import EscritorLote
+from MVC.model.imagem_dao import ImagemDAO
+from MVC.model.migracoes import migrar
+from benchmarks.bench_indices import criarBanco
+
+
+def registros(quantidade, rng):
+    erros = rng.gamma(2.0, 0.002, quantidade)
+    return [{
+        'fazenda_id': 1, 'nome_arquivo': f"frame_{i}.jpg", 'latitude': float(-19 + rng.random()),
+        'longitude': float(-43 + rng.random()), 'anomala': bool(e > 0.0036), 'erro': float(e),
+        'versao_modelo': 'bench', 'mapa_erro': f"uploads/frame_{i}.jpg.mapa.png",
+        'regioes': [{'x': 0, 'y': 0, 'largura': 32, 'altura': 32, 'erro': float(e)}],
+        'dhash': int(rng.integers(0, 2**63)), 'duplicata_de': None, 'descarte': None
+    } for i, e in enumerate(erros)]
+
+
+def limpar(banco):
+    with obterPool(database=banco).conexao() as conn, conn.cursor() as cursor:
+        cursor.execute("DELETE FROM imagens")
+        conn.commit()
+
+
+def contar(banco):
+    with obterPool(database=banco).conexao() as conn, conn.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM imagens WHERE anomala IS NOT NULL")
+        total, = cursor.fetchone()
+        conn.commit()
+    return total
+
+
+def porImagem(dao, linhas):
+    inicio = time.perf_counter()
+    for linha in linhas:
+        if dao.salvar_imagem_e_resultado(**linha) is None:
+            raise RuntimeError('falha ao gravar')
+    return time.perf_counter() - inicio
+
+
+def emLote(dao, linhas, tamanho):
+    escritor = EscritorLote(dao, tamanho=tamanho, intervalo=float('inf'))
+    falhas = []
+    inicio = time.perf_counter()
+    for linha in linhas:
+        escritor.adicionar(linha, lambda imagem_id: imagem_id is None and falhas.append(1))
+    escritor.descarregar()
+    if falhas:
+        raise RuntimeError(f'{len(falhas)} imagens não gravadas')
+    return time.perf_counter() - inicio
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--imagens', nargs='+', type=int, default=[1000, 10000])
+    parser.add_argument('--lotes', nargs='+', type=int, default=[50, 200, 1000], help='tamanhos de lote do EscritorLote')
+    parser.add_argument('--banco', default='agrineural_bench_escrita')
+    args = parser.parse_args()
+
+    criarBanco(args.banco)
+    migrar(database=args.banco)
+    with obterPool(database=args.banco).conexao() as conn, conn.cursor() as cursor:
+        cursor.execute("INSERT INTO usuarios (cpf, nome, senha, tipo) VALUES ('p0', 'p0', 'x', 'produtor')")
+        cursor.execute("""
+            INSERT INTO fazendas (id, cpf_produtor, ccir, nome, latitude, longitude, ext_territorial)
+            VALUES (1, 'p0', 'ccir0', 'fazenda 0', -19.0, -43.0, 100)
+        """)
+        cursor.execute("SELECT @@innodb_autoinc_lock_mode")
+        modo, = cursor.fetchone()
+        conn.commit()
+
+    dao = ImagemDAO()
+    dao._pool = obterPool(database=args.banco)
+    print(f"innodb_autoinc_lock_mode = {modo} "
+          f"({'imagens num INSERT só' if modo <= 1 else 'imagens uma a uma, na mesma transação'})")
+    try:
+        for quantidade in args.imagens:
+            linhas = registros(quantidade, np.random.default_rng(0))
+            medicoes = [('por imagem', porImagem, ())] + [(f'lote de {t}', emLote, (t,)) for t in args.lotes]
+            base = None
+            print(f"\n== {quantidade} imagens")
+            for nome, gravar, extras in medicoes:
+                limpar(args.banco)
+                segundos = gravar(dao, [dict(l) for l in linhas], *extras)
+                assert contar(args.banco) == quantidade
+                base = base or segundos
+                print(f"   {nome:>14}: {segundos:7.2f} s  {quantidade / segundos:8.0f} imagens/s  ({base / segundos:.1f}x)")
+    finally:
+        with obterPool(database=None).conexao() as conn, conn.cursor() as cursor:
+            cursor.execute(f"DROP DATABASE {args.banco}")
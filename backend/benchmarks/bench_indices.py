@@ -0,0 +1,154 @@
+# Planos (EXPLAIN) e latência das consultas por fazenda/usuário antes e depois dos índices da
+# migração 0007, num banco de teste separado com 1 milhão de imagens.
+# Uso, a partir de backend/ (o usuário do MySQL precisa poder criar bancos):
+#   python -m benchmarks.bench_indices --imagens 1000000 --fazendas 500
+# O banco `agrineural_bench` é recriado a cada execução (use --manter para não apagá-lo no fim).
+
+import argparse
+import time
+
+import numpy as np
+
+from MVC.model.conexao import obterPool
+from MVC.model.migracoes import comandos, migrar
+
+# As consultas dos DAOs (fazenda_dao, relatorio_dao, imagem_dao, usuario_fazenda_dao) até a migração 0007,
+# quando os resultados ainda ficavam na tabela `resultados` (ver benchmarks.bench_desnormalizacao)
+CONSULTAS = {
+    'mapa de calor': ("""
+        SELECT i.nome, i.latitude AS lat, i.longitude AS lng,
+               (r.anomala OR COALESCE(MAX(rd.anomala), 0)) AS anomala, r.regioes, COUNT(d.id) AS duplicatas
+        FROM imagens AS i
+        JOIN resultados AS r ON i.id = r.id
+        LEFT JOIN imagens AS d ON d.duplicata_de = i.id
+        LEFT JOIN resultados AS rd ON rd.id = d.id
+        WHERE i.fazenda_id = %(fazenda)s AND i.duplicata_de IS NULL AND r.descarte IS NULL
+        GROUP BY i.id, r.id
+    """),
+    'relatório': ("""
+        SELECT COUNT(CASE WHEN r.descarte IS NULL THEN i.id END) AS total_images,
+               SUM(CASE WHEN r.anomala = TRUE THEN 1 ELSE 0 END) AS anomalous_images,
+               COUNT(r.descarte) AS discarded_images
+        FROM imagens i
+        JOIN resultados r ON i.id = r.id
+        WHERE i.fazenda_id = %(fazenda)s
+    """),
+    'dhashes': ("""
+        SELECT i.id, i.dhash, i.latitude, i.longitude, i.duplicata_de, r.erro
+        FROM imagens AS i
+        LEFT JOIN resultados AS r ON r.id = i.id
+        WHERE i.fazenda_id = %(fazenda)s AND i.id > %(apos)s AND i.dhash IS NOT NULL
+        ORDER BY i.id
+    """),
+    'fazendas do produtor': ("""
+        SELECT id, ccir, nome, latitude, longitude, ext_territorial
+        FROM fazendas
+        WHERE cpf_produtor = %(produtor)s
+    """),
+    'fazendas do usuário': ("""
+        SELECT f.id, f.ccir AS ccm, f.nome, f.latitude, f.longitude, f.ext_territorial AS area
+        FROM fazendas f
+        JOIN usuarios_fazendas uf ON uf.fazenda_id = f.id
+        WHERE uf.cpf_usuario = %(usuario)s
+    """),
+}
+
+
+def criarBanco(banco):
+    with obterPool(database=None).conexao() as conn, conn.cursor() as cursor:
+        cursor.execute(f"DROP DATABASE IF EXISTS {banco}")
+        cursor.execute(f"CREATE DATABASE {banco}")
+    with obterPool(database=banco).conexao() as conn, conn.cursor() as cursor, \
+            open('schema.sql', encoding='utf-8') as f:
+        for comando in comandos(f.read()):
+            if not comando.upper().startswith('CREATE DATABASE'):
+                cursor.execute(comando)
+        conn.commit()
+    migrar(ate='0006', database=banco)
+
+
+def popular(banco, total_imagens, total_fazendas, lote=10000):
+    rng = np.random.default_rng(0)
+    produtores = [f"p{i:05d}" for i in range(max(1, total_fazendas // 5))]
+    usuarios = [f"m{i:05d}" for i in range(max(1, total_fazendas // 2))]
+    with obterPool(database=banco).conexao() as conn, conn.cursor() as cursor:
+        cursor.executemany("INSERT INTO usuarios (cpf, nome, senha, tipo) VALUES (%s, %s, 'x', %s)",
+                           [(cpf, cpf, 'produtor') for cpf in produtores] +
+                           [(cpf, cpf, 'mosaiqueiro') for cpf in usuarios])
+        cursor.executemany("""
+            INSERT INTO fazendas (cpf_produtor, ccir, nome, latitude, longitude, ext_territorial)
+            VALUES (%s, %s, %s, %s, %s, 100)
+        """, [(produtores[i % len(produtores)], f"ccir{i}", f"fazenda {i}",
+               -19.0 + rng.random(), -43.0 + rng.random()) for i in range(total_fazendas)])
+        cursor.executemany("INSERT INTO usuarios_fazendas (cpf_usuario, fazenda_id) VALUES (%s, %s)",
+                           [(usuarios[i % len(usuarios)], i + 1) for i in range(total_fazendas)])
+        conn.commit()
+
+        inicio = time.perf_counter()
+        proximo_id = 1
+        for comeco in range(0, total_imagens, lote):
+            quantidade = min(lote, total_imagens - comeco)
+            # Fazendas intercaladas, como chegam os envios de vários operadores ao mesmo tempo
+            fazendas = rng.integers(1, total_fazendas + 1, quantidade)
+            ids = range(proximo_id, proximo_id + quantidade)
+            cursor.executemany("""
+                INSERT INTO imagens (id, fazenda_id, nome, latitude, longitude, dhash)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """, [(i, int(f), f"frame_{i}.jpg", float(-19 + rng.random()), float(-43 + rng.random()),
+                   int(rng.integers(0, 2**63))) for i, f in zip(ids, fazendas)])
+            erros = rng.gamma(2.0, 0.002, quantidade)
+            cursor.executemany("""
+                INSERT INTO resultados (id, anomala, erro, versao_modelo, descarte)
+                VALUES (%s, %s, %s, 'bench', %s)
+            """, [(i, bool(e > 0.0036), float(e), 'Desfocada' if e < 0.0005 else None)
+                  for i, e in zip(ids, erros)])
+            conn.commit()
+            proximo_id += quantidade
+        print(f"[INFO] {total_imagens} imagens inseridas em {time.perf_counter() - inicio:.0f}s.")
+        for tabela in ('usuarios', 'fazendas', 'usuarios_fazendas', 'imagens', 'resultados'):
+            cursor.execute(f"ANALYZE TABLE {tabela}")
+            cursor.fetchall()
+    return {'fazenda': total_fazendas // 2, 'apos': 0, 'produtor': produtores[0], 'usuario': usuarios[0]}
+
+
+def medir(banco, parametros, repeticoes):
+    medicoes = {}
+    with obterPool(database=banco).conexao() as conn, conn.cursor(dictionary=True) as cursor:
+        for nome, sql in CONSULTAS.items():
+            cursor.execute("EXPLAIN " + sql, parametros)
+            plano = [f"{l['table']}: {l['type']} via {l['key'] or '-'} (~{l['rows']} linhas){' ' + l['Extra'] if l['Extra'] else ''}"
+                     for l in cursor.fetchall()]
+            tempos = []
+            for _ in range(repeticoes):
+                inicio = time.perf_counter()
+                cursor.execute(sql, parametros)
+                cursor.fetchall()
+                tempos.append(time.perf_counter() - inicio)
+            conn.commit()
+            medicoes[nome] = (float(np.median(tempos)) * 1000, plano)
+    return medicoes
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--imagens', type=int, default=1_000_000)
+    parser.add_argument('--fazendas', type=int, default=500)
+    parser.add_argument('--repeticoes', type=int, default=20)
+    parser.add_argument('--banco', default='agrineural_bench')
+    parser.add_argument('--manter', action='store_true', help='não apaga o banco de teste no fim')
+    args = parser.parse_args()
+
+    criarBanco(args.banco)
+    parametros = popular(args.banco, args.imagens, args.fazendas)
+    antes = medir(args.banco, parametros, args.repeticoes)
+    migrar(ate='0007', database=args.banco)  # índices
+    depois = medir(args.banco, parametros, args.repeticoes)
+
+    for nome in CONSULTAS:
+        print(f"\n== {nome}: {antes[nome][0]:.2f} ms -> {depois[nome][0]:.2f} ms")
+        print("   antes:  " + "\n           ".join(antes[nome][1]))
+        print("   depois: " + "\n           ".join(depois[nome][1]))
+
+    if not args.manter:
+        with obterPool(database=None).conexao() as conn, conn.cursor() as cursor:
+            cursor.execute(f"DROP DATABASE {args.banco}")
@@ -0,0 +1,61 @@
+# Benchmark da análise em ladrilhos (uso, a partir de backend/):
+#   python -m benchmarks.bench_ladrilhos            -> só extração dos ladrilhos
+#   python -m benchmarks.bench_ladrilhos --modelo   -> extração + inferência com o autoencoder
+
+import argparse
+import time
+
+import numpy as np
+
+from MVC import config
+from MVC.services.LadrilhoService import gradeLadrilhos, extrairLadrilhos
+
+RESOLUCOES = {
+    '1080p': (1080, 1920),
+    '4000x3000': (3000, 4000),
+    '4K': (2160, 3840),
+    '8K': (4320, 7680),
+}
+
+
+def medirExtracao(img, tamanhoLote):
+    inicio = time.perf_counter()
+    janelas, ys, xs = gradeLadrilhos(img, 256, config.SOBREPOSICAO_LADRILHOS)
+    linhas, colunas = (m.ravel() for m in np.meshgrid(ys, xs, indexing='ij'))
+    for i in range(0, len(linhas), tamanhoLote):
+        lote = extrairLadrilhos(janelas, linhas[i:i + tamanhoLote], colunas[i:i + tamanhoLote])
+        lote[..., ::-1].astype("float32") / 255.0
+    return time.perf_counter() - inicio, len(linhas)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--modelo', action='store_true', help='inclui a inferência no tempo medido')
+    parser.add_argument('--lote', type=int, default=config.TAMANHO_LOTE)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    modelo = None
+    if args.modelo:
+        from MVC.services.RegistroModelo import registro
+        modelo = registro.aquecer()
+
+    gerador = np.random.default_rng(0)
+    print(f"{'resolução':>10} {'ladrilhos':>9} {'extração (ms)':>14} {'total (ms)':>11} {'ms/ladrilho':>12}")
+    for nome, (altura, largura) in RESOLUCOES.items():
+        img = gerador.integers(0, 256, (altura, largura, 3), dtype=np.uint8)
+        extracao = min(medirExtracao(img, args.lote)[0] for _ in range(args.repeticoes))
+        _, quantidade = medirExtracao(img, args.lote)
+
+        total = float('nan')
+        if modelo is not None:
+            tempos = []
+            for _ in range(args.repeticoes):
+                inicio = time.perf_counter()
+                modelo.analisarLadrilhado(img, tamanhoLote=args.lote)
+                tempos.append(time.perf_counter() - inicio)
+            total = min(tempos)
+
+        referencia = total if modelo is not None else extracao
+        print(f"{nome:>10} {quantidade:>9} {extracao * 1000:>14.1f} {total * 1000:>11.1f} "
+              f"{referencia * 1000 / quantidade:>12.2f}")
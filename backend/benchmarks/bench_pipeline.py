@@ -0,0 +1,68 @@
+# Imagens/s de analisarLote com a decodificação em série (como era) e com N threads de
+# decodificação alimentando o modelo, para um envio de 500 frames.
+# Uso, a partir de backend/:
+#   python -m benchmarks.bench_pipeline [pasta] --quantidade 500 --threads 1 2 4 8
+# Sem pasta, gera frames sintéticos na resolução do drone a partir da imagem de teste.
+
+import argparse
+import glob
+import os
+import shutil
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+EXTENSOES = ('.jpg', '.jpeg', '.png', '.webp')
+
+
+def gerarFrames(quantidade, largura, altura):
+    pasta = tempfile.mkdtemp(prefix='bench_pipeline_')
+    base = cv2.resize(cv2.imread('MVC/tests/imagens/teste.jpg'), (largura, altura))
+    caminhos = []
+    for i in range(quantidade):
+        caminho = os.path.join(pasta, f'frame_{i:04d}.jpg')
+        cv2.imwrite(caminho, np.roll(base, i * 13, axis=1))  # conteúdo diferente em cada frame
+        caminhos.append(caminho)
+    return pasta, caminhos
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('pasta', nargs='?', help='pasta com os frames (padrão: frames sintéticos)')
+    parser.add_argument('--quantidade', type=int, default=500)
+    parser.add_argument('--resolucao', default='4000x3000', help='tamanho dos frames sintéticos')
+    parser.add_argument('--threads', nargs='+', type=int, default=[1, 2, 4, 8])
+    parser.add_argument('--lote', type=int, default=32)
+    parser.add_argument('--backend', default='keras')
+    args = parser.parse_args()
+
+    temporaria = None
+    if args.pasta:
+        caminhos = sorted(
+            p for p in glob.glob(os.path.join(args.pasta, '**', '*'), recursive=True)
+            if p.lower().endswith(EXTENSOES)
+        )[:args.quantidade]
+    else:
+        largura, altura = map(int, args.resolucao.split('x'))
+        temporaria, caminhos = gerarFrames(args.quantidade, largura, altura)
+
+    from MVC.services.IAService import ModeloAgrineural
+    modelo = ModeloAgrineural(backend=args.backend)
+    modelo.analisarLote(caminhos[:args.lote], tamanhoLote=args.lote, threads=1)  # aquecimento
+
+    try:
+        print(f"{len(caminhos)} imagens, lote {args.lote}, {os.cpu_count()} núcleos")
+        print(f"{'threads':>7} {'segundos':>9} {'imagens/s':>10} {'ganho':>6}")
+        referencia = None
+        for threads in args.threads:
+            inicio = time.perf_counter()
+            modelo.analisarLote(caminhos, tamanhoLote=args.lote, threads=threads)
+            segundos = time.perf_counter() - inicio
+            referencia = referencia or segundos
+            rotulo = f"{threads} (série)" if threads <= 1 else str(threads)
+            print(f"{rotulo:>7} {segundos:>9.2f} {len(caminhos) / segundos:>10.1f} {referencia / segundos:>5.2f}x")
+    finally:
+        if temporaria:
+            shutil.rmtree(temporaria)
@@ -0,0 +1,89 @@
+# Vazão total (imagens/s) para cada combinação de processos x threads do runtime de inferência,
+# para escolher AGRINEURAL_WORKERS/AGRINEURAL_WORKERS_WEB e AGRINEURAL_THREADS_INTRA no servidor.
+# Todos os processos de uma combinação carregam o modelo, esperam os demais e rodam juntos.
+# Uso, a partir de backend/:
+#   python -m benchmarks.bench_threads --processos 1 2 4 --threads 1 2 4 --lote 8 --duracao 20
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+
+def medirNoProcessoFilho(backend, lote, duracao):
+    from MVC.services.IAService import ModeloAgrineural
+    modelo = ModeloAgrineural(backend=backend)
+    entrada = np.random.default_rng(0).random((lote, 256, 256, 3), dtype=np.float32)
+    modelo.reconstruir(entrada)  # aquecimento
+
+    print('pronto', flush=True)
+    sys.stdin.readline()  # sinal de partida do processo pai
+
+    imagens = 0
+    inicio = time.perf_counter()
+    while time.perf_counter() - inicio < duracao:
+        modelo.reconstruir(entrada)
+        imagens += lote
+    print(json.dumps({'imagens': imagens, 'segundos': time.perf_counter() - inicio}), flush=True)
+
+
+def medirCombinacao(processos, threads, backend, lote, duracao):
+    ambiente = dict(os.environ, AGRINEURAL_THREADS_INTRA=str(threads), AGRINEURAL_THREADS_INTER='1',
+                    TF_CPP_MIN_LOG_LEVEL='2')
+    filhos = [
+        subprocess.Popen(
+            [sys.executable, '-m', 'benchmarks.bench_threads', '--interno', backend,
+             '--lote', str(lote), '--duracao', str(duracao)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, env=ambiente
+        ) for _ in range(processos)
+    ]
+    try:
+        for filho in filhos:
+            if filho.stdout.readline().strip() != 'pronto':
+                raise RuntimeError('um processo falhou ao carregar o modelo')
+        for filho in filhos:
+            filho.stdin.write('\n')
+            filho.stdin.flush()
+        medicoes = [json.loads(filho.stdout.readline()) for filho in filhos]
+    finally:
+        for filho in filhos:
+            if filho.poll() is None:
+                filho.kill()
+            filho.wait()
+    return sum(m['imagens'] / m['segundos'] for m in medicoes)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--processos', nargs='+', type=int, default=[1, 2, 4])
+    parser.add_argument('--threads', nargs='+', type=int, default=[1, 2, 4])
+    parser.add_argument('--backend', default='keras')
+    parser.add_argument('--lote', type=int, default=8)
+    parser.add_argument('--duracao', type=float, default=20, help='segundos medidos por combinação')
+    parser.add_argument('--interno', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.interno:
+        medirNoProcessoFilho(args.interno, args.lote, args.duracao)
+        sys.exit(0)
+
+    print(f"{os.cpu_count()} núcleos, backend {args.backend}, lote {args.lote}")
+    print(f"{'processos':>9} {'threads':>7} {'total threads':>13} {'imagens/s':>10}")
+    melhor = None
+    for processos in args.processos:
+        for threads in args.threads:
+            try:
+                vazao = medirCombinacao(processos, threads, args.backend, args.lote, args.duracao)
+            except Exception as e:
+                print(f"{processos:>9} {threads:>7} {processos * threads:>13} falhou: {e}")
+                continue
+            print(f"{processos:>9} {threads:>7} {processos * threads:>13} {vazao:>10.1f}")
+            if melhor is None or vazao > melhor[2]:
+                melhor = (processos, threads, vazao)
+
+    if melhor:
+        print(f"\nMelhor: {melhor[0]} processos com AGRINEURAL_THREADS_INTRA={melhor[1]} ({melhor[2]:.1f} imagens/s)")
@@ -0,0 +1,113 @@
+# Compara o modelo float32 com as variantes quantizadas numa pasta de imagens rotuladas
+# (subpastas 'normal/' e 'anomala/'): vazão, memória e quanto a decisão no threshold atual muda.
+# Uso, a partir de backend/:
+#   python -m MVC.services.BackendInferencia exportar --quantizacao int8 --calibracao <pasta>
+#   python -m benchmarks.calibrar_quantizacao <pasta> --backends keras tflite-float16 tflite-int8
+
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from MVC import config
+
+ROTULOS = {'normal': False, 'anomala': True}
+EXTENSOES = ('.jpg', '.jpeg', '.png', '.webp')
+
+
+def listarImagens(pasta):
+    imagens = []
+    for subpasta, anomala in ROTULOS.items():
+        for caminho in sorted(glob.glob(os.path.join(pasta, subpasta, '**', '*'), recursive=True)):
+            if caminho.lower().endswith(EXTENSOES):
+                imagens.append((caminho, anomala))
+    return imagens
+
+
+def executarNoProcessoFilho(backend, caminhos):
+    from MVC.services.IAService import ModeloAgrineural
+    modelo = ModeloAgrineural(backend=backend)
+    modelo.reconstruir(np.zeros((config.TAMANHO_LOTE, 256, 256, 3), dtype="float32"))  # aquecimento
+
+    inicio = time.perf_counter()
+    analises = modelo.analisarLote(caminhos)
+    duracao = time.perf_counter() - inicio
+    print(json.dumps({
+        'erros': [a['erro'] if a['erro'] is not None else float('nan') for a in analises],
+        'imagens_por_s': len(caminhos) / duracao,
+        'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }))
+
+
+def executar(backend, caminhos):
+    """
+    Mede um backend num processo próprio; devolve None se ele falhar (ex.: variante não exportada).
+    """
+    try:
+        saida = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.calibrar_quantizacao', '--interno', backend],
+            input='\n'.join(caminhos), capture_output=True, text=True, check=True
+        )
+    except subprocess.CalledProcessError as e:
+        ultima_linha = (e.stderr or '').strip().splitlines()[-1:] or [f"código {e.returncode}"]
+        print(f"[ERRO] Backend {backend} falhou: {ultima_linha[0]}")
+        return None
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+def thresholdEquivalente(erros_referencia, erros, threshold):
+    """
+    Threshold para os erros quantizados que reproduz o maior número de decisões da referência.
+    """
+    decisoes = np.asarray(erros_referencia) > threshold
+    candidatos = np.unique(erros)
+    acertos = [(np.asarray(erros) > c) == decisoes for c in candidatos]
+    return float(candidatos[int(np.argmax([a.sum() for a in acertos]))])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('pasta', nargs='?')
+    parser.add_argument('--backends', nargs='+', default=['keras', 'tflite-float16', 'tflite-int8'])
+    parser.add_argument('--threshold', type=float, default=config.THRESHOLD_PADRAO)
+    parser.add_argument('--interno', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.interno:
+        executarNoProcessoFilho(args.interno, sys.stdin.read().splitlines())
+        sys.exit(0)
+
+    imagens = listarImagens(args.pasta)
+    if not imagens:
+        sys.exit(f"Nenhuma imagem em {args.pasta}/normal ou {args.pasta}/anomala")
+    caminhos = [c for c, _ in imagens]
+    rotulos = np.array([a for _, a in imagens])
+
+    medidas = {backend: executar(backend, caminhos) for backend in args.backends}
+    medidas = {backend: medida for backend, medida in medidas.items() if medida is not None}
+    if not medidas:
+        sys.exit("Nenhum backend conseguiu analisar as imagens")
+    # A referência é o primeiro backend pedido que rodou
+    backend_ref = next(iter(medidas))
+    # Considera só as imagens que todos os backends conseguiram analisar
+    validas = np.all([np.isfinite(m['erros']) for m in medidas.values()], axis=0)
+    rotulos = rotulos[validas]
+    referencia = np.array(medidas[backend_ref]['erros'], dtype=float)[validas]
+    decisoes_ref = referencia > args.threshold
+
+    print(f"{int(validas.sum())} imagens, threshold {args.threshold:.6g}, referência: {backend_ref}\n")
+    print(f"{'backend':<16} {'img/s':>8} {'RSS MB':>8} {'acurácia':>9} {'decisões trocadas':>18} "
+          f"{'máx |Δerro|':>12} {'threshold equivalente':>22}")
+    for backend, medida in medidas.items():
+        erros = np.array(medida['erros'], dtype=float)[validas]
+        decisoes = erros > args.threshold
+        print(f"{backend:<16} {medida['imagens_por_s']:>8.1f} {medida['rss_mb']:>8.1f} "
+              f"{(decisoes == rotulos).mean():>9.1%} {int((decisoes != decisoes_ref).sum()):>18} "
+              f"{np.abs(erros - referencia).max():>12.2e} "
+              f"{thresholdEquivalente(referencia, erros, args.threshold):>22.6g}")
@@ -0,0 +1,71 @@
+# Teste de carga: N clientes simultâneos repetindo GETs numa rota do app em execução, para
+# comparar a vazão (requisições/s) e a latência com e sem threads no servidor.
+# Uso, a partir de backend/, com o app rodando (python -m MVC.app ou gunicorn):
+#   python -m benchmarks.carga_concorrente --concorrencia 1 4 16 --rota /health/ready
+#   python -m benchmarks.carga_concorrente --cpf <cpf> --senha <senha> --rota /area-mosaiqueiro/fazendas/associadas
+
+import argparse
+import http.cookiejar
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+
+def criarCliente(url, cpf=None, senha=None):
+    # Um opener por cliente: cada um com a sua sessão (cookie) e a sua conexão
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+    if cpf:
+        pedido = urllib.request.Request(f"{url}/auth/login", data=json.dumps({'cpf': cpf, 'senha': senha}).encode(),
+                                        headers={'Content-Type': 'application/json'})
+        opener.open(pedido, timeout=10).read()
+    return opener
+
+
+def cliente(opener, endereco, duracao, latencias, falhas):
+    fim = time.monotonic() + duracao
+    while time.monotonic() < fim:
+        inicio = time.perf_counter()
+        try:
+            with opener.open(endereco, timeout=30) as resposta:
+                resposta.read()
+            latencias.append(time.perf_counter() - inicio)
+        except urllib.error.HTTPError as e:
+            # 503 do /health/ready ainda é uma resposta do servidor; conta como latência
+            latencias.append(time.perf_counter() - inicio)
+            if e.code >= 500 and e.code != 503:
+                falhas.append(e.code)
+        except (urllib.error.URLError, OSError) as e:
+            falhas.append(str(e))
+
+
+def medir(url, rota, concorrencia, duracao, cpf, senha):
+    openers = [criarCliente(url, cpf, senha) for _ in range(concorrencia)]
+    latencias, falhas = [], []
+    threads = [threading.Thread(target=cliente, args=(o, url + rota, duracao, latencias, falhas)) for o in openers]
+    inicio = time.perf_counter()
+    for t in threads: t.start()
+    for t in threads: t.join()
+    segundos = time.perf_counter() - inicio
+    ms = np.array(latencias) * 1000 if latencias else np.zeros(1)
+    return len(latencias) / segundos, np.percentile(ms, 50), np.percentile(ms, 95), len(falhas)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--rota', default='/health/ready', help='GET repetido pelos clientes')
+    parser.add_argument('--concorrencia', nargs='+', type=int, default=[1, 4, 16])
+    parser.add_argument('--duracao', type=float, default=15, help='segundos por nível de concorrência')
+    parser.add_argument('--cpf', help='faz login antes (rotas que exigem sessão)')
+    parser.add_argument('--senha')
+    args = parser.parse_args()
+
+    print(f"GET {args.url}{args.rota}")
+    print(f"{'clientes':>8} {'req/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'falhas':>7}")
+    for concorrencia in args.concorrencia:
+        vazao, p50, p95, falhas = medir(args.url, args.rota, concorrencia, args.duracao, args.cpf, args.senha)
+        print(f"{concorrencia:>8} {vazao:>8.1f} {p50:>9.1f} {p95:>9.1f} {falhas:>7}")
@@ -0,0 +1,90 @@
+# Memória de cada worker do gunicorn: RSS, PSS e USS (páginas só daquele processo), lidas de
+# /proc/<pid>/smaps_rollup (Linux). O USS é o que cada worker a mais custa de verdade.
+# Uso, a partir de backend/:
+#   python -m benchmarks.memoria_workers --pid <pid do mestre>        (servidor já rodando)
+#   python -m benchmarks.memoria_workers --iniciar 4 [--sem-preload]   (sobe, mede e derruba)
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+CAMPOS = ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty', 'Private_Clean', 'Private_Dirty')
+
+
+def lerSmaps(pid):
+    valores = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for linha in f:
+            partes = linha.split()
+            if partes and partes[0].rstrip(':') in CAMPOS:
+                valores[partes[0].rstrip(':')] = int(partes[1]) / 1024  # kB -> MB
+    valores['Uss'] = valores['Private_Clean'] + valores['Private_Dirty']
+    return valores
+
+
+def filhos(pid):
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return [int(p) for p in f.read().split()]
+
+
+def relatorio(pid_mestre):
+    print(f"{'processo':<16} {'RSS (MB)':>9} {'PSS (MB)':>9} {'USS (MB)':>9} {'compart. (MB)':>13}")
+    workers = filhos(pid_mestre)
+    total_uss = 0
+    for nome, pid in [('mestre', pid_mestre)] + [(f'worker {p}', p) for p in workers]:
+        m = lerSmaps(pid)
+        compartilhada = m['Shared_Clean'] + m['Shared_Dirty']
+        print(f"{nome:<16} {m['Rss']:>9.1f} {m['Pss']:>9.1f} {m['Uss']:>9.1f} {compartilhada:>13.1f}")
+        if pid != pid_mestre:
+            total_uss += m['Uss']
+    total_pss = sum(lerSmaps(p)['Pss'] for p in [pid_mestre] + workers)
+    if workers:
+        print(f"\nUSS médio por worker: {total_uss / len(workers):.1f} MB; PSS total do servidor: {total_pss:.1f} MB")
+
+
+def aguardarProntos(url, quantidade, limite):
+    # Cada resposta 200 do /health/ready vem de um worker já aquecido; espera ver vários seguidos
+    fim = time.monotonic() + limite
+    prontos = 0
+    while time.monotonic() < fim and prontos < quantidade * 3:
+        try:
+            with urllib.request.urlopen(url, timeout=5) as resposta:
+                prontos = prontos + 1 if resposta.status == 200 else 0
+        except (urllib.error.URLError, ConnectionError):
+            prontos = 0
+            time.sleep(1)
+    return prontos >= quantidade * 3
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pid', type=int, help='pid do mestre do gunicorn já em execução')
+    parser.add_argument('--iniciar', type=int, metavar='WORKERS', help='sobe o gunicorn com esse número de workers')
+    parser.add_argument('--sem-preload', action='store_true', help='cada worker importa o app por conta própria')
+    parser.add_argument('--porta', type=int, default=5055)
+    parser.add_argument('--espera', type=float, default=10, help='segundos extras depois de todos prontos')
+    parser.add_argument('--limite', type=float, default=300)
+    args = parser.parse_args()
+
+    if args.pid:
+        relatorio(args.pid)
+        sys.exit(0)
+    if not args.iniciar:
+        parser.error('informe --pid ou --iniciar')
+
+    ambiente = dict(os.environ, AGRINEURAL_WORKERS_WEB=str(args.iniciar), AGRINEURAL_BIND=f'127.0.0.1:{args.porta}',
+                    AGRINEURAL_PRELOAD='0' if args.sem_preload else '1')
+    servidor = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'MVC.app:app'], env=ambiente)
+    try:
+        if not aguardarProntos(f'http://127.0.0.1:{args.porta}/health/ready', args.iniciar, args.limite):
+            print('[ERRO] Os workers não ficaram prontos a tempo (o banco está acessível?).')
+        time.sleep(args.espera)
+        print(f"\n{args.iniciar} workers, {'sem' if args.sem_preload else 'com'} preload:")
+        relatorio(servidor.pid)
+    finally:
+        servidor.terminate()
+        servidor.wait()
@@ -0,0 +1,32 @@
+# Servidor pre-fork: o app (Flask, OpenCV, NumPy e o runtime de inferência) é importado uma vez
+# no processo mestre e os workers são criados por fork, compartilhando essas páginas de memória.
+# O modelo em si só é carregado depois do fork, em cada worker: o TensorFlow não é seguro para
+# fork depois de inicializado (pools de threads, alocadores), então nada é executado no mestre.
+# Uso (a partir de backend/): gunicorn -c gunicorn.conf.py MVC.app:app
+
+import gc
+import os
+
+# Lido pelo MVC/app.py: não carrega nem aquece o modelo no mestre
+os.environ['AGRINEURAL_PREFORK'] = '1'
+
+bind = os.environ.get('AGRINEURAL_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('AGRINEURAL_WORKERS_WEB', '4'))
+preload_app = os.environ.get('AGRINEURAL_PRELOAD', '1') == '1'  # '0' só para comparar a memória
+timeout = 120
+
+
+def when_ready(server):
+    # Chamado no mestre depois do preload e antes do primeiro fork
+    from MVC import config
+    from MVC.services.BackendInferencia import importarRuntime
+    importarRuntime(config.BACKEND_INFERENCIA)
+    # Move os objetos já criados para uma geração que o GC não percorre: sem isso a coleta
+    # nos workers escreve nos cabeçalhos dos objetos e força a cópia das páginas compartilhadas
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from MVC.services.RegistroModelo import registro
+    registro.aquecerEmSegundoPlano()
+    registro.iniciarMonitor()
@@ -0,0 +1,24 @@
+USE agrineural;
+
+-- Fila de análises: cada linha é uma imagem já salva em disco aguardando o modelo
+CREATE TABLE jobs_analise (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    status ENUM('pendente', 'processando', 'concluido', 'erro') NOT NULL DEFAULT 'pendente',
+    cpf_usuario VARCHAR(20)     NOT NULL,  -- quem enviou a imagem
+    nome VARCHAR(255)           NOT NULL,
+    caminho_arquivo VARCHAR(512) NOT NULL,
+    latitude FLOAT              NOT NULL,
+    longitude FLOAT             NOT NULL,
+    fazenda_id INT              NULL,     -- NULL para envios pela rota legada /upload
+    caminho_status VARCHAR(512) NULL,     -- arquivo de status da rota legada /upload
+    tentativas INT              NOT NULL DEFAULT 0,
+    max_tentativas INT          NOT NULL DEFAULT 3,
+    worker VARCHAR(64)          NULL,
+    imagem_id INT               NULL,
+    resultado VARCHAR(20)       NULL,
+    mensagem_erro TEXT          NULL,
+    criado_em TIMESTAMP         NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    atualizado_em TIMESTAMP     NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_jobs_status (status, id),
+    FOREIGN KEY (fazenda_id) REFERENCES fazendas(id) ON DELETE CASCADE
+);
@@ -0,0 +1,11 @@
+USE agrineural;
+
+-- Guarda o erro de reconstrução e a versão do modelo de cada imagem, para que
+-- mudanças de threshold não exijam rodar o modelo de novo
+ALTER TABLE resultados
+    ADD COLUMN erro FLOAT NULL,
+    ADD COLUMN versao_modelo VARCHAR(100) NULL;
+
+-- Threshold próprio da fazenda (NULL = usa o padrão do modelo)
+ALTER TABLE fazendas
+    ADD COLUMN threshold FLOAT NULL;
@@ -0,0 +1,7 @@
+USE agrineural;
+
+-- Localização da anomalia: caminho do mapa de erro (PNG ao lado do upload)
+-- e as regiões com maior erro, em coordenadas relativas da imagem
+ALTER TABLE resultados
+    ADD COLUMN mapa_erro VARCHAR(512) NULL,
+    ADD COLUMN regioes JSON NULL;
@@ -0,0 +1,14 @@
+USE agrineural;
+
+-- Resultados por conteúdo da imagem (SHA-256 dos bytes), para que reenvios do mesmo
+-- arquivo não passem pelo modelo de novo. A versão faz parte da chave: trocar de
+-- modelo invalida o cache automaticamente
+CREATE TABLE cache_resultados (
+    hash CHAR(64)          NOT NULL,
+    versao_modelo VARCHAR(100) NOT NULL,
+    erro FLOAT             NOT NULL,
+    regioes JSON           NULL,
+    mapa_erro VARCHAR(512) NULL,
+    criado_em TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (hash, versao_modelo)
+);
@@ -0,0 +1,8 @@
+USE agrineural;
+
+-- Hash perceptual (dHash de 64 bits) de cada imagem e, para frames quase iguais a uma
+-- imagem anterior da mesma fazenda e do mesmo ponto, o id dessa imagem original
+ALTER TABLE imagens
+    ADD COLUMN dhash BIGINT UNSIGNED NULL,
+    ADD COLUMN duplicata_de INT NULL,
+    ADD CONSTRAINT fk_imagens_duplicata FOREIGN KEY (duplicata_de) REFERENCES imagens(id) ON DELETE SET NULL;
@@ -0,0 +1,5 @@
+USE agrineural;
+
+-- Motivo do descarte pelo filtro prévio (ex.: 'Desfocada'); NULL para imagens analisadas pelo modelo
+ALTER TABLE resultados
+    ADD COLUMN descarte VARCHAR(50) NULL;
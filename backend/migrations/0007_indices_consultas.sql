@@ -0,0 +1,18 @@
+USE agrineural;
+
+-- Índices das consultas por fazenda e por usuário (mapa de calor, relatório, índice de duplicatas).
+-- As chaves estrangeiras já criam índices implícitos de uma coluna; estes os substituem com as
+-- colunas que as consultas leem, para que a tabela em si só seja acessada quando preciso.
+
+-- imagens por fazenda: o relatório e buscar_dhashes (fazenda_id, id > ?, ORDER BY id) são
+-- respondidos só pelo índice; o mapa de calor filtra duplicata_de no índice e só busca o nome
+-- das linhas que ficam (o nome, VARCHAR(255), ficou de fora para não inflar o índice)
+CREATE INDEX idx_imagens_fazenda
+    ON imagens (fazenda_id, id, latitude, longitude, duplicata_de, dhash);
+
+-- fazendas de um produtor (painel do produtor)
+CREATE INDEX idx_fazendas_produtor
+    ON fazendas (cpf_produtor);
+
+-- usuarios_fazendas(cpf_usuario) não precisa de índice novo: a chave primária
+-- (cpf_usuario, fazenda_id) já começa pela coluna e cobre buscar_fazendas_do_usuario
@@ -0,0 +1,40 @@
+USE agrineural;
+
+-- O resultado de cada imagem passa a ficar na própria linha de `imagens`: resultados era 1:1
+-- com imagens (mesmo id) e toda consulta do mapa de calor e do relatório pagava um JOIN.
+-- `resultados` vira uma view com as mesmas colunas, para consultas feitas fora do backend.
+
+-- Colunas anuláveis: linhas antigas só recebem valor no UPDATE abaixo. processada_em fica
+-- NULL nas imagens gravadas antes desta migração (a tabela resultados não tinha data)
+ALTER TABLE imagens
+    ADD COLUMN anomala BOOLEAN NULL,
+    ADD COLUMN erro FLOAT NULL,
+    ADD COLUMN versao_modelo VARCHAR(100) NULL,
+    ADD COLUMN mapa_erro VARCHAR(512) NULL,
+    ADD COLUMN regioes JSON NULL,
+    ADD COLUMN descarte VARCHAR(50) NULL,
+    ADD COLUMN processada_em TIMESTAMP NULL;
+
+UPDATE imagens AS i
+JOIN resultados AS r ON r.id = i.id
+SET i.anomala = r.anomala, i.erro = r.erro, i.versao_modelo = r.versao_modelo,
+    i.mapa_erro = r.mapa_erro, i.regioes = r.regioes, i.descarte = r.descarte;
+
+-- Daqui em diante a data é a da gravação (imagem e resultado entram no mesmo INSERT)
+ALTER TABLE imagens
+    MODIFY COLUMN processada_em TIMESTAMP NULL DEFAULT CURRENT_TIMESTAMP;
+
+-- O índice da 0007 ganha as colunas lidas pelo relatório e por buscar_dhashes, que continuam
+-- respondidas só pelo índice. Trocado num único ALTER: a chave estrangeira de fazenda_id
+-- depende dele e não pode ficar sem índice entre um comando e outro
+ALTER TABLE imagens
+    DROP INDEX idx_imagens_fazenda,
+    ADD INDEX idx_imagens_fazenda (fazenda_id, id, latitude, longitude, duplicata_de, dhash, anomala, erro, descarte);
+
+DROP TABLE resultados;
+
+-- Compatibilidade para leitura (e UPDATE). INSERT não funciona pela view: grave em `imagens`
+CREATE VIEW resultados AS
+    SELECT id, anomala, erro, versao_modelo, mapa_erro, regioes, descarte
+    FROM imagens
+    WHERE anomala IS NOT NULL;
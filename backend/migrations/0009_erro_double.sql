@@ -0,0 +1,14 @@
+USE agrineural;
+
+-- Erros de reconstrução ficam na casa de 1e-3 e o threshold padrão tem 16 dígitos: em FLOAT
+-- (precisão simples, ~7 dígitos) um erro logo acima do threshold podia ser gravado igual ou
+-- abaixo dele e mudar de classe ao reclassificar. Os valores já gravados mantêm o
+-- arredondamento antigo; só as análises novas ganham a precisão completa
+ALTER TABLE imagens
+    MODIFY COLUMN erro DOUBLE NULL;
+
+ALTER TABLE fazendas
+    MODIFY COLUMN threshold DOUBLE NULL;
+
+ALTER TABLE cache_resultados
+    MODIFY COLUMN erro DOUBLE NOT NULL;
@@ -0,0 +1,10 @@
+USE agrineural;
+
+-- idx_fazendas_produtor (0007) tinha só cpf_produtor, o mesmo que o índice da chave estrangeira,
+-- e buscar_fazendas_por_produtor ainda ia à tabela buscar cada linha. Este índice leva as colunas
+-- que a listagem lê e passa a ser o que atende a chave estrangeira; por isso é criado antes de
+-- remover o antigo (o InnoDB recusa remover o único índice que serve a uma chave estrangeira)
+CREATE INDEX idx_fazendas_produtor_listagem
+    ON fazendas (cpf_produtor, id, ccir, nome, latitude, longitude, ext_territorial);
+
+DROP INDEX idx_fazendas_produtor ON fazendas;